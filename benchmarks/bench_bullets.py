@@ -0,0 +1,124 @@
+# Coste por tick de las balas: sprites sueltos (entities.Bullet) frente a BulletSystem, los impactos
+# contra multitudes de enemigos y el modo de estrés (también contra el enjambre).
+# Uso: python -m benchmarks.bench_bullets --bullets 500,2000,5000 --enemies 50 --crowds 500,2000 --ticks 60
+import argparse
+import math
+import random
+import time
+import pygame
+from src import swarm
+from src.bullets import BulletSystem
+from src.entities import Bullet
+from src.settings import WIDTH, HEIGHT
+from src.simulation import init_headless, create_state, step, random_policy
+
+TICK_BUDGET_MS = 1000 / 60
+ANGLES = (0, 90, 180, 270)
+
+def enemy_rects(count, seed=0):
+    rng = random.Random(seed)
+    return [pygame.Rect(rng.randint(0, WIDTH - 50), rng.randint(0, HEIGHT - 50), 50, 50) for _ in range(count)]
+
+def starts(count, seed=0):
+    rng = random.Random(seed)
+    return [(rng.randint(0, WIDTH), rng.randint(0, HEIGHT), rng.choice(ANGLES)) for _ in range(count)]
+
+def run_sprites(bullet_count, rects, ticks, surface):
+    """Lo que hacía step(): un sprite con su Surface por bala, recorte uno a uno y spritecollide por enemigo."""
+    group = pygame.sprite.Group(Bullet(x, y, angle) for x, y, angle in starts(bullet_count))
+    enemies = [pygame.sprite.Sprite() for _ in rects]
+    for enemy, rect in zip(enemies, rects):
+        enemy.rect = rect.copy()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for bullet in group:
+            bullet.update()
+            if (bullet.rect.right < 0 or bullet.rect.left > WIDTH or
+                    bullet.rect.bottom < 0 or bullet.rect.top > HEIGHT):
+                bullet.kill()
+        for enemy in enemies:
+            pygame.sprite.spritecollide(enemy, group, True)
+        group.draw(surface)
+    return (time.perf_counter() - start) * 1000 / ticks
+
+def run_system(bullet_count, rects, ticks, surface):
+    """Las mismas balas en un BulletSystem: arrays, recorte en bloque, impactos por barrido y blits."""
+    bullets = BulletSystem(capacity=bullet_count)
+    for x, y, angle in starts(bullet_count):
+        bullets.fire(x, y, angle)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        bullets.update()
+        bullets.collide(rects)
+        bullets.draw(surface)
+    return (time.perf_counter() - start) * 1000 / ticks
+
+def run_crowd(bullet_count, rects, ticks):
+    """
+    ms medios de BulletSystem.collide contra muchos enemigos. Cada tick empieza con todas las
+    balas (las que chocan desaparecen), y solo se mide collide.
+    """
+    total = 0.0
+    for _ in range(ticks):
+        bullets = BulletSystem(capacity=bullet_count)
+        for x, y, angle in starts(bullet_count):
+            bullets.fire(x, y, angle)
+        bullets.update()
+        start = time.perf_counter()
+        bullets.collide(rects)
+        total += time.perf_counter() - start
+    return total * 1000 / ticks
+
+def run_stress(burst, ticks, seed=0, swarm_size=0):
+    """
+    step() completo con el modo de estrés activo (y, con `swarm_size`, un enjambre de tantos
+    enemigos): ms medios por tick y balas vivas al final.
+    """
+    if swarm_size:
+        state = create_state(1, seed=seed, bullet_hell=burst, enemy_count=swarm_size, swarm=True)
+    else:
+        state = create_state(1, seed=seed, bullet_hell=burst)
+    state.player.health = 10 ** 9  # que la partida no termine a mitad de la medición
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    policy = random_policy(random.Random(seed))
+    start = time.perf_counter()
+    for _ in range(ticks):
+        step(state, policy(state))
+        state.bullets.draw(surface)
+    return (time.perf_counter() - start) * 1000 / ticks, len(state.bullets)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Balas como sprites frente a BulletSystem")
+    parser.add_argument("--bullets", default="500,2000,5000")
+    parser.add_argument("--enemies", type=int, default=50)
+    parser.add_argument("--crowds", default="500,2000", help="enemigos de las pruebas de impactos contra multitudes")
+    parser.add_argument("--swarm", type=int, default=2000, help="enemigos del enjambre en el modo de estrés (0: sin él)")
+    parser.add_argument("--ticks", type=int, default=60)
+    parser.add_argument("--burst", type=int, default=64, help="balas por ráfaga en el modo de estrés")
+    args = parser.parse_args(argv)
+    init_headless()
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    rects = enemy_rects(args.enemies)
+    print(f"{'balas':>7}{'sprites ms':>12}{'sistema ms':>12}{'mejora':>8}{'60 Hz':>7}")
+    for count in (int(value) for value in args.bullets.split(",")):
+        sprites_ms = run_sprites(count, rects, args.ticks, surface)
+        system_ms = run_system(count, rects, args.ticks, surface)
+        fits = "sí" if system_ms < TICK_BUDGET_MS else "no"
+        print(f"{count:>7}{sprites_ms:>12.2f}{system_ms:>12.2f}{sprites_ms / system_ms:>7.1f}x{fits:>7}")
+    print(f"\n{'balas':>7}{'enemigos':>10}{'impactos ms':>13}{'60 Hz':>7}")
+    for crowd in (int(value) for value in args.crowds.split(",")):
+        crowd_rects = enemy_rects(crowd)
+        for count in (int(value) for value in args.bullets.split(",")):
+            crowd_ms = run_crowd(count, crowd_rects, args.ticks)
+            fits = "sí" if crowd_ms < TICK_BUDGET_MS else "no"
+            print(f"{count:>7}{crowd:>10}{crowd_ms:>13.2f}{fits:>7}")
+    # Con velocidad 6 una bala tarda unos 70 ticks en salir: se mide cuando ya hay un régimen estable
+    ticks = max(args.ticks, 4 * math.ceil(WIDTH / 6))
+    stress_ms, alive = run_stress(args.burst, ticks)
+    print(f"\nmodo de estrés ({args.burst} por ráfaga): {stress_ms:.2f} ms por tick, {alive} balas vivas")
+    if args.swarm and swarm.available():
+        stress_ms, alive = run_stress(args.burst, ticks, swarm_size=args.swarm)
+        print(f"  con un enjambre de {args.swarm}: {stress_ms:.2f} ms por tick, {alive} balas vivas")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Nodos expandidos por replanificación: planificador incremental (D* Lite) frente a a_star desde cero.
+# Uso: python -m benchmarks.bench_incremental --size 100 --ticks 400 --block-rate 0.05
+import argparse
+import random
+import time
+from benchmarks.grids import random_grid, city_grid
+from src.level import a_star
+from src.incremental import IncrementalPlanner
+
+MAPS = {
+    "random": lambda size, seed: random_grid(size, size, density=0.25, seed=seed),
+    "city": lambda size, seed: city_grid(size, size, seed=seed),
+}
+
+def chase(grid, ticks, block_rate, seed=0, enemy_every=2):
+    """
+    Un perseguidor sigue al jugador, que da un paso al azar por tick mientras el perseguidor
+    avanza una celda cada `enemy_every` ticks (es más lento, como en el juego); de vez en cuando
+    se bloquea o desbloquea una celda. En cada tick se replanifica con los dos métodos.
+    """
+    rng = random.Random(seed)
+    width, height = grid.width, grid.height
+    free = [(i % width, i // width) for i in range(width * height) if not grid.blocked[i]]
+    enemy, player = rng.choice(free), rng.choice(free)
+    planner = IncrementalPlanner()
+    totals = {"incremental": [0, 0.0], "a_star": [0, 0.0]}
+    mismatches = 0
+    for tick in range(ticks):
+        x, y = player
+        nx, ny = rng.choice(((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)))
+        if 0 <= nx < width and 0 <= ny < height and not grid.blocked[ny * width + nx]:
+            player = (nx, ny)
+        if rng.random() < block_rate:
+            cell = rng.choice(free)
+            if cell not in (player, enemy):
+                grid.set_blocked(cell[0], cell[1], not grid.is_blocked(*cell))
+        before, start = grid.expanded, time.perf_counter()
+        next_cell = planner.next_cell(grid, enemy, player)
+        totals["incremental"][0] += grid.expanded - before
+        totals["incremental"][1] += time.perf_counter() - start
+        before, start = grid.expanded, time.perf_counter()
+        path = a_star(enemy, player, grid, width, height)
+        totals["a_star"][0] += grid.expanded - before
+        totals["a_star"][1] += time.perf_counter() - start
+        if path and planner.path and len(planner.path) - planner.path.index(enemy) != len(path):
+            mismatches += 1
+        if next_cell is not None and tick % enemy_every == 0:
+            enemy = next_cell
+    return totals, planner, mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replanificación incremental frente a A* desde cero")
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=400)
+    parser.add_argument("--block-rate", type=float, default=0.05, help="probabilidad por tick de cambiar una celda")
+    parser.add_argument("--maps", default="random,city")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(f"{'mapa':<8}{'método':<13}{'expandidos/replan':>18}{'ms/replan':>11}")
+    for name in args.maps.split(","):
+        grid = MAPS[name](args.size, args.seed)
+        totals, planner, mismatches = chase(grid, args.ticks, args.block_rate, args.seed)
+        for method, (expanded, seconds) in totals.items():
+            print(f"{name:<8}{method:<13}{expanded / args.ticks:>18.1f}{seconds * 1000 / args.ticks:>11.3f}")
+        print(f"{'':<8}reinicios del incremental: {planner.restarts}, caminos de distinta longitud: {mismatches}")
+
+if __name__ == "__main__":
+    main()
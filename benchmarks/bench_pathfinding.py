@@ -0,0 +1,75 @@
+# Compara A*, Jump Point Search y HPA* en mapas grandes.
+# Uso: python -m benchmarks.bench_pathfinding --size 500 --queries 40
+import argparse
+import time
+from benchmarks.grids import random_grid, city_grid, maze_grid, walkable_pairs
+from src.pathfinding import AStarEngine, JumpPointEngine, HierarchicalEngine
+
+MAPS = {
+    "random": lambda size, seed: random_grid(size, size, density=0.2, seed=seed),
+    "city": lambda size, seed: city_grid(size, size, seed=seed),
+    "maze": lambda size, seed: maze_grid(size, size, seed=seed),
+}
+
+def run_engine(engine, grid, pairs, reference=None):
+    """Ejecuta todas las consultas y devuelve latencia media, nodos expandidos y longitud relativa."""
+    engine.expanded = 0
+    lengths = []
+    start = time.perf_counter()
+    for s, g in pairs:
+        path = engine.find_path(s, g, grid, grid.width, grid.height)
+        lengths.append(len(path) if path else 0)
+    elapsed = time.perf_counter() - start
+    ratio = None
+    if reference:
+        pairs_found = [(a, b) for a, b in zip(lengths, reference) if a and b]
+        if pairs_found:
+            ratio = sum(a / b for a, b in pairs_found) / len(pairs_found)
+    return {
+        "engine": engine.name,
+        "mean_ms": elapsed * 1000 / len(pairs),
+        "mean_expanded": engine.expanded / len(pairs),
+        "length_ratio": ratio,
+        "lengths": lengths,
+    }
+
+def benchmark_map(name, size, queries, seed=0, cluster_size=16):
+    grid = MAPS[name](size, seed)
+    pairs = walkable_pairs(grid, queries, seed=seed)
+    astar = run_engine(AStarEngine(), grid, pairs)
+    jps_engine = JumpPointEngine()
+    build_start = time.perf_counter()
+    jps_engine.table_for(grid)
+    jps_build_ms = (time.perf_counter() - build_start) * 1000
+    jps = run_engine(jps_engine, grid, pairs, astar["lengths"])
+    jps["build_ms"] = jps_build_ms
+    hpa_engine = HierarchicalEngine(cluster_size=cluster_size)
+    build_start = time.perf_counter()
+    hpa_engine.graph_for(grid)
+    hpa_build_ms = (time.perf_counter() - build_start) * 1000
+    hpa = run_engine(hpa_engine, grid, pairs, astar["lengths"])
+    hpa["build_ms"] = hpa_build_ms
+    return [astar, jps, hpa]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de motores de búsqueda de caminos")
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=40)
+    parser.add_argument("--maps", default="random,city,maze")
+    parser.add_argument("--cluster-size", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(f"{'mapa':<8}{'motor':<8}{'ms/consulta':>12}{'expandidos':>12}{'vs A*':>8}{'longitud':>10}")
+    for name in args.maps.split(","):
+        results = benchmark_map(name, args.size, args.queries, args.seed, args.cluster_size)
+        base = results[0]
+        for r in results:
+            speedup = base["mean_ms"] / r["mean_ms"] if r["mean_ms"] else 0.0
+            ratio = f"{r['length_ratio']:.3f}" if r["length_ratio"] else "1.000"
+            print(f"{name:<8}{r['engine']:<8}{r['mean_ms']:>12.2f}{r['mean_expanded']:>12.0f}"
+                  f"{speedup:>7.1f}x{ratio:>10}")
+            if "build_ms" in r:
+                print(f"{'':<16}precálculo ({r['engine']}): {r['build_ms']:.0f} ms")
+
+if __name__ == "__main__":
+    main()
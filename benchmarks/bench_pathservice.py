@@ -0,0 +1,68 @@
+# Picos de replanificación: todas las búsquedas en el mismo tick frente a la cola con presupuesto.
+# Uso: python -m benchmarks.bench_pathservice --size 200 --agents 100 --budget 2000
+import argparse
+import statistics
+import time
+from benchmarks.grids import city_grid, walkable_pairs
+from src.level import a_star
+from src.pathservice import PathService, NO_RESULT
+
+class Agent:
+    pass
+
+def synchronous(grid, pairs, frames, replan_every):
+    """Cada `replan_every` ticks todos los agentes buscan a la vez (lo que hace chase_action)."""
+    times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        if frame % replan_every == 0:
+            for s, g in pairs:
+                a_star(s, g, grid, grid.width, grid.height)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def queued(grid, pairs, frames, replan_every, budget):
+    """Las mismas peticiones, pero pasando por un PathService con `budget` expansiones por tick."""
+    service = PathService(grid, max_expansions=budget)
+    agents = [Agent() for _ in pairs]
+    times = []
+    latency = []
+    asked = {}
+    for frame in range(frames):
+        start = time.perf_counter()
+        if frame % replan_every == 0:
+            for agent, (s, g) in zip(agents, pairs):
+                # Se alterna el sentido en cada ronda para que la caché no resuelva nada
+                origin, goal = (s, g) if frame // replan_every % 2 == 0 else (g, s)
+                service.request(agent, origin, goal, priority=frame)
+                asked[agent] = frame
+        service.process()
+        for agent in agents:
+            if service.take(agent) is not NO_RESULT and agent in asked:
+                latency.append(frame - asked.pop(agent))
+        times.append((time.perf_counter() - start) * 1000)
+    return times, latency
+
+def describe(times):
+    ordered = sorted(times)
+    return (f"media {statistics.fmean(times):6.2f} ms  p99 {ordered[len(ordered) * 99 // 100]:6.2f} ms  "
+            f"máx {ordered[-1]:6.2f} ms  desv {statistics.pstdev(times):6.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Búsquedas síncronas frente a la cola con presupuesto por tick")
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--agents", type=int, default=100)
+    parser.add_argument("--frames", type=int, default=240)
+    parser.add_argument("--replan-every", type=int, default=30, help="ticks entre rondas de replanificación")
+    parser.add_argument("--budget", type=int, default=2000, help="nodos expandidos por tick en la cola")
+    args = parser.parse_args(argv)
+    grid = city_grid(args.size, args.size, seed=0)
+    pairs = walkable_pairs(grid, args.agents, seed=0)
+    print("síncrono:", describe(synchronous(grid, pairs, args.frames, args.replan_every)))
+    times, latency = queued(grid, pairs, args.frames, args.replan_every, args.budget)
+    print("en cola: ", describe(times))
+    if latency:
+        print(f"{len(latency)} resultados, latencia media {statistics.fmean(latency):.1f} ticks, máx {max(latency)} ticks")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# Tiempo de colocación con placement.poisson_place en niveles densos de miles de objetos.
+# Uso: python -m benchmarks.bench_placement --items 100,1000,5000 --repeat 3
+import argparse
+import math
+import random
+import time
+from src.placement import Category, poisson_place
+
+def layout(items):
+    """Área cuadrada con unos 60x60 px por objeto: obstáculos, monedas y apariciones a partes iguales."""
+    side = int(math.sqrt(items * 60 * 60))
+    third = items // 3
+    categories = [
+        Category("obstacles", third, 20, 10),
+        Category("coins", third, 15, 10),
+        Category("spawns", items - 2 * third, 25, 10),
+    ]
+    exclusions = [(0, 0, 100, 100), (side - 100, side - 100, 100, 100)]
+    return (0, 0, side, side), categories, exclusions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Colocación por disco de Poisson en niveles densos")
+    parser.add_argument("--items", default="100,1000,5000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    print(f"{'objetos':>8}{'colocados':>11}{'ms':>9}")
+    for items in (int(value) for value in args.items.split(",")):
+        bounds, categories, exclusions = layout(items)
+        times = []
+        for seed in range(args.repeat):
+            start = time.perf_counter()
+            placed = poisson_place(bounds, categories, exclusions, random.Random(seed))
+            times.append((time.perf_counter() - start) * 1000)
+        total = sum(len(positions) for positions in placed.values())
+        print(f"{items:>8}{total:>11}{min(times):>9.1f}")
+
+if __name__ == "__main__":
+    main()
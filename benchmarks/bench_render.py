@@ -0,0 +1,103 @@
+# Coste de dibujar un cuadro: el camino anterior (imágenes con convert_alpha y un blit por
+# sprite con Group.draw) frente al nuevo (formato de blit por imagen, capa estática
+# compuesta una vez y Surface.blits de lo que se mueve).
+# Uso: python -m benchmarks.bench_render --obstacles 10,100,400 --frames 300
+import argparse
+import random
+import time
+import pygame
+from src.assets import AssetManager, blit_mode
+from src.render import compose_layer
+from src.settings import WIDTH, HEIGHT, CELL_SIZE, GREEN
+from src.simulation import init_headless
+
+# (ruta, tamaño) de las imágenes de los sprites de la partida
+SPRITES = {
+    "player": ("assets/player01_.png", (55, 55)),
+    "enemy": ("assets/enemigos01.png", (50, 50)),
+    "coin": ("assets/moneda.jpg", (45, 45)),
+    "obstacle": ("assets/obstaculo.jpg", (CELL_SIZE, CELL_SIZE)),
+}
+GOAL = pygame.Rect(WIDTH - 100, HEIGHT - 100, 50, 50)
+
+def make_sprites(images, obstacles, coins, enemies, seed=0):
+    """Sprites en posiciones al azar (las mismas con cualquier juego de imágenes)."""
+    rng = random.Random(seed)
+
+    def sprite(kind, x, y):
+        s = pygame.sprite.Sprite()
+        s.image = images[kind]
+        s.rect = s.image.get_rect(topleft=(x, y))
+        return s
+    cells = rng.sample([(x, y) for y in range(HEIGHT // CELL_SIZE) for x in range(WIDTH // CELL_SIZE)],
+                       min(obstacles, (WIDTH // CELL_SIZE) * (HEIGHT // CELL_SIZE)))
+    walls = [sprite("obstacle", x * CELL_SIZE, y * CELL_SIZE) for x, y in cells]
+    moving = [sprite("coin", rng.randint(0, WIDTH - 45), rng.randint(0, HEIGHT - 45)) for _ in range(coins)]
+    moving.append(sprite("player", 100, 100))
+    moving += [sprite("enemy", rng.randint(0, WIDTH - 50), rng.randint(0, HEIGHT - 50)) for _ in range(enemies)]
+    return walls, moving
+
+def wiggle(sprites, frame):
+    # Los que se mueven cambian de sitio en cada cuadro, como en la partida
+    step = 1 if frame % 2 else -1
+    for s in sprites:
+        s.rect.x += step
+
+def run_old(background, images, counts, frames, surface):
+    """Fondo, meta y Group.draw de todos los sprites, como dibujaba game_loop."""
+    walls, moving = make_sprites(images, *counts)
+    group = pygame.sprite.Group(walls, moving)
+    start = time.perf_counter()
+    for frame in range(frames):
+        wiggle(moving, frame)
+        surface.blit(background, (0, 0))
+        pygame.draw.rect(surface, GREEN, GOAL)
+        group.draw(surface)
+    return (time.perf_counter() - start) * 1000 / frames
+
+def run_new(background, images, counts, frames, surface):
+    """Capa estática compuesta una vez por nivel y un Surface.blits con lo que se mueve."""
+    walls, moving = make_sprites(images, *counts)
+    field = compose_layer(background, walls, [(GREEN, GOAL)])
+    start = time.perf_counter()
+    for frame in range(frames):
+        wiggle(moving, frame)
+        surface.blit(field, (0, 0))
+        surface.blits([(s.image, s.rect) for s in moving], False)
+    return (time.perf_counter() - start) * 1000 / frames
+
+def blit_us(image, count=2000):
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    positions = [((i * 37) % (WIDTH - 60), (i * 53) % (HEIGHT - 60)) for i in range(count)]
+    surface.blits([(image, p) for p in positions], False)  # el primer blit prepara el RLE
+    start = time.perf_counter()
+    surface.blits([(image, p) for p in positions], False)
+    return (time.perf_counter() - start) * 1e6 / count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coste de dibujo por cuadro: camino anterior frente al nuevo")
+    parser.add_argument("--obstacles", default="10,100,300")
+    parser.add_argument("--coins", type=int, default=10)
+    parser.add_argument("--enemies", type=int, default=10)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args(argv)
+    init_headless()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    manager = AssetManager()
+    background = manager.load("assets/background.jpg", (WIDTH, HEIGHT), mode="opaque")
+    old_images = {kind: manager.load(path, size, mode="alpha") for kind, (path, size) in SPRITES.items()}
+    new_images = {kind: manager.load(path, size, mode="auto") for kind, (path, size) in SPRITES.items()}
+    print(f"{'imagen':<10}{'formato':>10}{'alpha µs':>10}{'nuevo µs':>10}")
+    for kind, (path, size) in SPRITES.items():
+        mode = blit_mode(pygame.transform.scale(manager.load(path, mode=None), size))
+        print(f"{kind:<10}{mode:>10}{blit_us(old_images[kind]):>10.3f}{blit_us(new_images[kind]):>10.3f}")
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    print(f"\n{'obstáculos':>10}{'antes ms':>10}{'ahora ms':>10}{'mejora':>8}")
+    for obstacles in (int(value) for value in args.obstacles.split(",")):
+        counts = (obstacles, args.coins, args.enemies)
+        old_ms = run_old(background, old_images, counts, args.frames, surface)
+        new_ms = run_new(background, new_images, counts, args.frames, surface)
+        print(f"{obstacles:>10}{old_ms:>10.3f}{new_ms:>10.3f}{old_ms / new_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# Compara el coste por tick de los enemigos como objetos (Enemy + árbol) y como enjambre en arrays.
+# Uso: python -m benchmarks.bench_swarm --enemies 100,500,2000,5000 --ticks 120
+import argparse
+import random
+import time
+from src import swarm
+from src.simulation import init_headless, create_state, step, random_policy
+
+TICK_BUDGET_MS = 1000 / 60
+
+def run(enemy_count, ticks, use_swarm, seed=0):
+    """ms medios por tick de step() con `enemy_count` enemigos persiguiendo por campo de flujo."""
+    state = create_state(1, enemy_count=enemy_count, seed=seed, swarm=use_swarm)
+    for enemy in state.enemy_group:
+        enemy.chase_radius = 10 ** 6  # todos persiguen: el peor caso
+    state.player.health = 10 ** 9     # que la partida no termine a mitad de la medición
+    policy = random_policy(random.Random(seed))
+    start = time.perf_counter()
+    for _ in range(ticks):
+        step(state, policy(state))
+    return (time.perf_counter() - start) * 1000 / ticks, len(state.enemy_group)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enemigos como objetos frente a enjambre en arrays")
+    parser.add_argument("--enemies", default="100,500,2000,5000")
+    parser.add_argument("--ticks", type=int, default=120)
+    args = parser.parse_args(argv)
+    init_headless()
+    if not swarm.available():
+        print("numpy no está instalado: solo se mide la versión por objetos")
+    print(f"{'enemigos':>9}{'objetos ms':>12}{'enjambre ms':>13}{'mejora':>8}{'60 Hz':>7}")
+    for count in (int(value) for value in args.enemies.split(",")):
+        objects_ms, _ = run(count, args.ticks, False)
+        if swarm.available():
+            swarm_ms, _ = run(count, args.ticks, True)
+            fits = "sí" if swarm_ms < TICK_BUDGET_MS else "no"
+            print(f"{count:>9}{objects_ms:>12.2f}{swarm_ms:>13.2f}{objects_ms / swarm_ms:>7.1f}x{fits:>7}")
+        else:
+            print(f"{count:>9}{objects_ms:>12.2f}{'-':>13}")
+
+if __name__ == "__main__":
+    main()
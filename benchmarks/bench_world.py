@@ -0,0 +1,72 @@
+# Coste por tick y por cuadro del mundo por trozos según su tamaño: con la ventana activa y
+# el recorte por cámara no debería depender de cuántos trozos tenga el mundo.
+# Uso: python -m benchmarks.bench_world --worlds 4,16,64,256 --ticks 1200
+import argparse
+import time
+import pygame
+from src.render import draw_interpolated, draw_tiled
+from src.settings import WIDTH, HEIGHT, CELL_SIZE
+from src.simulation import init_headless, create_state, step, StepInput, NO_KEYS
+from src.world import Camera, PERIOD
+
+# El jugador avanza en escalera por las calles: un tramo a la derecha y otro hacia abajo,
+# de cruce en cruce (a 4 px por tick), así que atraviesa el mundo en diagonal
+LEG_TICKS = PERIOD * CELL_SIZE // 4
+
+def staircase(state):
+    keys = dict(NO_KEYS)
+    keys[pygame.K_RIGHT if (state.tick // LEG_TICKS) % 2 == 0 else pygame.K_DOWN] = True
+    return StepInput(keys, shoot=state.tick % 10 == 0)
+
+def run(chunks, ticks, seed=0):
+    """ms medios por tick de step() y por cuadro de dibujo (con y sin recorte) y el estado final."""
+    state = create_state(1, seed=seed, world=(chunks, chunks))
+    state.player.health = 10 ** 9  # que la partida no termine a mitad de la medición
+    state.interpolate = True
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    background = pygame.Surface((WIDTH, HEIGHT))
+    camera = Camera()
+    step_ms = culled_ms = full_ms = 0.0
+    frames = 0
+    most_chunks = 0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        step(state, staircase(state))
+        step_ms += time.perf_counter() - start
+        most_chunks = max(most_chunks, len(state.world.chunks))
+        if state.win:
+            break
+        if state.tick % 4:
+            continue
+        frames += 1
+        start = time.perf_counter()
+        camera.follow_sprite(state.player, state.previous_positions, 0.5, state.player.bounds)
+        draw_tiled(surface, background, camera.offset)
+        draw_interpolated(surface, camera.visible(state), state.previous_positions, 0.5, camera.offset)
+        state.bullets.draw(surface, 0.5, camera.offset)
+        culled_ms += time.perf_counter() - start
+        # Lo mismo dibujando todos los sprites de la ventana activa, sin recortar por la vista
+        start = time.perf_counter()
+        draw_tiled(surface, background, camera.offset)
+        draw_interpolated(surface, state.all_sprites, state.previous_positions, 0.5, camera.offset)
+        state.bullets.draw(surface, 0.5, camera.offset)
+        full_ms += time.perf_counter() - start
+    frames = max(frames, 1)
+    return state, step_ms * 1000 / state.tick, culled_ms * 1000 / frames, full_ms * 1000 / frames, most_chunks
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coste del mundo por trozos según su tamaño")
+    parser.add_argument("--worlds", default="4,16,64,256", help="lado del mundo en trozos")
+    parser.add_argument("--ticks", type=int, default=1200)
+    args = parser.parse_args(argv)
+    init_headless()
+    print(f"{'trozos':>9}{'step ms':>9}{'dibujo ms':>11}{'sin recorte':>13}{'en memoria':>12}"
+          f"{'máx.':>6}{'creados':>9}{'sprites':>9}")
+    for side in (int(value) for value in args.worlds.split(",")):
+        state, step_ms, culled_ms, full_ms, most_chunks = run(side, args.ticks)
+        world = state.world
+        print(f"{side:>4}x{side:<4}{step_ms:>9.3f}{culled_ms:>11.3f}{full_ms:>13.3f}{len(world.chunks):>12}"
+              f"{most_chunks:>6}{world.generated + world.loaded:>9}{len(state.all_sprites):>9}")
+
+if __name__ == "__main__":
+    main()
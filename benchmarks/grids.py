@@ -0,0 +1,55 @@
+# Generadores de grids para los benchmarks (mapas grandes de prueba).
+import random
+from src.level import NavGrid
+
+def random_grid(width, height, density=0.2, seed=0):
+    """Grid con celdas bloqueadas al azar."""
+    rng = random.Random(seed)
+    grid = NavGrid(width, height)
+    for i in range(int(width * height * density)):
+        grid.set_blocked(rng.randrange(width), rng.randrange(height))
+    return grid
+
+def city_grid(width, height, block=6, seed=0):
+    """Manzanas rectangulares separadas por calles, parecido al laberinto de Rally-X."""
+    rng = random.Random(seed)
+    grid = NavGrid(width, height)
+    step = block + 2
+    for top in range(1, height, step):
+        for left in range(1, width, step):
+            w = rng.randint(block // 2, block)
+            h = rng.randint(block // 2, block)
+            for y in range(top, min(top + h, height)):
+                for x in range(left, min(left + w, width)):
+                    grid.set_blocked(x, y)
+    return grid
+
+def maze_grid(width, height, seed=0):
+    """Laberinto perfecto (backtracking iterativo): el peor caso para A*."""
+    rng = random.Random(seed)
+    grid = NavGrid(width, height)
+    for i in range(width * height):
+        grid.blocked[i] = 1
+    stack = [(0, 0)]
+    grid.blocked[0] = 0
+    while stack:
+        x, y = stack[-1]
+        options = [(x + dx, y + dy, dx, dy) for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                   if 0 <= x + dx < width and 0 <= y + dy < height
+                   and grid.blocked[(y + dy) * width + x + dx]]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny, dx, dy = rng.choice(options)
+        grid.blocked[(y + dy // 2) * width + x + dx // 2] = 0
+        grid.blocked[ny * width + nx] = 0
+        stack.append((nx, ny))
+    grid.version += 1
+    return grid
+
+def walkable_pairs(grid, count, seed=0):
+    """Pares (inicio, objetivo) de celdas libres elegidos con una semilla fija."""
+    rng = random.Random(seed)
+    free = [(i % grid.width, i // grid.width) for i in range(grid.width * grid.height)
+            if not grid.blocked[i]]
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
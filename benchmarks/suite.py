@@ -0,0 +1,373 @@
+# Suite de benchmarks: búsqueda de caminos, IA, generación del nivel y un tick completo.
+# Uso:
+#   python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+#   python -m benchmarks.suite --baseline benchmarks/baseline.json --max-regression 0.25
+#   python -m benchmarks.suite --only astar --json resultados.json
+# Sale con código 1 si algún caso es más lento que la línea base por encima del margen.
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+import ai
+from benchmarks.grids import maze_grid
+from src import simclock, swarm
+from src.level import NavGrid, a_star, copy_grid
+from src.behavior import chase_action, patrol_action, build_ai_tree, compile_tree
+from src.pathcache import path_cache_for, PathCache
+from src.settings import WIDTH, HEIGHT
+from src.simulation import init_headless, create_state, step, generate_decorations, random_policy
+
+class Case:
+    """
+    Un caso del benchmark. `setup()` prepara los datos antes de cada repetición (no se mide)
+    y devuelve el argumento de `run(data)`, que es lo único que se cronometra.
+    `run` puede devolver un dict con contadores (nodos expandidos, etc.) que se añaden al resultado.
+    """
+    def __init__(self, name, run, setup=None, group=""):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+        self.group = group
+
+# --- Grids de prueba ---
+
+def empty_grid(size):
+    return NavGrid(size, size)
+
+def unreachable_grid(size):
+    """Grid vacío con el objetivo (esquina inferior derecha) encerrado: A* explora todo."""
+    grid = NavGrid(size, size)
+    grid.set_blocked(size - 2, size - 1)
+    grid.set_blocked(size - 1, size - 2)
+    grid.set_blocked(size - 2, size - 2)
+    return grid
+
+GRIDS = {
+    "empty": empty_grid,
+    "maze": lambda size: maze_grid(size, size, seed=0),
+    "unreachable": unreachable_grid,
+}
+
+def to_node_grid(grid):
+    """Convierte un NavGrid al grid de nodos de ai.py."""
+    blocked = [(i % grid.width, i // grid.width) for i in range(grid.width * grid.height) if grid.blocked[i]]
+    return ai.create_specific_map(grid.width, grid.height, blocked)
+
+def corners(grid):
+    return (0, 0), (grid.width - 1, grid.height - 1)
+
+# --- Casos ---
+
+def level_astar_case(kind, size):
+    grid = GRIDS[kind](size)
+    start, goal = corners(grid)
+
+    def run(_):
+        before = grid.expanded
+        path = a_star(start, goal, grid, grid.width, grid.height)
+        return {"expanded": grid.expanded - before, "path_length": len(path) if path else 0}
+    return Case(f"level.a_star/{kind}/{size}", run, group="astar")
+
+def cached_path_case(kind, size):
+    """PathCache.get_path sin entradas guardadas: en "unreachable" la alcanzabilidad evita el A*."""
+    grid = GRIDS[kind](size)
+    start, goal = corners(grid)
+
+    def run(cache):
+        before = grid.expanded
+        path = cache.get_path(grid, start, goal)
+        return {"expanded": grid.expanded - before, "path_length": len(path) if path else 0}
+    return Case(f"path_cache/{kind}/{size}", run, PathCache, group="astar")
+
+def ai_astar_case(kind, size):
+    nodes = to_node_grid(GRIDS[kind](size))
+    (sx, sy), (gx, gy) = corners(NavGrid(size, size))
+
+    def setup():
+        ai.reset_grid(nodes)
+        return nodes
+
+    def run(nodes):
+        path = ai.a_star(nodes[sy][sx], nodes[gy][gx], nodes, size, size)
+        return {"path_length": len(path) if path else 0}
+    return Case(f"ai.a_star/{kind}/{size}", run, setup, group="astar")
+
+def copy_grid_case(size):
+    grid = maze_grid(size, size, seed=0)
+
+    def run(_):
+        copy_grid(grid)
+    return Case(f"copy_grid/{size}", run, group="grid")
+
+def reset_grid_case(size):
+    nodes = to_node_grid(maze_grid(size, size, seed=0))
+    return Case(f"ai.reset_grid/{size}", lambda _: ai.reset_grid(nodes), group="grid")
+
+def chase_case(enemy_count):
+    """Una pasada de chase_action por todos los enemigos con la caché de caminos vacía (replanifican todos)."""
+    state = create_state(1, enemy_count=enemy_count, seed=0)
+    enemies = list(state.enemy_group)
+    start_positions = [enemy.pos.copy() for enemy in enemies]
+    grid = state.grid
+    player = state.player
+
+    def setup():
+        simclock.set_ticks(0)
+        path_cache_for(grid).clear()
+        for enemy, pos in zip(enemies, start_positions):
+            enemy.pos.update(pos)
+            enemy.last_target_position = None
+        return None
+
+    def run(_):
+        before = grid.expanded
+        for enemy in enemies:
+            chase_action(enemy, player, grid, grid.width, grid.height)
+        return {"enemies": len(enemies), "expanded": grid.expanded - before}
+    return Case(f"chase_action/{enemy_count}", run, setup, group="ai")
+
+def tree_case(compiled, enemy_count=500):
+    """Una pasada del árbol por defecto por cada enemigo, recorriendo nodos o con el árbol compilado."""
+    state = create_state(1, enemy_count=enemy_count, seed=0, ai_rate=0)
+    enemies = list(state.enemy_group)
+    player, grid = state.player, state.grid
+    # Las dos ramas acaban en patrol_action para medir el árbol y no la búsqueda de caminos
+    tree = build_ai_tree(patrol_action)
+    if compiled:
+        tree = compile_tree(tree)
+
+    def run(_):
+        for enemy in enemies:
+            tree.run(enemy, player, grid, grid.width, grid.height)
+    kind = "compiled" if compiled else "nodes"
+    return Case(f"behavior_tree/{kind}/{enemy_count}", run, group="ai")
+
+def decorations_case(num_obstacles):
+    import random
+
+    def setup():
+        return random.Random(0)
+
+    def run(rng):
+        obstacles, coins = generate_decorations(num_obstacles=num_obstacles, rng=rng)
+        return {"obstacles": len(obstacles), "coins": len(coins)}
+    return Case(f"generate_decorations/{num_obstacles}", run, setup, group="level")
+
+def frame_step_case(ticks=60):
+    """`ticks` ticks de step() seguidos desde un nivel recién creado, con entradas aleatorias fijas."""
+    import random
+
+    def setup():
+        return create_state(1, seed=0), random_policy(random.Random(0))
+
+    def run(data):
+        state, policy = data
+        for _ in range(ticks):
+            step(state, policy(state))
+        return {"ticks": ticks}
+    return Case(f"step/{ticks}_ticks", run, setup, group="frame")
+
+def swarm_case(enemy_count, ticks=10):
+    """`ticks` ticks del enjambre en arrays con todos los enemigos persiguiendo."""
+    def setup():
+        state = create_state(1, enemy_count=enemy_count, seed=0, swarm=True)
+        state.swarm.chase_radius[:] = 10 ** 6
+        return state
+
+    def run(state):
+        for _ in range(ticks):
+            state.swarm.update(state.player.rect)
+        return {"enemies": state.swarm.count, "ticks": ticks}
+    return Case(f"swarm/{enemy_count}x{ticks}_ticks", run, setup, group="ai")
+
+def bullets_case(bullet_count, ticks=10, enemy_count=50):
+    """`ticks` ticks de BulletSystem (mover, impactos contra `enemy_count` enemigos y dibujar) con `bullet_count` balas."""
+    import random
+    from src.bullets import BulletSystem
+
+    def setup():
+        rng = random.Random(0)
+        bullets = BulletSystem(capacity=bullet_count)
+        for _ in range(bullet_count):
+            bullets.fire(rng.randint(0, WIDTH), rng.randint(0, HEIGHT), rng.choice((0, 90, 180, 270)))
+        rects = [pygame.Rect(rng.randint(0, WIDTH - 50), rng.randint(0, HEIGHT - 50), 50, 50)
+                 for _ in range(enemy_count)]
+        return bullets, rects, pygame.Surface((WIDTH, HEIGHT))
+
+    def run(data):
+        bullets, rects, surface = data
+        for _ in range(ticks):
+            bullets.update()
+            bullets.collide(rects)
+            bullets.draw(surface)
+        return {"alive": len(bullets), "ticks": ticks}
+    crowd = "" if enemy_count == 50 else f"_vs_{enemy_count}"
+    return Case(f"bullets/{bullet_count}{crowd}x{ticks}_ticks", run, setup, group="frame")
+
+def world_case(chunks, ticks=300):
+    """`ticks` ticks de step() en un mundo de `chunks` x `chunks` trozos, cruzando de un trozo a otro."""
+    from benchmarks.bench_world import staircase
+
+    def setup():
+        state = create_state(1, seed=0, world=(chunks, chunks))
+        state.player.health = 10 ** 9
+        return state
+
+    def run(state):
+        for _ in range(ticks):
+            step(state, staircase(state))
+        world = state.world
+        return {"recenters": world.recenters, "chunks": world.generated, "resident": len(world.chunks)}
+    return Case(f"world/{chunks}x{chunks}_{ticks}_ticks", run, setup, group="frame")
+
+def build_cases():
+    cases = []
+    for kind in ("empty", "maze", "unreachable"):
+        cases.append(level_astar_case(kind, 101))
+        cases.append(ai_astar_case(kind, 101))
+        cases.append(cached_path_case(kind, 101))
+    for size in (20, 200):
+        cases.append(copy_grid_case(size))
+        cases.append(reset_grid_case(size))
+    for count in (5, 50, 500):
+        cases.append(chase_case(count))
+    cases.append(tree_case(False))
+    cases.append(tree_case(True))
+    for count in (10, 40, 80):
+        cases.append(decorations_case(count))
+    cases.append(frame_step_case())
+    cases.append(bullets_case(5000))
+    # Un solo tick: con tantos enemigos casi todas las balas chocan en el primero
+    for enemies in (500, 2000):
+        cases.append(bullets_case(5000, ticks=1, enemy_count=enemies))
+    for chunks in (4, 64):
+        cases.append(world_case(chunks))
+    if swarm.available():
+        cases.append(swarm_case(2000))
+    return cases
+
+# --- Ejecución y comparación ---
+
+def measure(case, repeat):
+    times = []
+    counters = {}
+    for _ in range(repeat):
+        data = case.setup()
+        start = time.perf_counter()
+        result = case.run(data)
+        times.append((time.perf_counter() - start) * 1000)
+        if isinstance(result, dict):
+            counters = result
+    return {
+        "name": case.name,
+        "group": case.group,
+        "repeat": repeat,
+        "min_ms": min(times),
+        "median_ms": statistics.median(times),
+        "mean_ms": statistics.fmean(times),
+        "counters": counters,
+    }
+
+def run_suite(only=None, repeat=7):
+    init_headless()
+    cases = build_cases()
+    if only:
+        cases = [case for case in cases if any(word in case.name or word == case.group for word in only)]
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": [measure(case, repeat) for case in cases],
+    }
+
+def compare(report, baseline, max_regression=0.25, thresholds=None, metric="median_ms"):
+    """
+    Compara cada caso con el de la línea base. Devuelve una lista de
+    (nombre, base, actual, cambio relativo, ¿regresión?) para los casos presentes en ambas.
+    """
+    thresholds = thresholds or {}
+    previous = {r["name"]: r for r in baseline["results"]}
+    rows = []
+    for result in report["results"]:
+        old = previous.get(result["name"])
+        if old is None:
+            continue
+        change = result[metric] / old[metric] - 1 if old[metric] else 0.0
+        limit = thresholds.get(result["name"], max_regression)
+        rows.append((result["name"], old[metric], result[metric], change, change > limit))
+    return rows
+
+def format_report(report, comparison=None):
+    changes = {row[0]: row for row in comparison or []}
+    lines = [f"{'caso':<32}{'mediana ms':>12}{'mín ms':>10}{'vs base':>10}"]
+    for r in report["results"]:
+        row = changes.get(r["name"])
+        delta = f"{row[3]:+.0%}" if row else "-"
+        flag = "  REGRESIÓN" if row and row[4] else ""
+        lines.append(f"{r['name']:<32}{r['median_ms']:>12.3f}{r['min_ms']:>10.3f}{delta:>10}{flag}")
+    return "\n".join(lines)
+
+def _parse_thresholds(values):
+    thresholds = {}
+    for value in values or []:
+        name, _, limit = value.rpartition("=")
+        thresholds[name] = float(limit)
+    return thresholds
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de pathfinding, IA, generación de nivel y ticks")
+    parser.add_argument("--repeat", type=int, default=7, help="repeticiones por caso (se usa la mediana)")
+    parser.add_argument("--only", action="append", help="ejecutar solo los casos de este grupo o cuyo nombre contenga este texto")
+    parser.add_argument("--json", help="archivo donde escribir los resultados en JSON ('-' para stdout)")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--save-baseline", help="guardar esta ejecución como línea base")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="aumento relativo máximo permitido de la mediana (0.25 = 25%%)")
+    parser.add_argument("--threshold", action="append", metavar="CASO=MARGEN",
+                        help="margen propio para un caso, p. ej. chase_action/500=0.5")
+    args = parser.parse_args(argv)
+
+    # Los avisos del juego (imágenes de reemplazo, etc.) van a stderr para no mezclarse con el JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run_suite(args.only, args.repeat)
+    comparison = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        comparison = compare(report, baseline, args.max_regression, _parse_thresholds(args.threshold))
+        report["comparison"] = [
+            {"name": name, "baseline_ms": old, "current_ms": new, "change": change, "regression": bad}
+            for name, old, new, change, bad in comparison
+        ]
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_report(report, comparison))
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+    regressions = [row[0] for row in comparison or [] if row[4]]
+    if regressions:
+        print(f"{len(regressions)} regresiones: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
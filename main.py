@@ -1,8 +1,16 @@
+import pygame
 from src import game, settings, music
+from src.preload import Preloader
 
 def main():
+    pygame.init()
+    pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+    pygame.display.set_caption("New Rally X")
     sound_enabled = True
-    game.show_story()
+    # Las imágenes del menú y de la partida se decodifican mientras se lee la historia
+    preloader = Preloader(game.PRELOAD_MANIFEST)
+    preloader.start()
+    game.show_story(preloader)
     choice, sound_enabled = game.main_menu(sound_enabled)
     if choice == "start":
         game.game_loop()
@@ -2,24 +2,11 @@
 import os
 import pygame
 from src.settings import RED
-
-_image_cache = {}
+from src.assets import assets
 
 def load_image(path, size=None, fallback_size=(50, 50)):
-    """Carga una imagen y la escala si se especifica. Utiliza caché para mejorar el rendimiento."""
-    if path in _image_cache:
-        image = _image_cache[path]
-    else:
-        try:
-            image = pygame.image.load(path).convert_alpha()
-            _image_cache[path] = image
-        except pygame.error:
-            print(f"No se pudo cargar {path}. Usando imagen de reemplazo.")
-            image = pygame.Surface(fallback_size)
-            image.fill(RED)
-    if size:
-        image = pygame.transform.scale(image, size)
-    return image
+    """Carga una imagen y la escala si se especifica. Usa la caché compartida de src.assets."""
+    return assets.load(path, size, fallback_color=RED, fallback_size=fallback_size)
 
 def load_music(path, volume=0.5):
     """Carga la música de fondo."""
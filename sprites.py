@@ -2,16 +2,20 @@
 import pygame
 import random
 from resources import load_image
+from src.assets import COLORKEY
+from src.rotation import rotation_cache
 from src.settings import WIDTH, HEIGHT, CELL_SIZE, RED, BLUE, GREEN, YELLOW, BLACK
 
 class Player(pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
         self.original_image = load_image("player01_.png", size=(55, 55))
-        self.image = self.original_image.copy()
+        rotation_cache.precompute(self.original_image)
+        self.angle = 0
+        self.image_angle = 0
+        self.image = rotation_cache.get(self.original_image, self.angle)
         self.rect = self.image.get_rect(topleft=(100, 100))
         self.speed = 4
-        self.angle = 0
         self.coins_collected = 0
         self.health = 100
         self.shoot_cooldown = 200  
@@ -54,9 +58,11 @@ class Player(pygame.sprite.Sprite):
         if any(ob.rect.colliderect(self.rect) for ob in obstacles):
             self.rect.y = original_rect.y
 
-        # Rotar imagen según la dirección
-        self.image = pygame.transform.rotate(self.original_image, self.angle)
-        self.rect = self.image.get_rect(center=self.rect.center)
+        # Cambiar la imagen solo cuando cambia la dirección (rotaciones precalculadas)
+        if self.angle != self.image_angle:
+            self.image = rotation_cache.get(self.original_image, self.angle)
+            self.image_angle = self.angle
+            self.rect = self.image.get_rect(center=self.rect.center)
 
 class Bullet(pygame.sprite.Sprite):
     def __init__(self, x, y, angle):
@@ -81,7 +87,7 @@ class Enemy(pygame.sprite.Sprite):
     def __init__(self, x, y, ai_tree):
         super().__init__()
         self.original_image = load_image("enemigos01.png", size=(50, 50))
-        self.image = self.original_image.copy()
+        self.image = self.original_image
         self.rect = self.image.get_rect(topleft=(x, y))
         self.pos = pygame.math.Vector2(x, y)
         self.speed = 2
@@ -115,9 +121,14 @@ class VariedObstacle(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height, shape="rectangle"):
         super().__init__()
         self.shape = shape
-        self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+        # Sin alfa por píxel: el rectángulo es opaco y en las demás formas lo que queda
+        # fuera es transparente por colorkey (con RLE), que se dibuja mucho más rápido
+        self.image = pygame.Surface((width, height))
         if shape in ["rectangle", "square"]:
-            pygame.draw.rect(self.image, BLACK, (0, 0, width, height))
-        elif shape == "ellipse":
-            pygame.draw.ellipse(self.image, BLACK, (0, 0, width, height))
+            self.image.fill(BLACK)
+        else:
+            self.image.fill(COLORKEY)
+            if shape == "ellipse":
+                pygame.draw.ellipse(self.image, BLACK, (0, 0, width, height))
+            self.image.set_colorkey(COLORKEY, pygame.RLEACCEL)
         self.rect = self.image.get_rect(topleft=(x, y))
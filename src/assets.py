@@ -0,0 +1,191 @@
+from collections import OrderedDict
+import pygame
+from src.settings import RED
+
+# Color que se usa como colorkey (si la imagen no lo contiene ya) y umbrales de "auto":
+# un píxel con alfa <= HARD_ALPHA[0] cuenta como transparente y con alfa >= HARD_ALPHA[1]
+# como opaco; si los intermedios no pasan de SOFT_RATIO de la imagen basta un colorkey
+COLORKEY = (255, 0, 255)
+HARD_ALPHA = (8, 247)
+SOFT_RATIO = 0.02
+
+class AssetManager:
+    """
+    Caché única de imágenes por (ruta, tamaño, modo de conversión).
+    Cada imagen se decodifica una sola vez y todas las instancias comparten la misma
+    superficie escalada, así que no hay que modificarla después de cargarla.
+    Con un presupuesto de memoria en bytes: al superarlo se descartan las entradas
+    usadas hace más tiempo (LRU).
+    Modos: "alpha" (convert_alpha), "opaque" (convert), "colorkey" (convert con colorkey
+    y RLE), "rle" (convert_alpha con RLE), "auto" (el más barato de los anteriores que
+    conserva el aspecto, ver blit_mode) o None (sin convertir).
+    """
+    def __init__(self, budget_bytes=64 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.bytes_held = 0
+        self.decodes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._surfaces = OrderedDict()
+        self._sizes = {}
+        self._pending = {}  # clave -> función que espera a una precarga en curso
+
+    def load(self, path, size=None, mode="auto", fallback_color=RED, fallback_size=(50, 50)):
+        key = (path, tuple(size) if size else None, mode)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        waiter = self._pending.pop(key, None)
+        if waiter is not None:
+            waiter()
+            surface = self._surfaces.get(key)
+            if surface is not None:
+                self.hits += 1
+                return surface
+        self.misses += 1
+        source = self._source(path)
+        if source is None:
+            surface = pygame.Surface(size or fallback_size)
+            surface.fill(fallback_color)
+        else:
+            # Se escala antes de convertir: el formato (colorkey, RLE) se decide con la imagen final
+            surface = source
+            if size and surface.get_size() != tuple(size):
+                surface = pygame.transform.scale(surface, size)
+            surface = self.convert(surface, mode)
+        self._store(key, surface)
+        return surface
+
+    def convert(self, surface, mode):
+        try:
+            if mode == "auto":
+                mode = blit_mode(surface)
+            if mode == "alpha":
+                return surface.convert_alpha()
+            if mode == "rle":
+                return accelerate(surface.convert_alpha())
+            if mode == "colorkey":
+                return to_colorkey(surface)
+            if mode == "opaque":
+                return surface.convert()
+        except pygame.error:
+            pass  # Sin modo de vídeo no se puede convertir; se usa tal cual
+        return surface
+
+    def _source(self, path):
+        # La imagen decodificada sin escalar también se guarda para no volver a leer el archivo
+        # cuando se pide la misma ruta con otro tamaño o modo.
+        key = (path, None, None)
+        source = self._surfaces.get(key)
+        if source is not None:
+            self._surfaces.move_to_end(key)
+            return source
+        try:
+            source = self.decode(path)
+        except (pygame.error, FileNotFoundError):
+            print(f"No se pudo cargar {path}. Usando imagen de reemplazo.")
+            return None
+        self._store(key, source)
+        return source
+
+    def decode(self, path):
+        self.decodes += 1
+        return pygame.image.load(path)
+
+    def put(self, path, size, mode, surface):
+        """Registra una superficie ya preparada fuera del gestor (por ejemplo, precargada)."""
+        self._store((path, tuple(size) if size else None, mode), surface)
+
+    def register_pending(self, key, waiter):
+        self._pending[key] = waiter
+
+    def discard_pending(self, key):
+        self._pending.pop(key, None)
+
+    def contains(self, path, size=None, mode="auto"):
+        return (path, tuple(size) if size else None, mode) in self._surfaces
+
+    def _store(self, key, surface):
+        if key in self._surfaces:
+            self.bytes_held -= self._sizes[key]
+            self._surfaces.move_to_end(key)  # lo recién guardado no debe ser lo primero en salir
+        nbytes = surface.get_pitch() * surface.get_height()
+        self._surfaces[key] = surface
+        self._sizes[key] = nbytes
+        self.bytes_held += nbytes
+        while self.bytes_held > self.budget_bytes and len(self._surfaces) > 1:
+            old_key, _ = self._surfaces.popitem(last=False)
+            self.bytes_held -= self._sizes.pop(old_key)
+            self.evictions += 1
+
+    def clear(self):
+        # Las esperas de `_pending` no se tocan: son precargas aún en curso que el propio
+        # AssetPreloader retira al terminar (y cuyo resultado guarda igualmente); quitarlas
+        # solo haría que load() volviera a decodificar lo que ya se está decodificando
+        self._surfaces.clear()
+        self._sizes.clear()
+        self.bytes_held = 0
+
+    def stats(self):
+        return {
+            "decodes": self.decodes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._surfaces),
+            "bytes_held": self.bytes_held,
+        }
+
+def blit_mode(surface):
+    """
+    Formato más barato de dibujar que no cambia cómo se ve la imagen: "opaque" si no
+    tiene transparencia, "colorkey" si casi todos sus píxeles son opacos o transparentes
+    del todo (los recortes de los sprites) y "rle" si tiene bordes suaves de verdad.
+    """
+    if surface.get_colorkey() is not None:
+        return "colorkey"
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return "opaque"
+    width, height = surface.get_size()
+    total = width * height
+    solid = pygame.mask.from_surface(surface, HARD_ALPHA[1] - 1).count()
+    if solid == total:
+        return "opaque"
+    visible = pygame.mask.from_surface(surface, HARD_ALPHA[0]).count()
+    if visible - solid <= SOFT_RATIO * total:
+        return "colorkey"
+    return "rle"
+
+def accelerate(surface):
+    """Activa el blit RLE de una superficie con colorkey o con alfa por píxel. Devuelve la misma."""
+    key = surface.get_colorkey()
+    if key is not None:
+        surface.set_colorkey(key, pygame.RLEACCEL)
+    elif surface.get_flags() & pygame.SRCALPHA:
+        surface.set_alpha(255, pygame.RLEACCEL)
+    return surface
+
+def to_colorkey(surface):
+    """
+    Copia opaca en el formato de la pantalla donde los píxeles con alfa < 128 pasan a ser
+    el colorkey (con RLE). El color elegido no aparece en la parte visible de la imagen.
+    """
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return accelerate(surface.convert())
+    visible = pygame.mask.from_surface(surface, 127)
+    result = surface.convert()
+    for key in (COLORKEY, (0, 255, 255), (255, 255, 0), (1, 2, 3)):
+        if not pygame.mask.from_threshold(result, key, (1, 1, 1, 255)).overlap_area(visible, (0, 0)):
+            break
+    else:
+        return accelerate(surface.convert_alpha())  # todos los colores en uso: alfa con RLE
+    hidden = visible.copy()
+    hidden.invert()
+    hidden.to_surface(result, setcolor=key, unsetcolor=None)
+    result.set_colorkey(key, pygame.RLEACCEL)
+    return result
+
+assets = AssetManager()
@@ -0,0 +1,205 @@
+# Ejecuta muchas partidas sin ventana en paralelo para ajustar la IA y el equilibrio.
+# Uso: python -m src.batch --episodes 100 --radius 150,200,250 --tree default,chase_only
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pygame
+from src.simulation import init_headless, create_state, step, StepInput, NO_KEYS
+from src.behavior import AI_TREES
+from src.flowfield import flow_field_for
+from src.settings import CHASE_RADIUS, AI_TICK_RATE
+
+DIRECTIONS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+
+DEFAULT_CONFIG = {
+    "seed": 0,
+    "level": 1,
+    "enemy_count": None,      # None: el del nivel
+    "tree": "default",        # clave de behavior.AI_TREES
+    "chase": "flow",          # clave de behavior.CHASE_ACTIONS
+    "ai_rate": AI_TICK_RATE,  # decisiones de IA por segundo (0: cada tick)
+    "chase_radius": CHASE_RADIUS,
+    "path_recalc_interval": 500,
+    "enemy_speed": 1.5,
+    "policy": "random",       # "random" o "scripted"
+    "max_ticks": 3600,
+}
+
+def random_policy(rng):
+    """Mantiene una dirección al azar durante unos ticks y dispara de vez en cuando."""
+    current = {"key": rng.choice(DIRECTIONS), "left": 0}
+
+    def policy(state):
+        if current["left"] <= 0:
+            current["key"] = rng.choice(DIRECTIONS)
+            current["left"] = rng.randint(10, 40)
+        current["left"] -= 1
+        keys = dict(NO_KEYS)
+        keys[current["key"]] = True
+        return StepInput(keys, shoot=rng.random() < 0.05)
+    return policy
+
+def scripted_policy(rng):
+    """Va hacia la moneda más cercana y dispara cada cierto tiempo."""
+    def policy(state):
+        keys = dict(NO_KEYS)
+        player = state.player.rect
+        coins = state.coin_group.sprites()
+        if coins:
+            target = min(coins, key=lambda c: abs(c.rect.centerx - player.centerx) + abs(c.rect.centery - player.centery))
+            dx = target.rect.centerx - player.centerx
+            dy = target.rect.centery - player.centery
+            if abs(dx) > abs(dy):
+                keys[pygame.K_RIGHT if dx > 0 else pygame.K_LEFT] = True
+            elif dy:
+                keys[pygame.K_DOWN if dy > 0 else pygame.K_UP] = True
+        return StepInput(keys, shoot=state.tick % 20 == 0)
+    return policy
+
+POLICIES = {
+    "random": random_policy,
+    "scripted": scripted_policy,
+}
+
+def run_episode(config):
+    """Juega una partida completa sin dibujar y devuelve un registro compacto de resultados."""
+    config = dict(DEFAULT_CONFIG, **config)
+    init_headless()
+    # La partida usa su propio RNG (state.rng); las entradas usan otro derivado de la semilla
+    rng = random.Random(config["seed"] * 7919 + 1)
+    ai_tree = AI_TREES[config["tree"]](config["chase"])
+    state = create_state(config["level"], ai_tree, config["enemy_count"], seed=config["seed"],
+                         ai_rate=config["ai_rate"])
+    for enemy in state.enemy_group:
+        enemy.speed = config["enemy_speed"]
+        enemy.chase_radius = config["chase_radius"]
+        enemy.path_recalc_interval = config["path_recalc_interval"]
+    policy = POLICIES[config["policy"]](rng)
+    step_time = 0.0
+    while not state.game_over and not state.win and state.tick < config["max_ticks"]:
+        inputs = policy(state)
+        start = time.perf_counter()
+        step(state, inputs)
+        step_time += time.perf_counter() - start
+    record = {key: config[key] for key in DEFAULT_CONFIG}
+    record.update({
+        "ticks": state.tick,
+        "win": state.win,
+        "game_over": state.game_over,
+        "score": state.player.score,
+        "coins": state.player.coins_collected,
+        "health": state.player.health,
+        "astar_calls": state.grid.searches,
+        "expanded": state.grid.expanded,
+        "flow_rebuilds": flow_field_for(state.grid).rebuilds,
+        "mean_step_ms": step_time * 1000 / max(state.tick, 1),
+    })
+    return record
+
+def _worker_init():
+    # Una instancia de pygame por proceso, sin ventana ni audio
+    init_headless()
+
+def run_batch(configs, workers=None):
+    """Reparte las partidas entre procesos y va devolviendo los registros según terminan."""
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_worker_init) as executor:
+        futures = [executor.submit(run_episode, config) for config in configs]
+        for future in as_completed(futures):
+            yield future.result()
+
+def expand_configs(episodes, **params):
+    """Producto cartesiano de los parámetros; cada combinación se juega `episodes` veces con semillas distintas."""
+    names = list(params)
+    configs = []
+    for values in itertools.product(*(params[name] for name in names)):
+        for seed in range(episodes):
+            config = dict(zip(names, values))
+            config["seed"] = seed
+            configs.append(config)
+    return configs
+
+def summarize(records, group_by):
+    """Agrupa los registros por las claves de `group_by` y promedia los resultados."""
+    groups = {}
+    for record in records:
+        groups.setdefault(tuple(record[key] for key in group_by), []).append(record)
+    rows = []
+    for key, items in sorted(groups.items(), key=lambda item: str(item[0])):
+        n = len(items)
+        row = dict(zip(group_by, key))
+        row.update({
+            "episodes": n,
+            "win_rate": sum(r["win"] for r in items) / n,
+            "ticks": sum(r["ticks"] for r in items) / n,
+            "score": sum(r["score"] for r in items) / n,
+            "coins": sum(r["coins"] for r in items) / n,
+            "astar_calls": sum(r["astar_calls"] for r in items) / n,
+            "step_ms": sum(r["mean_step_ms"] for r in items) / n,
+        })
+        rows.append(row)
+    return rows
+
+def format_table(rows):
+    if not rows:
+        return ""
+    columns = list(rows[0])
+    cells = [[f"{row[c]:.3f}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.rjust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.rjust(w) for v, w in zip(r, widths)) for r in cells]
+    return "\n".join(lines)
+
+def _parse_list(text, cast=str):
+    return [cast(value) for value in text.split(",")]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partidas en lote sin ventana para ajustar la IA")
+    parser.add_argument("--episodes", type=int, default=20, help="partidas por combinación de parámetros")
+    parser.add_argument("--level", default="1")
+    parser.add_argument("--enemies", default="", help="número de enemigos (por defecto, el del nivel)")
+    parser.add_argument("--tree", default="default")
+    parser.add_argument("--chase", default="flow")
+    parser.add_argument("--radius", default=str(CHASE_RADIUS))
+    parser.add_argument("--ai-rate", default=str(AI_TICK_RATE), help="decisiones de IA por segundo (0: cada tick)")
+    parser.add_argument("--recalc", default="500")
+    parser.add_argument("--speed", default="1.5")
+    parser.add_argument("--policy", default="random")
+    parser.add_argument("--max-ticks", type=int, default=3600)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", help="archivo JSON Lines donde guardar cada registro")
+    args = parser.parse_args(argv)
+    params = {
+        "level": _parse_list(args.level, int),
+        "enemy_count": _parse_list(args.enemies, int) if args.enemies else [None],
+        "tree": _parse_list(args.tree),
+        "chase": _parse_list(args.chase),
+        "ai_rate": _parse_list(args.ai_rate, int),
+        "chase_radius": _parse_list(args.radius, float),
+        "path_recalc_interval": _parse_list(args.recalc, int),
+        "enemy_speed": _parse_list(args.speed, float),
+        "policy": _parse_list(args.policy),
+        "max_ticks": [args.max_ticks],
+    }
+    configs = expand_configs(args.episodes, **params)
+    group_by = [name for name, values in params.items() if len(values) > 1] or ["policy"]
+    records = []
+    output = open(args.output, "w") if args.output else None
+    start = time.perf_counter()
+    try:
+        for record in run_batch(configs, args.workers):
+            records.append(record)
+            if output:
+                output.write(json.dumps(record) + "\n")
+    finally:
+        if output:
+            output.close()
+    elapsed = time.perf_counter() - start
+    print(format_table(summarize(records, group_by)))
+    print(f"{len(records)} partidas en {elapsed:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 import math
 import pygame
-from .level import copy_grid, a_star
-from .settings import CELL_SIZE
+from . import simclock
+from .pathcache import path_cache_for
+from .pathservice import path_service_for, NO_RESULT
+from .incremental import IncrementalPlanner
+from .flowfield import flow_field_for
+from .reachability import reachable
+from .pathfinding import get_engine
+from .settings import CELL_SIZE, PATHFINDING_MODE
 
 class BehaviorNode:
     def run(self, enemy, player, grid, grid_width, grid_height):
@@ -45,32 +51,98 @@ class SelectorNode(BehaviorNode):
 def condition_player_close(enemy, player, grid, grid_width, grid_height):
     dx = player.rect.centerx - enemy.rect.centerx
     dy = player.rect.centery - enemy.rect.centery
-    return math.hypot(dx, dy) < 200
+    return math.hypot(dx, dy) < enemy.chase_radius
 
 def chase_action(enemy, player, grid, grid_width, grid_height):
-    current_time = pygame.time.get_ticks()
+    current_time = simclock.get_ticks()
     enemy_cell = (enemy.rect.centerx // CELL_SIZE, enemy.rect.centery // CELL_SIZE)
     player_cell = (player.rect.centerx // CELL_SIZE, player.rect.centery // CELL_SIZE)
     recalc_needed = False
     if current_time - enemy.last_path_calc_time > enemy.path_recalc_interval:
         recalc_needed = True
-    if enemy.last_target_position is None:
+    if enemy.last_target_position is None or enemy.cached_path_version != grid.version:
         recalc_needed = True
     else:
         if abs(player_cell[0] - enemy.last_target_position[0]) > 1 or abs(player_cell[1] - enemy.last_target_position[1]) > 1:
             recalc_needed = True
     if recalc_needed:
-        grid_copy = copy_grid(grid)
-        start = grid_copy[enemy_cell[1]][enemy_cell[0]]
-        goal = grid_copy[player_cell[1]][player_cell[0]]
-        path = a_star(start, goal, grid_copy, grid_width, grid_height)
+        engine = get_engine(PATHFINDING_MODE)
+        path = path_cache_for(grid).get_path(grid, enemy_cell, player_cell, search=engine.find_path)
         enemy.cached_path = path if path is not None else []
         enemy.last_path_calc_time = current_time
         enemy.last_target_position = player_cell
+        enemy.cached_path_version = grid.version
     else:
         path = enemy.cached_path
-    if path and len(path) > 1:
-        next_cell = path[1]
+    next_cell = path[1] if path and len(path) > 1 else None
+    steer_towards_cell(enemy, player, next_cell)
+
+def queued_chase_action(enemy, player, grid, grid_width, grid_height):
+    """
+    Como chase_action, pero el camino se pide al PathService del grid en lugar de
+    calcularlo aquí: la búsqueda se reparte entre ticks y mientras tanto el enemigo
+    sigue su camino anterior (o va directo al jugador si aún no tiene ninguno). Si el
+    jugador se aleja más de una celda de la meta pedida, la petición se sustituye.
+    """
+    current_time = simclock.get_ticks()
+    enemy_cell = (enemy.rect.centerx // CELL_SIZE, enemy.rect.centery // CELL_SIZE)
+    player_cell = (player.rect.centerx // CELL_SIZE, player.rect.centery // CELL_SIZE)
+    service = path_service_for(grid)
+    result = service.take(enemy)
+    if result is not NO_RESULT:
+        enemy.cached_path = result if result is not None else []
+        enemy.cached_path_version = grid.version
+    recalc_needed = current_time - enemy.last_path_calc_time > enemy.path_recalc_interval
+    moved = False
+    if enemy.last_target_position is None or enemy.cached_path_version != grid.version:
+        recalc_needed = True
+    elif abs(player_cell[0] - enemy.last_target_position[0]) > 1 or abs(player_cell[1] - enemy.last_target_position[1]) > 1:
+        recalc_needed = moved = True
+    # Con una búsqueda en cola solo se vuelve a pedir si el jugador se alejó de su meta
+    # (last_target_position): la nueva petición sustituye a la pendiente
+    if recalc_needed and (moved or not service.is_pending(enemy)):
+        # Los más cercanos al jugador primero
+        priority = abs(enemy_cell[0] - player_cell[0]) + abs(enemy_cell[1] - player_cell[1])
+        service.request(enemy, enemy_cell, player_cell, priority)
+        enemy.last_path_calc_time = current_time
+        enemy.last_target_position = player_cell
+        result = service.take(enemy)  # listo al momento si estaba en la caché
+        if result is not NO_RESULT:
+            enemy.cached_path = result if result is not None else []
+            enemy.cached_path_version = grid.version
+    path = enemy.cached_path
+    next_cell = None
+    if path:
+        # El camino puede ser de hace unos ticks: se sigue desde la celda actual si está en él
+        try:
+            i = path.index(enemy_cell)
+        except ValueError:
+            i = 0
+        if i + 1 < len(path):
+            next_cell = path[i + 1]
+    steer_towards_cell(enemy, player, next_cell)
+
+def incremental_chase_action(enemy, player, grid, grid_width, grid_height):
+    # Cada enemigo conserva su árbol de búsqueda y solo lo repara cuando el jugador o el grid cambian.
+    enemy_cell = (enemy.rect.centerx // CELL_SIZE, enemy.rect.centery // CELL_SIZE)
+    player_cell = (player.rect.centerx // CELL_SIZE, player.rect.centery // CELL_SIZE)
+    if not reachable(grid, enemy_cell, player_cell):
+        steer_towards_cell(enemy, player, None)  # sin camino posible: no se repara nada
+        return
+    if enemy.planner is None:
+        enemy.planner = IncrementalPlanner()
+    steer_towards_cell(enemy, player, enemy.planner.next_cell(grid, enemy_cell, player_cell))
+
+def flow_chase_action(enemy, player, grid, grid_width, grid_height):
+    # Todos los perseguidores leen la siguiente celda del mismo campo de flujo.
+    enemy_cell = (enemy.rect.centerx // CELL_SIZE, enemy.rect.centery // CELL_SIZE)
+    player_cell = (player.rect.centerx // CELL_SIZE, player.rect.centery // CELL_SIZE)
+    field = flow_field_for(grid)
+    field.update(grid, player_cell)
+    steer_towards_cell(enemy, player, field.next_cell(enemy_cell))
+
+def steer_towards_cell(enemy, player, next_cell):
+    if next_cell is not None:
         target_vector = pygame.math.Vector2(next_cell[0] * CELL_SIZE + CELL_SIZE // 2,
                                             next_cell[1] * CELL_SIZE + CELL_SIZE // 2)
         move_vector = target_vector - enemy.pos
@@ -91,3 +163,106 @@ def patrol_action(enemy, player, grid, grid_width, grid_height):
         move_vector = target - enemy.pos
     if move_vector.length() != 0:
         enemy.pos += move_vector.normalize() * enemy.speed
+
+# Acciones de persecución disponibles, por nombre (para configurar y comparar árboles)
+CHASE_ACTIONS = {
+    "flow": flow_chase_action,
+    "astar": chase_action,
+    "queued": queued_chase_action,
+    "incremental": incremental_chase_action,
+}
+
+def build_ai_tree(chase=flow_chase_action):
+    """Árbol de comportamiento por defecto: perseguir si el jugador está cerca, si no patrullar."""
+    if isinstance(chase, str):
+        chase = CHASE_ACTIONS[chase]
+    return SelectorNode([
+        SequenceNode([ConditionNode(condition_player_close), ActionNode(chase)]),
+        ActionNode(patrol_action)
+    ])
+
+def build_chase_only_tree(chase=flow_chase_action):
+    """Variante sin patrulla: persigue siempre, esté cerca o lejos."""
+    if isinstance(chase, str):
+        chase = CHASE_ACTIONS[chase]
+    return SelectorNode([ActionNode(chase)])
+
+class CompiledTree:
+    """
+    Árbol de comportamiento traducido a una sola función de Python, sin una llamada
+    a run() por nodo. run() equivale exactamente al árbol original; decide() evalúa
+    solo las condiciones y devuelve la tupla de acciones que se ejecutarían, para
+    separar la decisión (cara, poco frecuente) del movimiento (cada tick).
+    En decide() todas las condiciones de una rama se evalúan antes de sus acciones.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._names = {}
+        self._globals = {}
+        self.source = "\n".join([
+            "def run(e, p, g, w, h):",
+            "    return bool(" + self._expression(root) + ")",
+            "",
+            "def decide(e, p, g, w, h):",
+            *self._statements(root, "r", 1),
+            "    return r or ()",
+        ])
+        exec(compile(self.source, "<behavior tree>", "exec"), self._globals)
+        self.run = self._globals["run"]
+        self.decide = self._globals["decide"]
+
+    def _name(self, func, prefix):
+        # Cada función del árbol se guarda como global del código generado
+        name = self._names.get(func)
+        if name is None:
+            name = self._names[func] = f"{prefix}{len(self._names)}"
+            self._globals[name] = func
+        return name
+
+    def _expression(self, node):
+        if isinstance(node, ConditionNode):
+            return f"{self._name(node.condition_func, 'c')}(e, p, g, w, h)"
+        if isinstance(node, ActionNode):
+            return f"({self._name(node.action_func, 'a')}(e, p, g, w, h) or True)"
+        if isinstance(node, SequenceNode):
+            return "(" + " and ".join([self._expression(c) for c in node.children] or ["True"]) + ")"
+        if isinstance(node, SelectorNode):
+            return "(" + " or ".join([self._expression(c) for c in node.children] or ["False"]) + ")"
+        return f"{self._name(node.run, 'n')}(e, p, g, w, h)"
+
+    def _statements(self, node, var, depth):
+        """Código que deja en `var` la tupla de acciones elegidas, o None si la rama falla."""
+        pad = "    " * depth
+        if isinstance(node, ConditionNode):
+            return [f"{pad}{var} = () if {self._expression(node)} else None"]
+        if isinstance(node, ActionNode):
+            return [f"{pad}{var} = ({self._name(node.action_func, 'a')},)"]
+        if isinstance(node, SequenceNode):
+            lines = [f"{pad}{var} = ()"]
+            for i, child in enumerate(node.children):
+                inner = "    " * (depth + i)
+                lines += self._statements(child, var + "_", depth + i)
+                lines += [f"{inner}if {var}_ is None:", f"{inner}    {var} = None", f"{inner}else:",
+                          f"{inner}    {var} += {var}_"]
+            return lines
+        if isinstance(node, SelectorNode):
+            lines = [f"{pad}{var} = None"]
+            for i, child in enumerate(node.children):
+                inner = "    " * (depth + i)
+                lines += self._statements(child, var, depth + i)
+                if i < len(node.children) - 1:
+                    lines.append(f"{inner}if {var} is None:")
+            return lines
+        # Nodo desconocido: se ejecuta tal cual y cuenta como una acción
+        return [f"{pad}{var} = ({self._name(node.run, 'n')},)"]
+
+def compile_tree(tree):
+    """Compila un árbol de nodos; si ya está compilado lo devuelve tal cual."""
+    if isinstance(tree, CompiledTree):
+        return tree
+    return CompiledTree(tree)
+
+AI_TREES = {
+    "default": build_ai_tree,
+    "chase_only": build_chase_only_tree,
+}
@@ -0,0 +1,315 @@
+import math
+from array import array
+import pygame
+from .settings import WIDTH, HEIGHT, YELLOW, BULLET_POOL_SIZE, BULLET_SPEED
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él se usan bucles de Python sobre array('d')
+    np = None
+
+# Dirección de la bala según el ángulo del jugador (como Bullet.update)
+DIRECTIONS = {0: (1, 0), 180: (-1, 0), 90: (0, -1), 270: (0, 1)}
+
+_FIELDS = ("x", "y", "vx", "vy", "prev_x", "prev_y")
+
+class BulletSystem:
+    """
+    Todas las balas en arrays (centro, velocidad y centro del tick anterior) en lugar de
+    un sprite con su propia Surface por disparo. Los arrays se reservan de antemano
+    (`capacity`, se duplican si hace falta) y las balas eliminadas se compactan, así
+    que las activas son siempre [:count]. Todas comparten una sola imagen.
+    Los impactos se calculan con el segmento recorrido en el tick contra el rect del
+    enemigo ampliado con el tamaño de la bala, así que una bala rápida no lo atraviesa.
+    """
+    def __init__(self, capacity=BULLET_POOL_SIZE, size=10, color=YELLOW, bounds=(0, 0, WIDTH, HEIGHT)):
+        self.size = size
+        self.half = size / 2
+        self.bounds = bounds
+        self.image = pygame.Surface((size, size))
+        self.image.fill(color)
+        self.count = 0
+        self.capacity = 0
+        self._allocate(max(capacity, 1))
+        self.fired = 0
+        self.culled = 0
+        self.hits = 0
+
+    def _allocate(self, capacity):
+        for name in _FIELDS:
+            old = getattr(self, name, None)
+            if np is not None:
+                new = np.zeros(capacity, dtype=np.float64)
+                if old is not None:
+                    new[:self.count] = old[:self.count]
+            else:
+                new = array('d', bytes(8 * capacity))
+                if old is not None:
+                    new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, vx, vy):
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.count += 1
+        self.fired += 1
+
+    def fire(self, x, y, angle, speed=BULLET_SPEED):
+        """Disparo del jugador desde (x, y) en la dirección de `angle` (0, 90, 180 o 270)."""
+        dx, dy = DIRECTIONS.get(angle, (1, 0))
+        self.spawn(x, y, dx * speed, dy * speed)
+
+    def spawn_ring(self, x, y, count, speed=BULLET_SPEED, phase=0.0):
+        """`count` balas en círculo alrededor de (x, y): el patrón del modo de estrés."""
+        for k in range(count):
+            a = phase + 2 * math.pi * k / count
+            self.spawn(x, y, math.cos(a) * speed, math.sin(a) * speed)
+
+    def _keep(self, keep):
+        """Compacta los arrays quedándose con las balas marcadas en `keep`."""
+        n = self.count
+        if np is not None:
+            kept = int(keep.sum())
+            if kept != n:
+                for name in _FIELDS:
+                    values = getattr(self, name)
+                    values[:kept] = values[:n][keep]
+        else:
+            indices = [i for i in range(n) if keep[i]]
+            kept = len(indices)
+            if kept != n:
+                for name in _FIELDS:
+                    values = getattr(self, name)
+                    values[:kept] = array('d', [values[i] for i in indices])
+        self.count = kept
+        return n - kept
+
+    def update(self):
+        """Mueve todas las balas un tick y elimina las que salieron de los límites."""
+        n = self.count
+        if n == 0:
+            return
+        left, top, right, bottom = self.bounds
+        half = self.half
+        if np is not None:
+            x, y = self.x[:n], self.y[:n]
+            self.prev_x[:n] = x
+            self.prev_y[:n] = y
+            x += self.vx[:n]
+            y += self.vy[:n]
+            keep = (x + half >= left) & (x - half <= right) & (y + half >= top) & (y - half <= bottom)
+        else:
+            x, y, vx, vy = self.x, self.y, self.vx, self.vy
+            keep = []
+            for i in range(n):
+                self.prev_x[i] = x[i]
+                self.prev_y[i] = y[i]
+                x[i] += vx[i]
+                y[i] += vy[i]
+                keep.append(x[i] + half >= left and x[i] - half <= right and
+                            y[i] + half >= top and y[i] - half <= bottom)
+        self.culled += self._keep(keep)
+
+    def shift(self, dx, dy):
+        """Desplaza todas las balas (y su posición anterior), p. ej. al mover el origen del mundo."""
+        n = self.count
+        if np is not None:
+            self.x[:n] += dx
+            self.prev_x[:n] += dx
+            self.y[:n] += dy
+            self.prev_y[:n] += dy
+            return
+        for i in range(n):
+            self.x[i] += dx
+            self.prev_x[i] += dx
+            self.y[i] += dy
+            self.prev_y[i] += dy
+
+    def collide(self, rects):
+        """Impactos contra una lista de rects (enemigos). Ver collide_boxes."""
+        if not rects:
+            return []
+        if np is not None:
+            boxes = np.array([(r.left, r.top, r.right, r.bottom) for r in rects], dtype=np.float64)
+            return self.collide_boxes(boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3])
+        return self.collide_boxes([r.left for r in rects], [r.top for r in rects],
+                                  [r.right for r in rects], [r.bottom for r in rects])
+
+    def collide_boxes(self, left, top, right, bottom):
+        """
+        Cada bala que en este tick tocó algún rect desaparece; cuenta como impacto contra el
+        primero que alcanzó en su recorrido. Devuelve los índices (ordenados) de los rects alcanzados.
+        """
+        n = self.count
+        if n == 0 or len(left) == 0:
+            return []
+        if np is not None:
+            first = self._first_hits(n, left, top, right, bottom)
+            hit = first >= 0
+            if not hit.any():
+                return []
+            targets = sorted(set(first[hit].tolist()))
+            self.hits += int(hit.sum())
+            self._keep(~hit)
+            return targets
+        targets = set()
+        keep = []
+        half = self.half
+        for i in range(n):
+            x0, y0 = self.prev_x[i], self.prev_y[i]
+            dx, dy = self.x[i] - x0, self.y[i] - y0
+            best, best_t = -1, None
+            for j in range(len(left)):
+                t = _segment_enters(x0, y0, dx, dy, left[j] - half, top[j] - half, right[j] + half, bottom[j] + half)
+                if t is not None and (best_t is None or t < best_t):
+                    best, best_t = j, t
+            keep.append(best < 0)
+            if best >= 0:
+                targets.add(best)
+                self.hits += 1
+        self._keep(keep)
+        return sorted(targets)
+
+    def _first_hits(self, n, left, top, right, bottom):
+        # Criba por celdas (ver _candidate_pairs) en lugar de todas las balas x todos los rects;
+        # la prueba de losas exacta solo se hace con los pares cuyas cajas se solapan.
+        half = self.half
+        left = np.asarray(left, dtype=np.float64) - half
+        top = np.asarray(top, dtype=np.float64) - half
+        right = np.asarray(right, dtype=np.float64) + half
+        bottom = np.asarray(bottom, dtype=np.float64) + half
+        x0, y0 = self.prev_x[:n], self.prev_y[:n]
+        x1, y1 = self.x[:n], self.y[:n]
+        low_x, high_x = np.minimum(x0, x1), np.maximum(x0, x1)
+        low_y, high_y = np.minimum(y0, y1), np.maximum(y0, y1)
+        first = np.full(n, -1, dtype=np.int64)
+        bullet, box = _candidate_pairs(low_x, low_y, high_x, high_y, left, top, right, bottom)
+        near = ((low_x[bullet] < right[box]) & (high_x[bullet] > left[box]) &
+                (low_y[bullet] < bottom[box]) & (high_y[bullet] > top[box]))
+        bullet, box = bullet[near], box[near]
+        if not len(bullet):
+            return first
+        # Prueba de losas: intervalo de t en [0, 1] en que el centro de la bala está dentro
+        # del rect ampliado (abierto, como colliderect)
+        ox, oy = x0[bullet], y0[bullet]
+        enter_x, exit_x = _slab(ox, x1[bullet] - ox, left[box], right[box])
+        enter_y, exit_y = _slab(oy, y1[bullet] - oy, top[box], bottom[box])
+        enter = np.maximum(np.maximum(enter_x, enter_y), 0.0)
+        leave = np.minimum(np.minimum(exit_x, exit_y), 1.0)
+        hit = enter < leave
+        bullet, box, enter = bullet[hit], box[hit], enter[hit]
+        if not len(bullet):
+            return first
+        # Para cada bala el rect con menor t (a igual t, el de menor índice); los pares ya
+        # vienen agrupados por bala, así que basta con reducir cada tramo
+        starts = np.flatnonzero(np.r_[True, bullet[1:] != bullet[:-1]])
+        sizes = np.diff(np.r_[starts, len(bullet)])
+        earliest = np.repeat(np.minimum.reduceat(enter, starts), sizes)
+        first[bullet[starts]] = np.minimum.reduceat(np.where(enter == earliest, box, len(left)), starts)
+        return first
+
+    def rects(self):
+        """Rects de las balas activas (para dibujar con otros sistemas o comprobar estados)."""
+        size, half = self.size, self.half
+        return [pygame.Rect(int(x - half), int(y - half), size, size)
+                for x, y in zip(self.x[:self.count], self.y[:self.count])]
+
+    def draw(self, surface, alpha=None, offset=(0, 0)):
+        """
+        Dibuja todas las balas con un solo Surface.blits. Con `alpha` (0-1) se dibujan entre
+        la posición del tick anterior y la actual; `offset` se suma a la posición (la cámara).
+        Devuelve los rects tocados.
+        """
+        n = self.count
+        if n == 0:
+            return []
+        half = self.half
+        ox, oy = offset
+        if alpha is None:
+            xs, ys = self.x[:n], self.y[:n]
+        elif np is not None:
+            xs = self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha
+            ys = self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha
+        else:
+            xs = [px + (x - px) * alpha for px, x in zip(self.prev_x[:n], self.x[:n])]
+            ys = [py + (y - py) * alpha for py, y in zip(self.prev_y[:n], self.y[:n])]
+        if np is not None:
+            xs = (xs - half).astype(np.int64) + ox
+            ys = (ys - half).astype(np.int64) + oy
+            xs, ys = xs.tolist(), ys.tolist()
+        else:
+            xs = [int(x - half) + ox for x in xs]
+            ys = [int(y - half) + oy for y in ys]
+        image = self.image
+        return surface.blits([(image, pos) for pos in zip(xs, ys)])
+
+def _candidate_pairs(low_x, low_y, high_x, high_y, left, top, right, bottom):
+    """
+    Pares (bala, rect) que pueden solaparse, cada uno una sola vez. Cada bala va a la celda
+    de la esquina de su caja de recorrido; cada rect a todas las celdas que toca ampliado
+    por arriba y por la izquierda con el mayor recorrido, así que una bala solo tiene que
+    mirar su celda. Las celdas miden la mitad del mayor rect.
+    """
+    reach_x = float((high_x - low_x).max())
+    reach_y = float((high_y - low_y).max())
+    cell = max(float(max((right - left).max(), (bottom - top).max())) / 2, 1.0)
+    origin_x = min(float(low_x.min()), float(left.min()) - reach_x)
+    origin_y = min(float(low_y.min()), float(top.min()) - reach_y)
+    columns = int((max(float(low_x.max()), float(right.max())) - origin_x) // cell) + 1
+    first_x = ((left - reach_x - origin_x) // cell).astype(np.int64)
+    first_y = ((top - reach_y - origin_y) // cell).astype(np.int64)
+    span_x = ((right - origin_x) // cell).astype(np.int64) - first_x + 1
+    span_y = ((bottom - origin_y) // cell).astype(np.int64) - first_y + 1
+    # Todas las celdas (fila, columna) de cada rect, en bloque: k recorre span_x * span_y
+    spans = span_x * span_y
+    rect = np.repeat(np.arange(len(left)), spans)
+    k = np.arange(int(spans.sum())) - np.repeat(np.cumsum(spans) - spans, spans)
+    keys = (first_y[rect] + k // span_x[rect]) * columns + first_x[rect] + k % span_x[rect]
+    rect = rect[np.argsort(keys, kind="stable")]
+    cells = ((low_y - origin_y) // cell).astype(np.int64) * columns + ((low_x - origin_x) // cell).astype(np.int64)
+    # Rects por celda y dónde empieza cada celda en `rect` (ordenado por celda)
+    per_cell = np.bincount(keys, minlength=int(max(keys.max(), cells.max())) + 1)
+    start = (np.cumsum(per_cell) - per_cell)[cells]
+    counts = per_cell[cells]
+    total = int(counts.sum())
+    bullet = np.repeat(np.arange(len(low_x)), counts)
+    positions = np.arange(total) - np.repeat(np.cumsum(counts) - counts - start, counts)
+    return bullet, rect[positions]
+
+def _slab(origin, delta, low, high):
+    """Intervalo (entrada, salida) de t en que origin + t * delta está entre low y high."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (low - origin) / delta
+        t2 = (high - origin) / delta
+    moving = delta != 0
+    inside = (origin > low) & (origin < high)
+    enter = np.where(moving, np.minimum(t1, t2), np.where(inside, -np.inf, np.inf))
+    leave = np.where(moving, np.maximum(t1, t2), np.where(inside, np.inf, -np.inf))
+    return enter, leave
+
+def _segment_enters(x0, y0, dx, dy, left, top, right, bottom):
+    """t en [0, 1] en que el segmento entra en el rect abierto, o None si no lo toca."""
+    enter, leave = 0.0, 1.0
+    for origin, delta, low, high in ((x0, dx, left, right), (y0, dy, top, bottom)):
+        if delta == 0:
+            if not (low < origin < high):
+                return None
+            continue
+        t1 = (low - origin) / delta
+        t2 = (high - origin) / delta
+        if t1 > t2:
+            t1, t2 = t2, t1
+        enter = max(enter, t1)
+        leave = min(leave, t2)
+    if enter < leave:
+        return enter
+    return None
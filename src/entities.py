@@ -1,20 +1,21 @@
 import pygame
 import random
-from .settings import WIDTH, HEIGHT, CELL_SIZE, WHITE, RED, BLUE, GREEN, YELLOW, BLACK
+from .assets import assets
+from .rotation import rotation_cache
+from .settings import WIDTH, HEIGHT, CELL_SIZE, CHASE_RADIUS, WHITE, RED, BLUE, GREEN, YELLOW, BLACK
 
 class Player(pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
-        try:
-            self.original_image = pygame.image.load("assets/player01_.png").convert_alpha()
-            self.original_image = pygame.transform.scale(self.original_image, (55, 55))
-        except pygame.error:
-            self.original_image = pygame.Surface((55, 55))
-            self.original_image.fill(RED)
-        self.image = self.original_image.copy()
+        self.original_image = assets.load("assets/player01_.png", (55, 55), fallback_color=RED)
+        rotation_cache.precompute(self.original_image)
+        self.angle = 0
+        self.image_angle = 0
+        self.image = rotation_cache.get(self.original_image, self.angle)
         self.rect = self.image.get_rect(topleft=(100, 100))
         self.speed = 4
-        self.angle = 0
+        # Zona en la que se puede mover (la pantalla; en el mundo por trozos, el mundo)
+        self.bounds = pygame.Rect(0, 0, WIDTH, HEIGHT)
         self.coins_collected = 0
         self.health = 100
         self.shoot_cooldown = 200  
@@ -34,22 +35,25 @@ class Player(pygame.sprite.Sprite):
             dy = -self.speed; self.angle = 270
         if keys[pygame.K_DOWN]:
             dy = self.speed; self.angle = 90
+        bounds = self.bounds
         self.rect.x += dx
-        if self.rect.left < 0:
-            self.rect.left = 0
-        if self.rect.right > WIDTH:
-            self.rect.right = WIDTH
-        if any(ob.rect.colliderect(self.rect) for ob in obstacles):
+        if self.rect.left < bounds.left:
+            self.rect.left = bounds.left
+        if self.rect.right > bounds.right:
+            self.rect.right = bounds.right
+        if obstacles.collides(self.rect):
             self.rect.x = original_rect.x
         self.rect.y += dy
-        if self.rect.top < 0:
-            self.rect.top = 0
-        if self.rect.bottom > HEIGHT:
-            self.rect.bottom = HEIGHT
-        if any(ob.rect.colliderect(self.rect) for ob in obstacles):
+        if self.rect.top < bounds.top:
+            self.rect.top = bounds.top
+        if self.rect.bottom > bounds.bottom:
+            self.rect.bottom = bounds.bottom
+        if obstacles.collides(self.rect):
             self.rect.y = original_rect.y
-        self.image = pygame.transform.rotate(self.original_image, self.angle)
-        self.rect = self.image.get_rect(center=self.rect.center)
+        if self.angle != self.image_angle:
+            self.image = rotation_cache.get(self.original_image, self.angle)
+            self.image_angle = self.angle
+            self.rect = self.image.get_rect(center=self.rect.center)
 
 class Bullet(pygame.sprite.Sprite):
     def __init__(self, x, y, angle):
@@ -71,43 +75,54 @@ class Bullet(pygame.sprite.Sprite):
             self.rect.y += self.speed
 
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, ai_tree):
+    def __init__(self, x, y, ai_tree, rng=random, area=None):
         super().__init__()
-        try:
-            self.original_image = pygame.image.load("assets/enemigos01.png").convert_alpha()
-            self.original_image = pygame.transform.scale(self.original_image, (50, 50))
-        except pygame.error:
-            self.original_image = pygame.Surface((50, 50))
-            self.original_image.fill(BLUE)
-        self.image = self.original_image.copy()
+        self.original_image = assets.load("assets/enemigos01.png", (50, 50), fallback_color=BLUE)
+        self.image = self.original_image
         self.rect = self.image.get_rect(topleft=(x, y))
         self.pos = pygame.math.Vector2(x, y)
         self.speed = 1.5  # Velocidad moderada
+        self.chase_radius = CHASE_RADIUS
+        # El segundo punto de patrulla sale de `area` (por defecto el centro de la pantalla)
+        if area is None:
+            area = pygame.Rect(200, 200, WIDTH - 400, HEIGHT - 400)
         self.patrol_points = [
             pygame.math.Vector2(x, y),
-            pygame.math.Vector2(random.randint(200, WIDTH - 200), random.randint(200, HEIGHT - 200))
+            pygame.math.Vector2(rng.randint(area.left, area.right), rng.randint(area.top, area.bottom))
         ]
         self.current_patrol_point = 1
         self.behavior_tree = ai_tree
         self.last_path_calc_time = 0
         self.path_recalc_interval = 500  # en milisegundos
         self.cached_path = []
+        self.cached_path_version = None
         self.last_target_position = None
+        self.ai_slot = None     # turno asignado por el AIScheduler
+        self.ai_actions = None  # acciones elegidas en la última decisión
+        self.planner = None     # IncrementalPlanner de la persecución "incremental"
+
+    def think(self, player, grid, grid_width, grid_height):
+        """Evalúa las condiciones del árbol (compilado) y guarda las acciones a repetir."""
+        self.ai_actions = self.behavior_tree.decide(self, player, grid, grid_width, grid_height)
 
     def move(self, player, grid, grid_width, grid_height, obstacles):
         old_position = self.pos.copy()
-        self.behavior_tree.run(self, player, grid, grid_width, grid_height)
+        if self.ai_actions is None:
+            self.behavior_tree.run(self, player, grid, grid_width, grid_height)
+        else:
+            for action in self.ai_actions:
+                action(self, player, grid, grid_width, grid_height)
         new_position = self.pos.copy()
         move_vector = new_position - old_position
         old_x = self.pos.x; old_y = self.pos.y
         self.pos.x = old_x + move_vector.x
         self.rect.centerx = int(self.pos.x)
-        if pygame.sprite.spritecollide(self, obstacles, False):
+        if obstacles.collides(self.rect):
             self.pos.x = old_x
             self.rect.centerx = int(old_x)
         self.pos.y = old_y + move_vector.y
         self.rect.centery = int(self.pos.y)
-        if pygame.sprite.spritecollide(self, obstacles, False):
+        if obstacles.collides(self.rect):
             self.pos.y = old_y
             self.rect.centery = int(old_y)
         if self.pos == old_position:
@@ -116,21 +131,11 @@ class Enemy(pygame.sprite.Sprite):
 class Coin(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        try:
-            self.image = pygame.image.load("assets/moneda.jpg").convert_alpha()
-            self.image = pygame.transform.scale(self.image, (45, 45))
-        except pygame.error:
-            self.image = pygame.Surface((45, 45))
-            self.image.fill(YELLOW)
+        self.image = assets.load("assets/moneda.jpg", (45, 45), fallback_color=YELLOW)
         self.rect = self.image.get_rect(topleft=(x, y))
 
 class ImageObstacle(pygame.sprite.Sprite):
     def __init__(self, x, y, size):
         super().__init__()
-        try:
-            self.image = pygame.image.load("assets/obstaculo.jpg").convert_alpha()
-            self.image = pygame.transform.scale(self.image, (size, size))
-        except pygame.error:
-            self.image = pygame.Surface((size, size))
-            self.image.fill(BLACK)
+        self.image = assets.load("assets/obstaculo.jpg", (size, size), fallback_color=BLACK)
         self.rect = self.image.get_rect(topleft=(x, y))
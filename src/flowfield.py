@@ -0,0 +1,84 @@
+import weakref
+from array import array
+from collections import deque
+
+class FlowField:
+    """
+    Campo de flujo BFS con raíz en la celda del jugador. Para cada celda guarda la
+    distancia al objetivo y la siguiente celda hacia él, de modo que todos los
+    enemigos que persiguen al mismo objetivo comparten una sola búsqueda.
+    Solo se reconstruye cuando cambia la celda objetivo o la versión del grid.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        size = width * height
+        self._empty = array('i', [-1]) * size
+        self.distance = array('i', self._empty)
+        self.next_index = array('i', self._empty)
+        self.goal = None
+        self.grid_version = -1
+        self.rebuilds = 0
+
+    def update(self, grid, goal):
+        """Recalcula el campo si el objetivo o el grid cambiaron. Devuelve True si lo hizo."""
+        if goal == self.goal and self.grid_version == grid.version:
+            return False
+        self._build(grid, goal)
+        return True
+
+    def _build(self, grid, goal):
+        width, height = self.width, self.height
+        blocked = grid.blocked
+        distance = self.distance
+        next_index = self.next_index
+        distance[:] = self._empty
+        next_index[:] = self._empty
+        self.goal = goal
+        self.grid_version = grid.version
+        self.rebuilds += 1
+        gx, gy = goal
+        if not (0 <= gx < width and 0 <= gy < height) or blocked[gy * width + gx]:
+            return
+        goal_i = gy * width + gx
+        distance[goal_i] = 0
+        queue = deque([goal_i])
+        while queue:
+            current = queue.popleft()
+            cx = current % width
+            cy = current // width
+            d = distance[current] + 1
+            for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+                if 0 <= nx < width and 0 <= ny < height:
+                    neighbor = ny * width + nx
+                    if distance[neighbor] == -1 and not blocked[neighbor]:
+                        distance[neighbor] = d
+                        next_index[neighbor] = current
+                        queue.append(neighbor)
+
+    def next_cell(self, cell):
+        """Siguiente celda hacia el objetivo desde `cell`, o None si no hay camino."""
+        x, y = cell
+        width = self.width
+        if not (0 <= x < width and 0 <= y < self.height):
+            return None
+        i = self.next_index[y * width + x]
+        if i == -1:
+            return None
+        return (i % width, i // width)
+
+    def distance_to_goal(self, cell):
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return -1
+        return self.distance[y * self.width + x]
+
+_fields = weakref.WeakKeyDictionary()
+
+def flow_field_for(grid):
+    """Campo de flujo compartido asociado a un grid."""
+    field = _fields.get(grid)
+    if field is None:
+        field = FlowField(grid.width, grid.height)
+        _fields[grid] = field
+    return field
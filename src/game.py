@@ -1,21 +1,30 @@
 import pygame
-import random
-from src.settings import WIDTH, HEIGHT, CELL_SIZE, WHITE, GREEN, RED, BLUE
+from src.settings import WIDTH, HEIGHT, CELL_SIZE, FPS, WHITE, GREEN, RED, BLUE, DIRTY_RECT_RENDERING, PROFILER_HISTORY, PATH_BUDGET_MS
 from src.transitions import fade_in_nonblocking, fade_out_nonblocking
 from src.music import load_music, play_music, stop_music
-from src.ui import draw_text, draw_health_bar
+from src.ui import draw_text, draw_health_bar, render_text, get_font, HudText
 from src.input import get_combined_keys
-from src.level import get_level_data
-from src.behavior import SelectorNode, SequenceNode, ConditionNode, ActionNode, condition_player_close, chase_action, patrol_action
-from src.entities import Player, Bullet, Enemy, Coin, ImageObstacle
+from src.simulation import create_state, step, StepInput, TICK_MS
+from src.assets import assets
+from src.render import DirtyRectRenderer, draw_interpolated, draw_tiled, compose_layer
+from src.simclock import FixedTimestep
+from src.profiler import FrameProfiler
+from src.pathservice import path_service_for
+from src.world import Camera
 
-def show_story():
-    try:
-        story_bg = pygame.image.load("assets/story background.jpg").convert()
-        story_bg = pygame.transform.scale(story_bg, (WIDTH, HEIGHT))
-    except pygame.error:
-        story_bg = pygame.Surface((WIDTH, HEIGHT))
-        story_bg.fill(WHITE)
+# Imágenes que necesitan el menú y la partida; se precargan mientras se muestra la historia.
+# Los sprites usan "auto" (el formato de blit más barato para cada imagen, ver assets.blit_mode)
+PRELOAD_MANIFEST = [
+    ("assets/fondo_menu.jpg", (WIDTH, HEIGHT), "opaque"),
+    ("assets/background.jpg", (WIDTH, HEIGHT), "opaque"),
+    ("assets/player01_.png", (55, 55), "auto"),
+    ("assets/enemigos01.png", (50, 50), "auto"),
+    ("assets/moneda.jpg", (45, 45), "auto"),
+    ("assets/obstaculo.jpg", (CELL_SIZE, CELL_SIZE), "auto"),
+]
+
+def show_story(preloader=None):
+    story_bg = assets.load("assets/story background.jpg", (WIDTH, HEIGHT), mode="opaque", fallback_color=WHITE)
     story_text = [
         "Bienvenido a New Rally X",
         "",
@@ -31,13 +40,20 @@ def show_story():
     line_height = 40
     total_text_height = len(story_text) * line_height
     start_y = (HEIGHT - total_text_height) // 2
+    # El texto no cambia: se compone una sola vez sobre una copia del fondo
+    story_screen = story_bg.copy()
+    for idx, line in enumerate(story_text):
+        text_surface = render_text(line, BLUE, get_font(36))
+        text_rect = text_surface.get_rect(center=(WIDTH // 2, start_y + idx * line_height + line_height // 2))
+        story_screen.blit(text_surface, text_rect)
     waiting = True
     while waiting:
-        pygame.display.get_surface().blit(story_bg, (0, 0))
-        for idx, line in enumerate(story_text):
-            text_surface = pygame.font.Font(None,36).render(line, True, BLUE)
-            text_rect = text_surface.get_rect(center=(WIDTH // 2, start_y + idx * line_height + line_height // 2))
-            pygame.display.get_surface().blit(text_surface, text_rect)
+        if preloader is not None:
+            preloader.poll()
+        pygame.display.get_surface().blit(story_screen, (0, 0))
+        if preloader is not None and not preloader.done():
+            # Barra fina de progreso de la precarga
+            pygame.draw.rect(pygame.display.get_surface(), BLUE, (0, HEIGHT - 4, int(WIDTH * preloader.progress()), 4))
         pygame.display.flip()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -50,12 +66,7 @@ def show_story():
 def main_menu(sound_enabled):
     menu_options = ["Empezar Juego", f"Sonido: {'ON' if sound_enabled else 'OFF'}", "Salir"]
     selected_option = 0
-    try:
-        background = pygame.image.load("assets/fondo_menu.jpg").convert()
-        background = pygame.transform.scale(background, (WIDTH, HEIGHT))
-    except pygame.error:
-        background = pygame.Surface((WIDTH, HEIGHT))
-        background.fill(WHITE)
+    background = assets.load("assets/fondo_menu.jpg", (WIDTH, HEIGHT), mode="opaque", fallback_color=WHITE)
     fade_in_nonblocking(pygame.display.get_surface())
     running = True
     while running:
@@ -86,153 +97,105 @@ def main_menu(sound_enabled):
                     elif selected_option == 2:
                         pygame.quit(); exit()
 
-def game_loop():
+def game_loop(seed=None):
     clock = pygame.time.Clock()
+    # F3 muestra el panel de tiempos por fase; F4 guarda el historial (CSV, JSON y traza de Chrome)
+    profiler = FrameProfiler(PROFILER_HISTORY)
     level = 1
-    try:
-        bg_image = pygame.image.load("assets/background.jpg").convert()
-        bg_image = pygame.transform.scale(bg_image, (WIDTH, HEIGHT))
-    except pygame.error:
-        bg_image = pygame.Surface((WIDTH, HEIGHT))
-        bg_image.fill(WHITE)
+    bg_image = assets.load("assets/background.jpg", (WIDTH, HEIGHT), mode="opaque", fallback_color=WHITE)
     running = True
     while running:
-        grid, _, enemy_count = get_level_data(level)
-        all_sprites = pygame.sprite.Group()
-        enemy_group = pygame.sprite.Group()
-        coin_group = pygame.sprite.Group()
-        bullet_group = pygame.sprite.Group()
-        deco_obstacles, deco_coins = generate_decorations()  # Usando la función de generación en entities
-        # Actualizar grid con obstáculos
-        for obs in deco_obstacles:
-            cell_x = obs.rect.x // CELL_SIZE
-            cell_y = obs.rect.y // CELL_SIZE
-            if 0 <= cell_x < len(grid[0]) and 0 <= cell_y < len(grid):
-                grid[cell_y][cell_x].blocked = True
-        obstacles_group = pygame.sprite.Group(deco_obstacles)
-        for obs in deco_obstacles:
-            all_sprites.add(obs)
-        for coin in deco_coins:
-            coin_group.add(coin)
-            all_sprites.add(coin)
-        player = Player()
-        all_sprites.add(player)
-        ai_tree = SelectorNode([
-            SequenceNode([ConditionNode(condition_player_close), ActionNode(chase_action)]),
-            ActionNode(patrol_action)
-        ])
-        # Generar enemigos evitando colisiones con obstáculos
-        for _ in range(enemy_count):
-            valid = False
-            attempts = 0
-            while not valid and attempts < 100:
-                ex = random.randint(5, 20) * CELL_SIZE
-                ey = random.randint(5, 15) * CELL_SIZE
-                enemy_rect = pygame.Rect(ex, ey, 50, 50)
-                collision = False
-                for obs in obstacles_group:
-                    if enemy_rect.colliderect(obs.rect):
-                        collision = True
-                        break
-                if not collision:
-                    valid = True
-                attempts += 1
-            if valid:
-                enemy = Enemy(ex, ey, ai_tree)
-                enemy_group.add(enemy)
-                all_sprites.add(enemy)
-        goal_rect = pygame.Rect(WIDTH - 100, HEIGHT - 100, 50, 50)
-        game_over = False
-        win = False
-        while not game_over and not win:
+        state = create_state(level, seed=seed)
+        player = state.player
+        goal_rect = state.goal_rect
+        renderer = None
+        # En un mundo por trozos la cámara sigue al jugador y solo se dibuja lo que se ve
+        camera = Camera() if state.world is not None else None
+        field = None
+        if camera is None:
+            # El fondo, la meta y los obstáculos no cambian en todo el nivel: se componen
+            # una vez y en cada cuadro solo se dibujan las monedas, el jugador y los enemigos
+            field = compose_layer(bg_image, state.obstacles_group, [(GREEN, goal_rect)])
+        if DIRTY_RECT_RENDERING and camera is None:
+            renderer = DirtyRectRenderer(pygame.display.get_surface(), field)
+        else:
+            # Sin rectángulos sucios se redibuja todo, así que se puede interpolar entre ticks
+            state.interpolate = True
+        timestep = FixedTimestep(TICK_MS)
+        profiler.watch_grid(state.grid)
+        clock.tick()
+
+        coins_hud = HudText("Monedas: {}", 10, 10, RED)
+        level_hud = HudText("Nivel: {}", WIDTH - 150, 50, RED)
+        score_hud = HudText("Puntos: {}", 10, 50, BLUE)
+
+        def draw_hud(surface):
+            # Con rectángulos sucios las balas (que no son sprites) se dibujan aquí,
+            # así sus rects se restauran en el cuadro siguiente como los del HUD
+            rects = state.bullets.draw(surface) if renderer is not None else []
+            rects += [
+                coins_hud.draw(surface, player.coins_collected),
+                draw_health_bar(surface, WIDTH - 170, 10, player.health, 100, flash=player.is_flashing),
+                level_hud.draw(surface, level),
+                score_hud.draw(surface, player.score),
+            ]
+            overlay = profiler.draw_overlay(surface)
+            if overlay is not None:
+                rects.append(overlay)
+            return rects
+
+        shoot = False
+        while not state.game_over and not state.win:
+            profiler.begin_frame()
+            elapsed = clock.tick(FPS)
+            profiler.mark("wait")
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit(); exit()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_SPACE:
-                        now = pygame.time.get_ticks()
-                        if now - player.last_shot_time > player.shoot_cooldown:
-                            bullet = Bullet(player.rect.centerx, player.rect.centery, player.angle)
-                            bullet_group.add(bullet)
-                            all_sprites.add(bullet)
-                            player.last_shot_time = now
+                        shoot = True
+                    elif event.key == pygame.K_F3:
+                        profiler.toggle()
+                    elif event.key == pygame.K_F4:
+                        print("Perfil guardado en", ", ".join(profiler.export()))
+            # La lógica avanza en ticks fijos; si un cuadro tarda, se simulan varios ticks
+            # seguidos y se dibuja una sola vez. El disparo se guarda hasta el siguiente tick.
             keys = get_combined_keys()
-            player.move(keys, obstacles_group)
-            for bullet in bullet_group:
-                bullet.update()
-                if (bullet.rect.right < 0 or bullet.rect.left > WIDTH or 
-                    bullet.rect.bottom < 0 or bullet.rect.top > HEIGHT):
-                    bullet.kill()
-            for enemy in enemy_group:
-                enemy.move(player, grid, len(grid[0]), len(grid), obstacles_group)
-                if enemy.rect.colliderect(player.rect):
-                    player.health -= 1
-                    player.is_flashing = True
-                    player.flash_timer = pygame.time.get_ticks()
-                if pygame.sprite.spritecollide(enemy, bullet_group, True):
-                    enemy.kill()
-                    player.score += 100
-            coins_collected = pygame.sprite.spritecollide(player, coin_group, True)
-            player.coins_collected += len(coins_collected)
-            player.score += 50 * len(coins_collected)
-            if player.is_flashing and pygame.time.get_ticks() - player.flash_timer > 300:
-                player.is_flashing = False
-            if player.rect.colliderect(goal_rect) or len(coin_group) == 0:
-                win = True
-                player.score += 500
-            pygame.display.get_surface().blit(bg_image, (0, 0))
-            pygame.draw.rect(pygame.display.get_surface(), GREEN, goal_rect)
-            all_sprites.draw(pygame.display.get_surface())
-            draw_text(f"Monedas: {player.coins_collected}", 10, 10, RED)
-            draw_health_bar(pygame.display.get_surface(), WIDTH - 170, 10, player.health, 100, flash=player.is_flashing)
-            draw_text(f"Nivel: {level}", WIDTH - 150, 50, RED)
-            draw_text(f"Puntos: {player.score}", 10, 50, BLUE)
-            pygame.display.flip()
-            clock.tick(60)
-            if player.health <= 0:
-                game_over = True
+            profiler.mark("input")
+            step_profiler = profiler if profiler.enabled else None
+            ticks = timestep.advance(elapsed)
+            if ticks:
+                # En tiempo real las búsquedas en cola también tienen un tope en milisegundos
+                # por cuadro, repartido entre los ticks que se simulan en él
+                path_service_for(state.grid).budget_ms = PATH_BUDGET_MS / ticks
+            for _ in range(ticks):
+                step(state, StepInput(keys, shoot), step_profiler)
+                shoot = False
+                if state.game_over or state.win:
+                    break
+            if renderer is not None:
+                renderer.render(state.moving_sprites(), draw_hud)
+                profiler.mark("draw")
+            else:
+                surface = pygame.display.get_surface()
+                if camera is not None:
+                    camera.follow_sprite(player, state.previous_positions, timestep.alpha, player.bounds)
+                    offset = camera.offset
+                    draw_tiled(surface, bg_image, offset)
+                    pygame.draw.rect(surface, GREEN, goal_rect.move(offset))
+                    sprites = camera.visible(state)
+                else:
+                    offset = (0, 0)
+                    surface.blit(field, (0, 0))
+                    sprites = state.moving_sprites()
+                draw_interpolated(surface, sprites, state.previous_positions, timestep.alpha, offset)
+                state.bullets.draw(surface, timestep.alpha, offset)
+                profiler.mark("draw")
+                draw_hud(pygame.display.get_surface())
+                profiler.mark("hud")
+                pygame.display.flip()
+                profiler.mark("flip")
+            profiler.end_frame()
         # (Aquí agregarías la pantalla de resultados y progresión de nivel)
         running = False  # Para finalizar el juego en este ejemplo
-
-def generate_decorations(num_obstacles=10, num_coins=10, min_distance=15):
-    # Función similar a la definida en entities.py o level.py
-    # Puedes mover esta función a otro módulo si lo prefieres
-    import random
-    from src.entities import ImageObstacle, Coin
-    deco_obstacles = []
-    deco_coins = []
-    margin = 20
-    full_rect = pygame.Rect(margin, margin, WIDTH - 2 * margin, HEIGHT - 2 * margin)
-    start_rect = pygame.Rect(100, 100, 55, 55)
-    goal_rect = pygame.Rect(WIDTH - 100, HEIGHT - 100, 50, 50)
-    attempts = 0
-    while len(deco_obstacles) < num_obstacles and attempts < 1000:
-        x = random.randint(full_rect.left, full_rect.right - CELL_SIZE)
-        y = random.randint(full_rect.top, full_rect.bottom - CELL_SIZE)
-        new_rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-        if new_rect.colliderect(start_rect) or new_rect.colliderect(goal_rect):
-            attempts += 1; continue
-        collision = False
-        for obs in deco_obstacles:
-            if new_rect.colliderect(obs.rect.inflate(min_distance, min_distance)):
-                collision = True; break
-        if not collision:
-            obs = ImageObstacle(x, y, CELL_SIZE)
-            deco_obstacles.append(obs)
-        attempts += 1
-    attempts = 0
-    coin_size = 45
-    while len(deco_coins) < num_coins and attempts < 1000:
-        x = random.randint(full_rect.left, full_rect.right - coin_size)
-        y = random.randint(full_rect.top, full_rect.bottom - coin_size)
-        new_rect = pygame.Rect(x, y, coin_size, coin_size)
-        collision = False
-        for coin in deco_coins:
-            if new_rect.colliderect(coin.rect.inflate(min_distance, min_distance)):
-                collision = True; break
-        if not collision:
-            coin = Coin(x, y)
-            deco_coins.append(coin)
-        attempts += 1
-    return deco_obstacles, deco_coins
-
@@ -0,0 +1,186 @@
+import heapq
+
+INF = float("inf")
+
+class IncrementalPlanner:
+    """
+    Planificador incremental estilo D* Lite para perseguir un objetivo que se mueve.
+    El árbol de búsqueda tiene raíz en la celda del perseguidor y se conserva entre
+    consultas: cuando el objetivo cambia de celda se corrige la heurística con `km`
+    y cuando cambian celdas bloqueadas (NavGrid.changes_since) solo se reparan los
+    nodos afectados, en lugar de repetir el A* entero.
+    Mientras el perseguidor avanza por el camino, el resto del camino sigue siendo
+    óptimo y se reutiliza; si sale del camino se vuelve a empezar con él como raíz.
+    Uso: next_cell(grid, celda_del_perseguidor, celda_objetivo), como en chase_action.
+    """
+    def __init__(self):
+        self.root = None
+        self.target = None
+        self.path = None
+        self.version = None
+        self.expanded = 0
+        self.replans = 0
+        self.restarts = 0
+        self._positions = {}
+
+    def next_cell(self, grid, start, target):
+        """Siguiente celda desde `start` hacia `target`, o None si no hay camino (o ya llegó)."""
+        path = self.update(grid, start, target)
+        if not path:
+            return None
+        i = self._positions[start] + 1
+        return path[i] if i < len(path) else None
+
+    def update(self, grid, start, target):
+        """Deja el camino al día y lo devuelve (desde la raíz hasta `target`) o None."""
+        width, height = grid.width, grid.height
+        if not (0 <= start[0] < width and 0 <= start[1] < height and 0 <= target[0] < width and 0 <= target[1] < height):
+            self.path = None
+            self.root = None
+            return None
+        changed = grid.changes_since(self.version) if self.root is not None else None
+        if changed is None:
+            self._restart(grid, start, target)
+        else:
+            dirty = bool(changed)
+            if changed:
+                self.version = grid.version
+                for x, y in changed:
+                    i = y * width + x
+                    self._update_vertex(i)
+                    for n in self._neighbors(i):
+                        self._update_vertex(n)
+            if target != self.target:
+                self.km += abs(target[0] - self.target[0]) + abs(target[1] - self.target[1])
+                self.target = target
+                self._target_i = target[1] * width + target[0]
+                dirty = True
+            if dirty:
+                self.replans += 1
+                self._compute()
+                self._extract()
+            if start not in self._positions and start != self.root:
+                # El perseguidor se salió del camino (o no lo hay): nueva raíz
+                self._restart(grid, start, target)
+        return self.path
+
+    # --- D* Lite ---
+
+    def _restart(self, grid, root, target):
+        self.restarts += 1
+        self.replans += 1
+        self._grid = grid
+        self._width = grid.width
+        self._height = grid.height
+        self._blocked = grid.blocked
+        self.version = grid.version
+        self.root = root
+        self.target = target
+        self._root_i = root[1] * self._width + root[0]
+        self._target_i = target[1] * self._width + target[0]
+        self.km = 0
+        self._g = {}
+        self._rhs = {self._root_i: 0}
+        self._open = []
+        self._open_keys = {}
+        self._push(self._root_i)
+        self._compute()
+        self._extract()
+
+    def _neighbors(self, i):
+        width = self._width
+        x = i % width
+        y = i // width
+        result = []
+        if x > 0:
+            result.append(i - 1)
+        if x < width - 1:
+            result.append(i + 1)
+        if y > 0:
+            result.append(i - width)
+        if y < self._height - 1:
+            result.append(i + width)
+        return result
+
+    def _key(self, i):
+        m = min(self._g.get(i, INF), self._rhs.get(i, INF))
+        tx, ty = self.target
+        width = self._width
+        return (m + abs(i % width - tx) + abs(i // width - ty) + self.km, m)
+
+    def _push(self, i):
+        key = self._key(i)
+        self._open_keys[i] = key
+        heapq.heappush(self._open, (key, i))
+
+    def _update_vertex(self, i):
+        if i != self._root_i:
+            if self._blocked[i]:
+                self._rhs[i] = INF
+            else:
+                g = self._g
+                self._rhs[i] = min([g.get(n, INF) for n in self._neighbors(i)]) + 1
+        self._open_keys.pop(i, None)
+        if self._g.get(i, INF) != self._rhs.get(i, INF):
+            self._push(i)
+
+    def _compute(self):
+        g = self._g
+        rhs = self._rhs
+        open_list = self._open
+        open_keys = self._open_keys
+        target_i = self._target_i
+        expanded = 0
+        while open_list:
+            key, u = open_list[0]
+            if open_keys.get(u) != key:
+                heapq.heappop(open_list)  # entrada obsoleta
+                continue
+            if key >= self._key(target_i) and rhs.get(target_i, INF) == g.get(target_i, INF):
+                break
+            heapq.heappop(open_list)
+            del open_keys[u]
+            new_key = self._key(u)
+            if key < new_key:
+                self._push(u)
+                continue
+            expanded += 1
+            if g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+            for n in self._neighbors(u):
+                self._update_vertex(n)
+        self.expanded += expanded
+        self._grid.expanded += expanded
+        self._grid.searches += 1
+
+    def _extract(self):
+        """Baja por los g desde el objetivo hasta la raíz para reconstruir el camino."""
+        g = self._g
+        width = self._width
+        blocked = self._blocked
+        root_i = self._root_i
+        current = self._target_i
+        self.path = None
+        self._positions = {}
+        if g.get(current, INF) == INF:
+            return
+        cells = [current]
+        while current != root_i:
+            best = None
+            best_g = INF
+            for n in self._neighbors(current):
+                if n != root_i and blocked[n]:
+                    continue
+                value = g.get(n, INF)
+                if value < best_g:
+                    best, best_g = n, value
+            if best is None or len(cells) > width * self._height:
+                return
+            current = best
+            cells.append(current)
+        cells.reverse()
+        self.path = [(i % width, i // width) for i in cells]
+        self._positions = {cell: position for position, cell in enumerate(self.path)}
@@ -1,63 +1,131 @@
 import heapq
+from array import array
 from src.settings import CELL_SIZE
 
-class Node:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.blocked = False  # Se actualizará con obstáculos
-        self.g = float('inf')
-        self.h = 0
-        self.f = float('inf')
-        self.parent = None
-    def __lt__(self, other):
-        return self.f < other.f
-    def __hash__(self):
-        return hash((self.x, self.y))
+CHANGE_LOG_SIZE = 1024
+
+class NavGrid:
+    """
+    Grid de navegación compacto: un bytearray plano con las celdas bloqueadas.
+    El estado de búsqueda (g, padre, cerrado) vive en arrays reutilizables que se
+    invalidan con un contador de generación, así que un A* no crea objetos por celda.
+    `blocked` puede ser un buffer existente de un byte por celda (por ejemplo la vista
+    de un nivel horneado, ver levelfile) que se usa sin copiarlo.
+    """
+    def __init__(self, width, height, blocked=None):
+        self.width = width
+        self.height = height
+        self.blocked = blocked if blocked is not None else bytearray(width * height)
+        self.version = 0  # Aumenta cada vez que cambia el conjunto de celdas bloqueadas
+        self.changes = []  # (versión, x, y) de los últimos cambios hechos con set_blocked
+        size = width * height
+        self._g = array('i', [0]) * size
+        self._parent = array('i', [-1]) * size
+        self._seen = array('I', [0]) * size    # generación en la que se tocó la celda
+        self._closed = array('I', [0]) * size  # generación en la que se cerró la celda
+        self._generation = 0
+        # Contadores acumulados para estadísticas
+        self.searches = 0
+        self.expanded = 0
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_blocked(self, x, y):
+        return self.blocked[y * self.width + x] != 0
+
+    def set_blocked(self, x, y, blocked=True):
+        i = y * self.width + x
+        value = 1 if blocked else 0
+        if self.blocked[i] != value:
+            self.blocked[i] = value
+            self.version += 1
+            self.changes.append((self.version, x, y))
+            if len(self.changes) > CHANGE_LOG_SIZE:
+                del self.changes[:CHANGE_LOG_SIZE // 2]
+
+    def changes_since(self, version):
+        """
+        Celdas (x, y) que cambiaron después de `version`, o None si el registro no lo
+        cubre (cambios demasiado antiguos o hechos sin set_blocked): hay que empezar de cero.
+        """
+        if version == self.version:
+            return []
+        needed = self.version - version
+        log = self.changes
+        if needed < 0 or needed > len(log) or log[-1][0] != self.version or log[-needed][0] != version + 1:
+            return None
+        return [(x, y) for _, x, y in log[-needed:]]
+
+    def next_generation(self):
+        self._generation += 1
+        if self._generation > 0xFFFFFFFF:
+            # Al desbordar el contador se limpian las marcas una sola vez
+            size = self.width * self.height
+            self._seen = array('I', [0]) * size
+            self._closed = array('I', [0]) * size
+            self._generation = 1
+        return self._generation
 
 def create_empty_grid(width, height):
-    return [[Node(x, y) for x in range(width)] for y in range(height)]
+    return NavGrid(width, height)
 
 def copy_grid(grid):
-    new_grid = []
-    for row in grid:
-        new_row = []
-        for node in row:
-            new_node = Node(node.x, node.y)
-            new_node.blocked = node.blocked
-            new_row.append(new_node)
-        new_grid.append(new_row)
+    new_grid = NavGrid(grid.width, grid.height)
+    new_grid.blocked[:] = grid.blocked
+    new_grid.version = grid.version
     return new_grid
 
 def a_star(start, goal, grid, width, height):
-    open_list = []
-    closed_set = set()
-    start.g = 0
-    start.h = abs(start.x - goal.x) + abs(start.y - goal.y)
-    start.f = start.g + start.h
-    heapq.heappush(open_list, (start.f, start))
+    """A* de 4 vecinos sobre un NavGrid. start y goal son celdas (x, y)."""
+    sx, sy = start
+    gx, gy = goal
+    if not (0 <= sx < width and 0 <= sy < height and 0 <= gx < width and 0 <= gy < height):
+        return None
+    blocked = grid.blocked
+    g_cost = grid._g
+    parent = grid._parent
+    seen = grid._seen
+    closed = grid._closed
+    gen = grid.next_generation()
+    grid.searches += 1
+    start_i = sy * width + sx
+    goal_i = gy * width + gx
+    g_cost[start_i] = 0
+    parent[start_i] = -1
+    seen[start_i] = gen
+    open_list = [(abs(sx - gx) + abs(sy - gy), start_i)]
+    expanded = 0
     while open_list:
         current = heapq.heappop(open_list)[1]
-        if current.x == goal.x and current.y == goal.y:
+        if closed[current] == gen:
+            continue
+        if current == goal_i:
+            grid.expanded += expanded
             path = []
-            while current:
-                path.append((current.x, current.y))
-                current = current.parent
+            while current != -1:
+                path.append((current % width, current // width))
+                current = parent[current]
             return path[::-1]
-        closed_set.add(current)
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = current.x + dx, current.y + dy
+        closed[current] = gen
+        expanded += 1
+        cx = current % width
+        cy = current // width
+        tentative_g = g_cost[current] + 1
+        for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
             if 0 <= nx < width and 0 <= ny < height:
-                neighbor = grid[ny][nx]
-                if neighbor.blocked or neighbor in closed_set:
+                neighbor = ny * width + nx
+                if blocked[neighbor] or closed[neighbor] == gen:
                     continue
-                tentative_g = current.g + 1
-                if tentative_g < neighbor.g:
-                    neighbor.g = tentative_g
-                    neighbor.h = abs(neighbor.x - goal.x) + abs(neighbor.y - goal.y)
-                    neighbor.f = neighbor.g + neighbor.h
-                    neighbor.parent = current
-                    heapq.heappush(open_list, (neighbor.f, neighbor))
+                if seen[neighbor] != gen or tentative_g < g_cost[neighbor]:
+                    seen[neighbor] = gen
+                    g_cost[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    heapq.heappush(open_list, (tentative_g + abs(nx - gx) + abs(ny - gy), neighbor))
+    grid.expanded += expanded
     return None
 
 def get_level_data(level):
@@ -0,0 +1,241 @@
+# Niveles horneados: un archivo binario con el mapa de celdas bloqueadas, la colocación de
+# obstáculos, monedas, apariciones, meta y salida, y datos precalculados opcionales.
+# Uso: python -m src.levelfile bake --level 1 --seed 0 --out levels/level1.rxl
+#      python -m src.levelfile info levels/level1.rxl
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from collections import deque
+from src.level import NavGrid, get_level_data, create_empty_grid
+from src.reachability import reachability_for, install_labels
+from src.settings import WIDTH, HEIGHT, CELL_SIZE, LEVELS_DIR
+
+MAGIC = b"RXLV"
+FORMAT_VERSION = 1
+
+# Cabecera: magia, versión, ancho, alto, tamaño de celda, enemigos y número de secciones.
+# Después, la tabla de secciones (etiqueta, desplazamiento, longitud) y los datos de cada
+# sección alineados a 8 bytes, en little-endian.
+HEADER = struct.Struct("<4sHHHHHH")
+HEADER_MAX = 0xFFFF  # tope de los campos H de la cabecera (ancho, alto, celda, enemigos)
+SECTION = struct.Struct("<4sII")
+PLACEMENT = struct.Struct("<Bxxxiiii")  # tipo, x, y, ancho, alto
+
+BLOCKED = b"BLCK"     # un byte por celda (0 libre, 1 bloqueada), el mismo formato que NavGrid.blocked
+PLACEMENTS = b"PLAC"  # registros PLACEMENT
+LABELS = b"LABL"      # int32 por celda: componente conexa (ver reachability), -1 bloqueada
+DISTANCE = b"DIST"    # int32 por celda: pasos hasta la celda de la meta, -1 sin camino
+NAME = b"NAME"        # nombre del nivel en UTF-8
+
+KINDS = ("obstacle", "coin", "spawn", "goal", "start")
+
+class LevelFile:
+    """
+    Un nivel horneado abierto con mmap (ACCESS_COPY): el archivo no se lee de una vez
+    y las secciones son vistas sobre el mapeo, sin copiar. `blocked` sirve directamente
+    como NavGrid.blocked (ver grid()); como el mapeo es copia-al-escribir, bloquear
+    celdas durante la partida no cambia el archivo. Las vistas mantienen vivo el mapeo.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        view = memoryview(self._map)
+        if len(view) < HEADER.size:
+            raise ValueError(f"{path}: archivo de nivel demasiado corto")
+        magic, version, width, height, cell_size, enemy_count, count = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: no es un nivel horneado")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: versión de formato {version} (se espera {FORMAT_VERSION})")
+        self.version = version
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.enemy_count = enemy_count
+        self.sections = {}
+        for k in range(count):
+            tag, offset, length = SECTION.unpack_from(view, HEADER.size + k * SECTION.size)
+            if offset + length > len(view):
+                raise ValueError(f"{path}: sección {tag!r} fuera del archivo")
+            self.sections[tag] = view[offset:offset + length]
+        size = width * height
+        self.blocked = self.sections.get(BLOCKED)
+        if self.blocked is None or len(self.blocked) != size:
+            raise ValueError(f"{path}: falta el mapa de celdas bloqueadas")
+        self.labels = self._cells(LABELS)
+        self.distance = self._cells(DISTANCE)
+        name = self.sections.get(NAME)
+        self.name = bytes(name).decode("utf-8") if name is not None else ""
+        raw = self.sections.get(PLACEMENTS)
+        self.placements = list(PLACEMENT.iter_unpack(raw)) if raw is not None else []
+
+    def _cells(self, tag):
+        section = self.sections.get(tag)
+        if section is None or len(section) != 4 * self.width * self.height:
+            return None
+        if sys.byteorder == "little":
+            return section.cast("i")
+        # El archivo está en little-endian: en otras máquinas se copia y se invierte
+        values = array('i')
+        values.frombytes(section)
+        values.byteswap()
+        return values
+
+    def rects(self, kind):
+        """(x, y, ancho, alto) de todas las colocaciones de un tipo ("obstacle", "coin", ...)."""
+        code = KINDS.index(kind)
+        return [(x, y, w, h) for k, x, y, w, h in self.placements if k == code]
+
+    def grid(self):
+        """NavGrid que usa el mapa del archivo sin copiarlo, con las etiquetas ya cargadas si las hay."""
+        grid = NavGrid(self.width, self.height, blocked=self.blocked)
+        if self.labels is not None:
+            install_labels(grid, self.labels)
+        return grid
+
+    def distance_to_goal(self, cell):
+        """Pasos desde `cell` hasta la meta según el campo horneado, o None si no lo hay o no hay camino."""
+        x, y = cell
+        if self.distance is None or not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        value = self.distance[y * self.width + x]
+        return value if value >= 0 else None
+
+def load(path):
+    return LevelFile(path)
+
+def distance_field(grid, goal):
+    """Pasos (BFS de 4 vecinos) desde cada celda hasta `goal`; -1 si no hay camino."""
+    width, height = grid.width, grid.height
+    blocked = grid.blocked
+    distance = array('i', [-1]) * (width * height)
+    gx, gy = goal
+    if not (0 <= gx < width and 0 <= gy < height) or blocked[gy * width + gx]:
+        return distance
+    start = gy * width + gx
+    distance[start] = 0
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        cx = current % width
+        cy = current // width
+        step = distance[current] + 1
+        for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+            if 0 <= nx < width and 0 <= ny < height:
+                n = ny * width + nx
+                if distance[n] < 0 and not blocked[n]:
+                    distance[n] = step
+                    queue.append(n)
+    return distance
+
+def check_header_value(field, value):
+    if not 0 <= value <= HEADER_MAX:
+        raise ValueError(f"{field} = {value} no cabe en la cabecera del nivel (de 0 a {HEADER_MAX})")
+
+def write(path, grid, placements, enemy_count, cell_size, labels=None, distance=None, name=""):
+    """
+    Guarda un nivel. `placements` es una lista de (tipo, x, y, ancho, alto) con los tipos de KINDS;
+    `labels` y `distance` (arrays de int32 por celda) son opcionales.
+    """
+    sections = [
+        (BLOCKED, bytes(grid.blocked)),
+        (PLACEMENTS, b"".join(PLACEMENT.pack(KINDS.index(kind), x, y, w, h) for kind, x, y, w, h in placements)),
+    ]
+    if labels is not None:
+        sections.append((LABELS, struct.pack(f"<{len(labels)}i", *labels)))
+    if distance is not None:
+        sections.append((DISTANCE, struct.pack(f"<{len(distance)}i", *distance)))
+    if name:
+        sections.append((NAME, name.encode("utf-8")))
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    body = []
+    for tag, data in sections:
+        padding = -offset % 8
+        body.append(b"\0" * padding)
+        offset += padding
+        table.append(SECTION.pack(tag, offset, len(data)))
+        body.append(data)
+        offset += len(data)
+    for field, value in (("ancho", grid.width), ("alto", grid.height), ("tamaño de celda", cell_size),
+                         ("enemigos", enemy_count)):
+        check_header_value(field, value)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, grid.width, grid.height, cell_size, enemy_count, len(sections))
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Se escribe en un temporal y se renombra, para no dejar nunca un archivo a medias
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(header)
+        f.write(b"".join(table))
+        f.write(b"".join(body))
+    os.replace(temporary, path)
+
+def bake(level, seed=0, path=None, labels=True, distance=True, enemies=None):
+    """
+    Genera un nivel como create_state (colocación, obstáculos en el grid sin aislar nada)
+    y lo guarda con sus datos precalculados. Devuelve la ruta del archivo.
+    """
+    from src import simulation  # simulation carga los niveles de este módulo
+    if path is None:
+        path = os.path.join(LEVELS_DIR, f"level{level}.rxl")
+    grid, _, enemy_count = get_level_data(level)
+    if grid is None:
+        # Nivel sin definición en get_level_data: pantalla entera y tantos enemigos como se pidan
+        grid = create_empty_grid(WIDTH // CELL_SIZE, HEIGHT // CELL_SIZE)
+        enemy_count = 10
+    if enemies is not None:
+        enemy_count = enemies
+    check_header_value("enemigos", enemy_count)  # antes de generar nada
+    rng = random.Random(seed)
+    obstacles, coins, spawns = simulation.generate_layout(num_spawns=enemy_count, rng=rng)
+    obstacles = simulation.block_obstacles(grid, obstacles, simulation.layout_targets(coins, spawns),
+                                           simulation.cell_of(simulation.START_RECT.center))
+    placements = [("obstacle",) + tuple(obs.rect) for obs in obstacles]
+    placements += [("coin",) + tuple(coin.rect) for coin in coins]
+    placements += [("spawn", x, y, simulation.ENEMY_SIZE, simulation.ENEMY_SIZE) for x, y in spawns]
+    placements.append(("goal",) + tuple(simulation.GOAL_RECT))
+    placements.append(("start",) + tuple(simulation.START_RECT))
+    write(path, grid, placements, len(spawns), CELL_SIZE,
+          labels=reachability_for(grid).labels if labels else None,
+          distance=distance_field(grid, simulation.cell_of(simulation.GOAL_RECT.center)) if distance else None,
+          name=f"Nivel {level} (semilla {seed})")
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hornea y consulta niveles binarios")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bake_parser = commands.add_parser("bake", help="genera y guarda un nivel")
+    bake_parser.add_argument("--level", type=int, nargs="+", default=[1])
+    bake_parser.add_argument("--seed", type=int, default=0)
+    bake_parser.add_argument("--out", default=None, help="archivo de salida (con un solo nivel)")
+    bake_parser.add_argument("--enemies", type=int, default=None, help="enemigos (por defecto los del nivel)")
+    bake_parser.add_argument("--no-labels", action="store_true", help="sin etiquetas de alcanzabilidad")
+    bake_parser.add_argument("--no-distance", action="store_true", help="sin campo de distancias a la meta")
+    info_parser = commands.add_parser("info", help="muestra el contenido de un nivel")
+    info_parser.add_argument("paths", nargs="+")
+    args = parser.parse_args(argv)
+    if args.command == "bake":
+        if args.out and len(args.level) > 1:
+            parser.error("--out solo vale con un nivel")
+        from src.simulation import init_headless
+        init_headless()
+        for level in args.level:
+            print(bake(level, args.seed, args.out, not args.no_labels, not args.no_distance, args.enemies))
+    else:
+        for path in args.paths:
+            level = load(path)
+            counts = ", ".join(f"{kind}: {len(level.rects(kind))}" for kind in KINDS)
+            extras = [tag.decode() for tag in (LABELS, DISTANCE) if tag in level.sections]
+            print(f"{path}: {level.name or '(sin nombre)'} {level.width}x{level.height} celdas de {level.cell_size} px, "
+                  f"{level.enemy_count} enemigos, {sum(level.blocked)} celdas bloqueadas; {counts}; "
+                  f"precalculado: {', '.join(extras) or 'nada'}")
+
+if __name__ == "__main__":
+    sys.exit(main())
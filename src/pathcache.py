@@ -0,0 +1,112 @@
+import weakref
+from collections import OrderedDict
+from src.level import a_star
+from src.reachability import reachable
+
+MISSING = object()
+
+class PathCache:
+    """
+    Caché LRU de caminos compartida por todos los enemigos de un grid.
+    La clave es (inicio, objetivo, versión del grid): cuando el grid cambia
+    (por ejemplo al bloquear celdas) todas las entradas anteriores se descartan.
+    Un camino óptimo también sirve para cualquier celda por la que pasa, así que
+    un enemigo que está sobre el camino de otro reutiliza el resto de ese camino.
+    Si el índice de alcanzabilidad dice que no hay camino, no se llega a buscar.
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.unreachable = 0  # búsquedas evitadas porque no había camino posible
+        self._entries = OrderedDict()
+        self._through = {}  # (celda, objetivo) -> (clave, posición en el camino)
+
+    def clear(self):
+        self._entries.clear()
+        self._through.clear()
+
+    def get_path(self, grid, start, goal, search=a_star):
+        """Devuelve el camino de start a goal (o None) usando la caché cuando se puede."""
+        path = self.lookup(grid, start, goal)
+        if path is not MISSING:
+            return path
+        if reachable(grid, start, goal):
+            path = search(start, goal, grid, grid.width, grid.height)
+        else:
+            path = None
+            self.unreachable += 1
+        self.put(grid, start, goal, path)
+        return path
+
+    def _check_version(self, grid):
+        if grid.version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self.clear()
+            self.version = grid.version
+
+    def lookup(self, grid, start, goal):
+        """Camino guardado de start a goal (puede ser None si no hay camino) o MISSING, sin buscar."""
+        self._check_version(grid)
+        key = (start, goal, grid.version)
+        path = self._entries.get(key, MISSING)
+        if path is not MISSING:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return path
+        shared = self._through.get((start, goal))
+        if shared is not None:
+            owner, offset = shared
+            self._entries.move_to_end(owner)
+            path = self._entries[owner][offset:]
+            self.hits += 1
+            self._store(key, path)
+            return path
+        return MISSING
+
+    def put(self, grid, start, goal, path):
+        """Guarda un camino calculado fuera de la caché (cuenta como fallo)."""
+        self._check_version(grid)
+        self.misses += 1
+        self._store((start, goal, grid.version), path)
+
+    def _store(self, key, path):
+        self._entries[key] = path
+        if path:
+            goal = key[1]
+            for offset, cell in enumerate(path):
+                self._through.setdefault((cell, goal), (key, offset))
+        while len(self._entries) > self.capacity:
+            old_key, old_path = self._entries.popitem(last=False)
+            self.evictions += 1
+            if old_path:
+                goal = old_key[1]
+                for cell in old_path:
+                    if self._through.get((cell, goal), (None,))[0] == old_key:
+                        del self._through[(cell, goal)]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "unreachable": self.unreachable,
+        }
+
+_caches = weakref.WeakKeyDictionary()
+
+def path_cache_for(grid):
+    """Caché de caminos compartida asociada a un grid."""
+    cache = _caches.get(grid)
+    if cache is None:
+        cache = PathCache()
+        _caches[grid] = cache
+    return cache
@@ -0,0 +1,398 @@
+import heapq
+import weakref
+from array import array
+from collections import deque
+from src.level import a_star
+
+# Motores de búsqueda intercambiables. Todos exponen find_path(start, goal, grid, width, height)
+# con la misma forma que a_star, así que chase_action y PathCache pueden usar cualquiera.
+# `expanded` acumula los nodos expandidos para poder compararlos en los benchmarks.
+
+class AStarEngine:
+    name = "astar"
+
+    def __init__(self):
+        self.expanded = 0
+
+    def find_path(self, start, goal, grid, width, height):
+        before = grid.expanded
+        path = a_star(start, goal, grid, width, height)
+        self.expanded += grid.expanded - before
+        return path
+
+class _JumpTable:
+    """
+    Saltos precalculados (estilo JPS+) para cada celda y cada una de las cuatro direcciones:
+    el siguiente punto de salto en esa dirección (o -1) y cuántas celdas libres hay hasta la pared.
+    Se usan índices sobre el mapa con un borde de celdas bloqueadas.
+    """
+    def __init__(self, grid):
+        self.version = grid.version
+        width, height = grid.width, grid.height
+        stride = self.stride = width + 2
+        size = stride * (height + 2)
+        blocked = self.blocked = bytearray(b"\x01") * size
+        for y in range(height):
+            row = (y + 1) * stride + 1
+            blocked[row:row + width] = grid.blocked[y * width:(y + 1) * width]
+        empty = array('i', [-1]) * size
+        zero = array('i', [0]) * size
+        self.jump = {d: array('i', empty) for d in (1, -1, stride, -stride)}
+        self.wall = {d: array('i', zero) for d in (1, -1, stride, -stride)}
+        rows = range(stride, size - stride, stride)
+        for dx in (1, -1):
+            jump, wall = self.jump[dx], self.wall[dx]
+            for row in rows:
+                cells = range(row + width, row, -1) if dx == 1 else range(row + 1, row + width + 1)
+                for c in cells:
+                    n = c + dx
+                    if blocked[n]:
+                        continue
+                    wall[c] = wall[n] + 1
+                    if ((not blocked[n - stride] and blocked[c - stride]) or
+                            (not blocked[n + stride] and blocked[c + stride])):
+                        jump[c] = n
+                    else:
+                        jump[c] = jump[n]
+        east, west = self.jump[1], self.jump[-1]
+        for step in (stride, -stride):
+            jump, wall = self.jump[step], self.wall[step]
+            for x in range(1, width + 1):
+                cells = (range((height) * stride + x, 0, -stride) if step > 0
+                         else range(stride + x, (height + 1) * stride, stride))
+                for c in cells:
+                    n = c + step
+                    if blocked[n]:
+                        continue
+                    wall[c] = wall[n] + 1
+                    if ((not blocked[n - 1] and blocked[c - 1]) or
+                            (not blocked[n + 1] and blocked[c + 1]) or
+                            east[n] != -1 or west[n] != -1):
+                        jump[c] = n
+                    else:
+                        jump[c] = jump[n]
+
+class JumpPointEngine:
+    """
+    Jump Point Search para grids de 4 vecinos. Salta en línea recta sobre las celdas
+    que no aportan caminos nuevos y solo mete en la cola los puntos de salto, por lo que
+    en mapas grandes expande muchos menos nodos que A*. Los saltos se precalculan por
+    versión del grid; en cada consulta solo se comprueba si el objetivo corta el salto.
+    """
+    name = "jps"
+
+    def __init__(self):
+        self.expanded = 0
+        self._tables = weakref.WeakKeyDictionary()
+
+    def table_for(self, grid):
+        table = self._tables.get(grid)
+        if table is None or table.version != grid.version:
+            table = _JumpTable(grid)
+            self._tables[grid] = table
+        return table
+
+    def find_path(self, start, goal, grid, width, height):
+        sx, sy = start
+        gx, gy = goal
+        if not (0 <= sx < width and 0 <= sy < height and 0 <= gx < width and 0 <= gy < height):
+            return None
+        if grid.blocked[gy * width + gx]:
+            return None
+        table = self.table_for(grid)
+        blocked = table.blocked
+        stride = table.stride
+        jumps = table.jump
+        walls = table.wall
+        start_i = (sy + 1) * stride + sx + 1
+        goal_i = (gy + 1) * stride + gx + 1
+        gx += 1
+        gy += 1
+        g_cost = {start_i: 0}
+        parent = {start_i: -1}
+        closed = set()
+        open_list = [(abs(sx + 1 - gx) + abs(sy + 1 - gy), start_i)]
+        expanded = 0
+        while open_list:
+            current = heapq.heappop(open_list)[1]
+            if current in closed:
+                continue
+            if current == goal_i:
+                self.expanded += expanded
+                return self._expand_path(current, parent, stride)
+            closed.add(current)
+            expanded += 1
+            cx, cy = current % stride, current // stride
+            p = parent[current]
+            if p == -1:
+                directions = (-1, 1, -stride, stride)
+            else:
+                delta = current - p
+                if -stride < delta < stride:
+                    directions = (-stride, stride, 1 if delta > 0 else -1)
+                else:
+                    directions = (-1, 1, stride if delta > 0 else -stride)
+            for d in directions:
+                if blocked[current + d]:
+                    continue
+                point = jumps[d][current]
+                free = walls[d][current]
+                if d == 1 or d == -1:
+                    reach = abs(point - current) if point != -1 else free
+                    if cy == gy and (gx - cx) * d > 0 and abs(gx - cx) <= reach:
+                        point = goal_i
+                else:
+                    sign = 1 if d > 0 else -1
+                    reach = abs(point - current) // stride if point != -1 else free
+                    if (gy - cy) * sign > 0 and abs(gy - cy) <= reach:
+                        row_cell = current + (gy - cy) * stride
+                        if cx == gx:
+                            point = goal_i
+                        else:
+                            side = 1 if gx > cx else -1
+                            if walls[side][row_cell] >= abs(gx - cx):
+                                point = row_cell
+                if point == -1 or point in closed:
+                    continue
+                px, py = point % stride, point // stride
+                tentative_g = g_cost[current] + abs(px - cx) + abs(py - cy)
+                if tentative_g < g_cost.get(point, tentative_g + 1):
+                    g_cost[point] = tentative_g
+                    parent[point] = current
+                    heapq.heappush(open_list, (tentative_g + abs(px - gx) + abs(py - gy), point))
+        self.expanded += expanded
+        return None
+
+    def _expand_path(self, current, parent, stride):
+        # Los puntos de salto consecutivos comparten fila o columna: se rellenan las celdas intermedias.
+        points = []
+        while current != -1:
+            points.append((current % stride - 1, current // stride - 1))
+            current = parent[current]
+        points.reverse()
+        path = [points[0]]
+        for x, y in points[1:]:
+            px, py = path[-1]
+            dx = (x > px) - (x < px)
+            dy = (y > py) - (y < py)
+            while (px, py) != (x, y):
+                px += dx
+                py += dy
+                path.append((px, py))
+        return path
+
+class _ClusterGraph:
+    """Grafo abstracto de HPA*: entradas entre clusters y distancias precalculadas dentro de cada uno."""
+    def __init__(self, grid, cluster_size):
+        self.version = grid.version
+        self.cluster_size = cluster_size
+        self.edges = {}  # índice de celda -> lista de (índice vecino, coste)
+        self.entrances = {}  # (cluster x, cluster y) -> entradas del cluster
+        self._build(grid)
+
+    def cluster_bounds(self, x, y):
+        size = self.cluster_size
+        left = (x // size) * size
+        top = (y // size) * size
+        return left, top, left + size, top + size
+
+    def _add_edge(self, a, b, cost):
+        self.edges.setdefault(a, []).append((b, cost))
+        self.edges.setdefault(b, []).append((a, cost))
+
+    def _build(self, grid):
+        width, height = grid.width, grid.height
+        blocked = grid.blocked
+        size = self.cluster_size
+        entrances = self.entrances
+
+        def add_entrance(run, side_a, side_b):
+            # Tramos cortos: una entrada en el centro; tramos largos: una en cada extremo.
+            picks = [run[len(run) // 2]] if len(run) < 6 else [run[0], run[-1]]
+            for a, b in ((side_a(p), side_b(p)) for p in picks):
+                ax, ay = a % width, a // width
+                bx, by = b % width, b // width
+                entrances.setdefault((ax // size, ay // size), set()).add(a)
+                entrances.setdefault((bx // size, by // size), set()).add(b)
+                self._add_edge(a, b, 1)
+
+        # Bordes verticales entre clusters vecinos en x
+        for x in range(size - 1, width - 1, size):
+            for top in range(0, height, size):
+                run = []
+                for y in range(top, min(top + size, height)):
+                    if not blocked[y * width + x] and not blocked[y * width + x + 1]:
+                        run.append(y)
+                    elif run:
+                        add_entrance(run, lambda p, x=x: p * width + x, lambda p, x=x: p * width + x + 1)
+                        run = []
+                if run:
+                    add_entrance(run, lambda p, x=x: p * width + x, lambda p, x=x: p * width + x + 1)
+        # Bordes horizontales entre clusters vecinos en y
+        for y in range(size - 1, height - 1, size):
+            for left in range(0, width, size):
+                run = []
+                for x in range(left, min(left + size, width)):
+                    if not blocked[y * width + x] and not blocked[(y + 1) * width + x]:
+                        run.append(x)
+                    elif run:
+                        add_entrance(run, lambda p, y=y: y * width + p, lambda p, y=y: (y + 1) * width + p)
+                        run = []
+                if run:
+                    add_entrance(run, lambda p, y=y: y * width + p, lambda p, y=y: (y + 1) * width + p)
+        # Aristas internas: distancias BFS entre las entradas de un mismo cluster
+        for key, nodes in entrances.items():
+            nodes = entrances[key] = sorted(nodes)
+            for i, source in enumerate(nodes):
+                distances, _ = self.local_search(grid, source, nodes[i + 1:])
+                for target in nodes[i + 1:]:
+                    if target in distances:
+                        self._add_edge(source, target, distances[target])
+
+    def local_search(self, grid, source, targets):
+        """BFS limitada al cluster de `source`. Devuelve (distancias, padres) de las celdas alcanzadas."""
+        width = grid.width
+        blocked = grid.blocked
+        left, top, right, bottom = self.cluster_bounds(source % width, source // width)
+        right = min(right, width)
+        bottom = min(bottom, grid.height)
+        pending = set(targets)
+        distances = {source: 0}
+        parents = {source: -1}
+        pending.discard(source)
+        queue = deque([source])
+        while queue and pending:
+            current = queue.popleft()
+            cx = current % width
+            cy = current // width
+            d = distances[current] + 1
+            for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+                if left <= nx < right and top <= ny < bottom:
+                    neighbor = ny * width + nx
+                    if neighbor not in distances and not blocked[neighbor]:
+                        distances[neighbor] = d
+                        parents[neighbor] = current
+                        pending.discard(neighbor)
+                        queue.append(neighbor)
+        return distances, parents
+
+class HierarchicalEngine:
+    """
+    HPA*: divide el mapa en clusters, precalcula un grafo de entradas entre clusters
+    y busca primero sobre ese grafo abstracto; después refina cada tramo con búsquedas
+    locales dentro de un cluster. Los caminos son casi óptimos. El grafo se reconstruye
+    cuando cambia la versión del grid.
+    """
+    name = "hpa"
+
+    def __init__(self, cluster_size=16):
+        self.cluster_size = cluster_size
+        self.expanded = 0
+        self._graphs = weakref.WeakKeyDictionary()
+
+    def graph_for(self, grid):
+        graph = self._graphs.get(grid)
+        if graph is None or graph.version != grid.version:
+            graph = _ClusterGraph(grid, self.cluster_size)
+            self._graphs[grid] = graph
+        return graph
+
+    def find_path(self, start, goal, grid, width, height):
+        sx, sy = start
+        gx, gy = goal
+        if not (0 <= sx < width and 0 <= sy < height and 0 <= gx < width and 0 <= gy < height):
+            return None
+        if grid.blocked[gy * width + gx]:
+            return None
+        graph = self.graph_for(grid)
+        start_i = sy * width + sx
+        goal_i = gy * width + gx
+        if graph.cluster_bounds(sx, sy) == graph.cluster_bounds(gx, gy):
+            _, parents = graph.local_search(grid, start_i, [goal_i])
+            self.expanded += len(parents)
+            if goal_i in parents:
+                return self._cells(self._unwind(parents, goal_i), width)
+        # Conectar inicio y objetivo temporalmente con las entradas de su cluster
+        extra = {}
+        for node in (start_i, goal_i):
+            if node in graph.edges:
+                continue
+            size = graph.cluster_size
+            local = graph.entrances.get((node % width // size, node // width // size))
+            if not local:
+                continue
+            distances, parents = graph.local_search(grid, node, local)
+            self.expanded += len(parents)
+            for target in local:
+                if target in distances:
+                    extra.setdefault(node, []).append((target, distances[target]))
+                    extra.setdefault(target, []).append((node, distances[target]))
+        abstract = self._abstract_search(graph, extra, start_i, goal_i, width)
+        if abstract is None:
+            return None
+        # Refinar: cada tramo abstracto es un paso entre clusters o una búsqueda local
+        path = [start_i]
+        for a, b in zip(abstract, abstract[1:]):
+            ax, ay, bx, by = a % width, a // width, b % width, b // width
+            if abs(ax - bx) + abs(ay - by) == 1:
+                path.append(b)
+                continue
+            _, parents = graph.local_search(grid, a, [b])
+            self.expanded += len(parents)
+            path.extend(self._unwind(parents, b)[1:])
+        return self._cells(path, width)
+
+    def _abstract_search(self, graph, extra, start_i, goal_i, width):
+        gx, gy = goal_i % width, goal_i // width
+        g_cost = {start_i: 0}
+        parents = {start_i: -1}
+        closed = set()
+        open_list = [(0, start_i)]
+        while open_list:
+            current = heapq.heappop(open_list)[1]
+            if current in closed:
+                continue
+            if current == goal_i:
+                return self._unwind(parents, goal_i)
+            closed.add(current)
+            self.expanded += 1
+            for neighbor, cost in graph.edges.get(current, []) + extra.get(current, []):
+                if neighbor in closed:
+                    continue
+                tentative_g = g_cost[current] + cost
+                if tentative_g < g_cost.get(neighbor, tentative_g + 1):
+                    g_cost[neighbor] = tentative_g
+                    parents[neighbor] = current
+                    h = abs(neighbor % width - gx) + abs(neighbor // width - gy)
+                    heapq.heappush(open_list, (tentative_g + h, neighbor))
+        return None
+
+    @staticmethod
+    def _unwind(parents, node):
+        nodes = []
+        while node != -1:
+            nodes.append(node)
+            node = parents[node]
+        return nodes[::-1]
+
+    @staticmethod
+    def _cells(indices, width):
+        return [(i % width, i // width) for i in indices]
+
+ENGINES = {
+    "astar": AStarEngine,
+    "jps": JumpPointEngine,
+    "hpa": HierarchicalEngine,
+}
+
+_engines = {}
+
+def get_engine(mode="astar"):
+    """Instancia compartida del motor de búsqueda `mode` ("astar", "jps" o "hpa")."""
+    engine = _engines.get(mode)
+    if engine is None:
+        if mode not in ENGINES:
+            raise ValueError(f"Modo de búsqueda desconocido: {mode}")
+        engine = ENGINES[mode]()
+        _engines[mode] = engine
+    return engine
@@ -0,0 +1,251 @@
+import heapq
+import time
+import weakref
+from src.pathcache import path_cache_for, MISSING
+from src.reachability import reachable
+from src.settings import PATH_BUDGET_EXPANSIONS, PATH_SLICE_EXPANSIONS
+
+NO_RESULT = MISSING  # take() sin resultado todavía (None significa "no hay camino")
+
+class AStarSearch:
+    """
+    A* de 4 vecinos que se puede pausar: advance(n) expande como mucho n nodos y
+    devuelve True al terminar. Guarda su propio estado en dicts, así que varias búsquedas
+    pueden quedar a medias a la vez. Da los mismos caminos que level.a_star.
+    Si la versión del grid cambia a mitad de búsqueda, empieza de nuevo.
+    """
+    def __init__(self, grid, start, goal):
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.expanded = 0
+        self._reset()
+
+    def _reset(self):
+        grid = self.grid
+        width, height = grid.width, grid.height
+        (sx, sy), (gx, gy) = self.start, self.goal
+        self.version = grid.version
+        self.done = False
+        self.path = None
+        if not (0 <= sx < width and 0 <= sy < height and 0 <= gx < width and 0 <= gy < height):
+            self.done = True
+            return
+        grid.searches += 1
+        start_i = sy * width + sx
+        self._goal_i = gy * width + gx
+        self._g = {start_i: 0}
+        self._parent = {start_i: -1}
+        self._closed = set()
+        self._open = [(abs(sx - gx) + abs(sy - gy), start_i)]
+
+    def advance(self, max_expansions):
+        if self.done:
+            return True
+        grid = self.grid
+        if grid.version != self.version:
+            self._reset()
+            if self.done:
+                return True
+        width, height = grid.width, grid.height
+        blocked = grid.blocked
+        g_cost = self._g
+        parent = self._parent
+        closed = self._closed
+        open_list = self._open
+        goal_i = self._goal_i
+        gx, gy = self.goal
+        expanded = 0
+        while open_list and expanded < max_expansions:
+            current = heapq.heappop(open_list)[1]
+            if current in closed:
+                continue
+            if current == goal_i:
+                path = []
+                while current != -1:
+                    path.append((current % width, current // width))
+                    current = parent[current]
+                self.path = path[::-1]
+                self.done = True
+                break
+            closed.add(current)
+            expanded += 1
+            cx = current % width
+            cy = current // width
+            tentative_g = g_cost[current] + 1
+            for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+                if 0 <= nx < width and 0 <= ny < height:
+                    neighbor = ny * width + nx
+                    if blocked[neighbor] or neighbor in closed:
+                        continue
+                    if tentative_g < g_cost.get(neighbor, tentative_g + 1):
+                        g_cost[neighbor] = tentative_g
+                        parent[neighbor] = current
+                        heapq.heappush(open_list, (tentative_g + abs(nx - gx) + abs(ny - gy), neighbor))
+        else:
+            if not open_list:
+                self.done = True
+        self.expanded += expanded
+        grid.expanded += expanded
+        return self.done
+
+class _Request:
+    __slots__ = ("requester", "start", "goal", "priority", "seq", "search")
+
+    def __init__(self, requester, start, goal, priority, seq):
+        self.requester = requester
+        self.start = start
+        self.goal = goal
+        self.priority = priority
+        self.seq = seq
+        self.search = None
+
+class PathService:
+    """
+    Cola de peticiones de caminos con prioridad, procesada por partes en cada tick.
+    request() apunta una petición (una por solicitante: la nueva sustituye a la anterior),
+    process() avanza las búsquedas hasta agotar el presupuesto del tick y take() entrega
+    el resultado cuando está listo. Una búsqueda que no termina sigue en el tick siguiente,
+    así que ningún tick paga por todas las búsquedas juntas.
+    El presupuesto se mide en nodos expandidos (`max_expansions`, determinista) y,
+    si `budget_ms` no es None, también en milisegundos reales.
+    Menor `priority` se atiende antes. Los caminos terminados se guardan en la PathCache del grid.
+    """
+    def __init__(self, grid, max_expansions=PATH_BUDGET_EXPANSIONS, budget_ms=None,
+                 slice_expansions=PATH_SLICE_EXPANSIONS):
+        self._grid = weakref.ref(grid)
+        self.max_expansions = max_expansions
+        self.budget_ms = budget_ms
+        self.slice_expansions = slice_expansions
+        self._pending = {}   # solicitante -> _Request
+        self._queue = []     # (prioridad, seq, solicitante)
+        self._current = None
+        self._results = {}
+        self._seq = 0
+        self.requested = 0
+        self.completed = 0
+        self.cache_hits = 0
+        self.unreachable = 0
+        self.max_queue = 0
+        self.last_process_ms = 0.0
+        self.max_process_ms = 0.0
+
+    def request(self, requester, start, goal, priority=0):
+        """Pide un camino. Si está en la caché o no hay camino posible el resultado queda listo al instante."""
+        grid = self._grid()
+        self.requested += 1
+        cache = path_cache_for(grid)
+        path = cache.lookup(grid, start, goal)
+        if path is MISSING and not reachable(grid, start, goal):
+            # Sin camino posible: el resultado (None) está listo sin pasar por la cola
+            cache.put(grid, start, goal, None)
+            path = None
+            self.unreachable += 1
+        elif path is not MISSING:
+            self.cache_hits += 1
+        if path is not MISSING:
+            self._pending.pop(requester, None)
+            if self._current is not None and self._current.requester is requester:
+                self._current = None
+            self._results[requester] = path
+            return
+        pending = self._pending.get(requester)
+        if pending is not None and pending.start == start and pending.goal == goal:
+            return
+        if self._current is not None and self._current.requester is requester:
+            self._current = None
+        self._seq += 1
+        pending = self._pending[requester] = _Request(requester, start, goal, priority, self._seq)
+        heapq.heappush(self._queue, (priority, pending.seq, requester))
+        self.max_queue = max(self.max_queue, len(self._pending))
+
+    def is_pending(self, requester):
+        return requester in self._pending
+
+    def take(self, requester):
+        """Resultado listo para `requester` (una lista, o None si no hay camino) o NO_RESULT."""
+        return self._results.pop(requester, NO_RESULT)
+
+    def cancel(self, requester):
+        self._pending.pop(requester, None)
+        self._results.pop(requester, None)
+        if self._current is not None and self._current.requester is requester:
+            self._current = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _next_request(self):
+        queue = self._queue
+        while queue:
+            _, seq, requester = heapq.heappop(queue)
+            request = self._pending.get(requester)
+            if request is None or request.seq != seq:
+                continue  # sustituida o cancelada
+            alive = getattr(requester, "alive", None)
+            if alive is not None and not alive():
+                del self._pending[requester]
+                continue
+            return request
+        return None
+
+    def process(self):
+        """Avanza las búsquedas pendientes dentro del presupuesto del tick. Devuelve cuántas terminaron."""
+        if not self._pending:
+            self.last_process_ms = 0.0
+            return 0
+        grid = self._grid()
+        cache = path_cache_for(grid)
+        start_time = time.perf_counter()
+        deadline = start_time + self.budget_ms / 1000 if self.budget_ms is not None else None
+        remaining = self.max_expansions
+        finished = 0
+        while remaining > 0:
+            request = self._current
+            if request is None:
+                request = self._current = self._next_request()
+                if request is None:
+                    break
+                request.search = AStarSearch(grid, request.start, request.goal)
+            search = request.search
+            before = search.expanded
+            done = search.advance(min(self.slice_expansions, remaining))
+            remaining -= max(1, search.expanded - before)
+            if done:
+                cache.put(grid, request.start, request.goal, search.path)
+                self._results[request.requester] = search.path
+                del self._pending[request.requester]
+                self._current = None
+                self.completed += 1
+                finished += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        self.last_process_ms = (time.perf_counter() - start_time) * 1000
+        self.max_process_ms = max(self.max_process_ms, self.last_process_ms)
+        return finished
+
+    def stats(self):
+        return {
+            "requested": self.requested,
+            "completed": self.completed,
+            "cache_hits": self.cache_hits,
+            "unreachable": self.unreachable,
+            "pending": len(self._pending),
+            "max_queue": self.max_queue,
+            "last_process_ms": self.last_process_ms,
+            "max_process_ms": self.max_process_ms,
+        }
+
+_services = weakref.WeakKeyDictionary()
+
+def path_service_for(grid):
+    """Servicio de caminos compartido asociado a un grid."""
+    service = _services.get(grid)
+    if service is None:
+        service = PathService(grid)
+        _services[grid] = service
+    return service
+
+def existing_path_service(grid):
+    """El servicio del grid si ya se creó, sin crearlo."""
+    return _services.get(grid)
@@ -0,0 +1,289 @@
+import math
+import random
+from src.settings import PLACEMENT_ATTEMPTS
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él todas las categorías usan el relleno de Bridson
+    np = None
+
+# Área media por puesto de un relleno completo, en unidades de d² (medida con Bridson en
+# la métrica del máximo), y puestos que se quieren por objeto pedido en la primera pasada
+PACKING = 1.6
+FILL_RATIO = 2
+# A partir de estos objetos en una categoría (y con numpy) se rellena por fases en paralelo;
+# con menos, el bucle de Python sale más barato que preparar los arrays
+PARALLEL_MIN_COUNT = 20
+
+class Category:
+    """
+    Un tipo de objeto a colocar: `count` cuadrados de lado `size` separados de los demás
+    al menos `spacing` px (borde a borde; entre dos categorías cuenta el mayor de los dos)
+    y, si se da `area` (left, top, width, height), completamente dentro de ella.
+    """
+    def __init__(self, name, count, size, spacing=0, area=None):
+        self.name = name
+        self.count = count
+        self.size = size
+        self.spacing = spacing
+        self.area = area
+
+def poisson_place(bounds, categories, exclusions=(), rng=random, attempts=PLACEMENT_ATTEMPTS):
+    """
+    Coloca las categorías (en orden) con muestreo de disco de Poisson (Bridson) sobre un
+    único grid de aceleración. Para cada categoría se rellena su área desde semillas al
+    azar: cada punto activo prueba `attempts` candidatos justo a la distancia mínima, y un
+    candidato vale si no toca ninguna zona de `exclusions` (rects) ni queda demasiado cerca
+    de otro objeto, ya sea de esta categoría o de las anteriores. La distancia es la del
+    máximo entre ejes, así que "lejos" equivale a que los rects, ampliados con la
+    separación, no se solapan. Del relleno se queda una muestra al azar de `count` puestos,
+    repartidos por todo el área, y el resto se descarta.
+    Las celdas del grid miden la menor distancia posible entre dos objetos, así que cada
+    una guarda como mucho uno y cada comprobación mira solo unas pocas celdas vecinas.
+    Con numpy, las categorías de PARALLEL_MIN_COUNT objetos o más se rellenan en paralelo
+    (ver _fill_parallel) en lugar de punto a punto.
+    Devuelve {nombre: [(x, y) esquina superior izquierda, ...]}; si no caben todos, menos.
+    """
+    categories = [c for c in categories if c.count > 0]
+    result = {c.name: [] for c in categories}
+    if not categories:
+        return result
+    left, top, width, height = bounds
+    # Distancia mínima entre centros para cada par de categorías
+    pair = [[(a.size + b.size) / 2 + max(a.spacing, b.spacing) for b in categories] for a in categories]
+    cell = max(1.0, min(c.size for c in categories) + min(c.spacing for c in categories))
+    columns = int(width // cell) + 1
+    rows = int(height // cell) + 1
+    grid = [-1] * (columns * rows)
+    xs, ys, kinds = [], [], []
+    exclusions = [tuple(e) for e in exclusions]
+
+    for kind, category in enumerate(categories):
+        size = category.size
+        half = size / 2
+        distances = pair[kind]
+        area = category.area if category.area is not None else bounds
+        # El área de la categoría nunca sale de `bounds`, que es lo que cubre el grid
+        min_x, min_y = max(area[0], left), max(area[1], top)
+        max_x = min(area[0] + area[2], left + width) - size
+        max_y = min(area[1] + area[3], top + height) - size
+        first = len(xs)
+        if max_x < min_x or max_y < min_y:
+            continue
+        box = (min_x, min_y, max_x, max_y)
+        # Con pocos objetos para el área se rellena primero con una separación mayor (unos
+        # FILL_RATIO puestos por objeto pedido) y solo si no bastan se sigue con la mínima
+        d = distances[kind]
+        spread = math.sqrt((max_x - min_x + size) * (max_y - min_y + size) / (PACKING * FILL_RATIO * category.count))
+        passes = [spread, d] if spread > d else [d]
+        active = []
+        for d in passes:
+            limits = list(distances)
+            limits[kind] = d
+            reach = int(math.ceil(max(limits) / cell))
+            parallel = np is not None and category.count >= PARALLEL_MIN_COUNT
+            if parallel:
+                missing = category.count - (len(xs) - first)
+                centers = _fill_parallel(grid, xs, ys, kinds, kind, limits, reach, cell, columns, rows, left, top,
+                                         box, size, exclusions, rng, attempts, missing)
+                # Si ni la última pasada llega es que el área va justa: se descarta y la rellena
+                # Bridson, que aprieta más los puestos
+                if len(centers) == missing or d != passes[-1]:
+                    for center in centers:
+                        _add(grid, xs, ys, kinds, active, kind, center, left, top, cell, columns)
+                    active.clear()
+                    if len(centers) == missing:
+                        break
+                    continue
+            # Mientras haya menos objetos que celdas por mirar es más barato recorrerlos todos
+            window = (2 * reach + 1) ** 2
+
+            def fits(x, y):
+                """Centro (cx, cy) si cabe un objeto con esquina (x, y); si no, None."""
+                if not (min_x <= x <= max_x and min_y <= y <= max_y):
+                    return None
+                for ex, ey, ew, eh in exclusions:
+                    if x < ex + ew and x + size > ex and y < ey + eh and y + size > ey:
+                        return None
+                cx = x + half
+                cy = y + half
+                gx = int((cx - left) // cell)
+                gy = int((cy - top) // cell)
+                if grid[gy * columns + gx] >= 0:
+                    return None  # la propia celda ya está ocupada: demasiado cerca seguro
+                if len(xs) < window:
+                    for other in range(len(xs)):
+                        limit = limits[kinds[other]]
+                        if abs(xs[other] - cx) < limit and abs(ys[other] - cy) < limit:
+                            return None
+                    return cx, cy
+                for ny in range(max(gy - reach, 0), min(gy + reach + 1, rows)):
+                    row = ny * columns
+                    for nx in range(max(gx - reach, 0), min(gx + reach + 1, columns)):
+                        other = grid[row + nx]
+                        if other >= 0:
+                            limit = limits[kinds[other]]
+                            if abs(xs[other] - cx) < limit and abs(ys[other] - cy) < limit:
+                                return None
+                return cx, cy
+
+            # Los puestos de la pasada anterior vuelven a estar activos; además varias
+            # semillas, porque los objetos anteriores pueden dejar zonas a las que no
+            # llega el frente de una sola
+            active.extend(range(first, len(xs)))
+            seeds = attempts
+            while active or seeds:
+                if not active:
+                    seeds -= 1
+                    center = fits(rng.randint(min_x, max_x), rng.randint(min_y, max_y))
+                    if center is not None:
+                        _add(grid, xs, ys, kinds, active, kind, center, left, top, cell, columns)
+                    continue
+                slot = rng.randrange(len(active))
+                parent = active[slot]
+                px, py = xs[parent], ys[parent]
+                # Candidatos repartidos por el borde del cuadrado de semilado d + 1 alrededor
+                # del padre, empezando en un punto al azar (variante de Roberts de Bridson)
+                r = d + 1
+                start = rng.random()
+                for j in range(attempts):
+                    s = (start + j / attempts) % 1.0 * 8
+                    side = int(s // 2)
+                    offset = (s % 2 - 1) * r
+                    if side == 0:
+                        dx, dy = r, offset
+                    elif side == 1:
+                        dx, dy = -offset, r
+                    elif side == 2:
+                        dx, dy = -r, -offset
+                    else:
+                        dx, dy = offset, -r
+                    # Redondeo alejándose del padre para no quedar por debajo de d
+                    x = px + dx - half
+                    y = py + dy - half
+                    center = fits(math.ceil(x) if dx > 0 else math.floor(x),
+                                  math.ceil(y) if dy > 0 else math.floor(y))
+                    if center is not None:
+                        _add(grid, xs, ys, kinds, active, kind, center, left, top, cell, columns)
+                        break
+                else:
+                    # Sin hueco alrededor: el punto deja de estar activo
+                    active[slot] = active[-1]
+                    active.pop()
+            if parallel and len(xs) - first < category.count:
+                # El frente de Bridson no llega a los huecos sueltos sin semilla; las fases sí
+                for center in _fill_parallel(grid, xs, ys, kinds, kind, limits, reach, cell, columns, rows, left,
+                                             top, box, size, exclusions, rng, attempts,
+                                             category.count - (len(xs) - first)):
+                    _add(grid, xs, ys, kinds, active, kind, center, left, top, cell, columns)
+            if len(xs) - first >= category.count:
+                break
+        # Muestra al azar del relleno; los puestos que sobran se quitan del grid
+        if len(xs) - first > category.count:
+            chosen = [(xs[i], ys[i]) for i in sorted(rng.sample(range(first, len(xs)), category.count))]
+            for i in range(first, len(xs)):
+                grid[int((ys[i] - top) // cell) * columns + int((xs[i] - left) // cell)] = -1
+            del xs[first:], ys[first:], kinds[first:]
+            for center in chosen:
+                _add(grid, xs, ys, kinds, active, kind, center, left, top, cell, columns)
+        result[category.name] = [(int(xs[i] - half), int(ys[i] - half)) for i in range(first, len(xs))]
+    return result
+
+def _add(grid, xs, ys, kinds, active, kind, center, left, top, cell, columns):
+    cx, cy = center
+    grid[int((cy - top) // cell) * columns + int((cx - left) // cell)] = len(xs)
+    xs.append(cx)
+    ys.append(cy)
+    kinds.append(kind)
+    active.append(len(xs) - 1)
+
+def _fill_parallel(grid, xs, ys, kinds, kind, limits, reach, cell, columns, rows, left, top, box, size, exclusions,
+                   rng, attempts, wanted):
+    """
+    Relleno por fases (Wei, "Parallel Poisson disk sampling") con numpy. El grid se agrupa en
+    bloques de reach x reach celdas, tan anchos como la mayor distancia entre dos objetos, así
+    que dos bloques de la misma paridad nunca tienen objetos que choquen entre sí: en cada
+    fase se prueba a la vez un punto al azar por bloque contra los objetos ya colocados de
+    las celdas vecinas. Un bloque se da por lleno tras `attempts` fallos seguidos, y el
+    relleno para en cuanto una ronda completa llega a `wanted` puestos (luego se elige una
+    muestra al azar, así que no hace falta agotar el área). Devuelve los centros nuevos.
+    """
+    min_x, min_y, max_x, max_y = box
+    half = size / 2
+    generator = np.random.default_rng(rng.getrandbits(64))
+    # Grid con un marco vacío de reach celdas para mirar las vecinas sin salirse
+    owner = np.full((rows + 2 * reach, columns + 2 * reach), -1, dtype=np.int64)
+    owner[reach:reach + rows, reach:reach + columns] = np.reshape(grid, (rows, columns))
+    owner = owner.ravel()
+    stride = columns + 2 * reach
+    capacity = len(xs) + columns * rows
+    px = np.zeros(capacity)
+    py = np.zeros(capacity)
+    limit_of = np.zeros(capacity)
+    count = len(xs)
+    px[:count] = xs
+    py[:count] = ys
+    limit_of[:count] = np.asarray(limits, dtype=np.float64)[np.asarray(kinds, dtype=np.int64)]
+    # Bloques que cubren los centros posibles de la categoría, en px
+    block = reach * cell
+    first_x = int((min_x + half - left) // block)
+    first_y = int((min_y + half - top) // block)
+    blocks_x = np.arange(first_x, int((max_x + half - left) // block) + 1)
+    blocks_y = np.arange(first_y, int((max_y + half - top) // block) + 1)
+    bx = np.tile(blocks_x, len(blocks_y))
+    by = np.repeat(blocks_y, len(blocks_x))
+    failures = np.zeros(len(bx), dtype=np.int64)
+    phases = [np.flatnonzero((bx % 2 == ox) & (by % 2 == oy)) for oy in range(2) for ox in range(2)]
+    offsets = np.arange(-reach, reach + 1)
+    window = (np.repeat(offsets, 2 * reach + 1) * stride + np.tile(offsets, 2 * reach + 1))
+    added = []
+    while True:
+        tried = False
+        for phase in phases:
+            blocks = phase[failures[phase] < attempts]
+            if not len(blocks):
+                continue
+            tried = True
+            # Un candidato por bloque, con la esquina entera (como en el relleno de Bridson) y
+            # dentro del trozo del bloque que cae en el área
+            low_x = np.maximum(left + bx[blocks] * block - half, min_x)
+            low_y = np.maximum(top + by[blocks] * block - half, min_y)
+            high_x = np.minimum(left + (bx[blocks] + 1) * block - half, max_x + 1)
+            high_y = np.minimum(top + (by[blocks] + 1) * block - half, max_y + 1)
+            x = np.floor(low_x + generator.random(len(blocks)) * (high_x - low_x))
+            y = np.floor(low_y + generator.random(len(blocks)) * (high_y - low_y))
+            cx, cy = x + half, y + half
+            gx = ((cx - left) // cell).astype(np.int64)
+            gy = ((cy - top) // cell).astype(np.int64)
+            ok = ((x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y) &
+                  ((cx - left) // block == bx[blocks]) & ((cy - top) // block == by[blocks]))
+            for ex, ey, ew, eh in exclusions:
+                ok &= ~((x < ex + ew) & (x + size > ex) & (y < ey + eh) & (y + size > ey))
+            slots = (gy + reach) * stride + gx + reach
+            # Los candidatos fuera del área ya están descartados; miran una celda cualquiera
+            slots[~ok] = reach * stride + reach
+            ok &= owner[slots] < 0
+            # Solo los que caen en una celda libre se comparan con las vecinas
+            check = np.flatnonzero(ok)
+            other = owner[slots[check, None] + window]
+            row, column = np.nonzero(other >= 0)
+            other = other[row, column]
+            candidate = check[row]
+            limit = limit_of[other]
+            near = (np.abs(px[other] - cx[candidate]) < limit) & (np.abs(py[other] - cy[candidate]) < limit)
+            ok[candidate[near]] = False
+            failures[blocks[~ok]] += 1
+            failures[blocks[ok]] = 0
+            chosen = np.flatnonzero(ok)
+            new = np.arange(count, count + len(chosen))
+            owner[slots[chosen]] = new
+            px[new] = cx[chosen]
+            py[new] = cy[chosen]
+            limit_of[new] = limits[kind]
+            count += len(new)
+            added.extend(zip(cx[chosen].tolist(), cy[chosen].tolist()))
+        if not tried or len(added) >= wanted:
+            # La muestra se toma aquí para no meter en el grid puestos que luego sobran
+            if len(added) > wanted:
+                added = [added[i] for i in sorted(rng.sample(range(len(added)), wanted))]
+            return added
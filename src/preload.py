@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from src.assets import assets
+
+def _decode_and_scale(path, size):
+    # Se ejecuta en un hilo de trabajo: decodifica y escala, sin tocar la pantalla.
+    surface = pygame.image.load(path)
+    if size and surface.get_size() != tuple(size):
+        surface = pygame.transform.scale(surface, size)
+    return surface
+
+class Preloader:
+    """
+    Precarga en segundo plano las imágenes de las próximas pantallas.
+    Los hilos solo decodifican y escalan; la conversión al formato de pantalla
+    (convert/convert_alpha) se hace en el hilo principal con poll() o wait_for().
+    Las superficies terminadas se guardan en el AssetManager, así que assets.load()
+    las encuentra sin volver a leer el archivo. Si se pide una imagen que aún está en
+    cola, assets.load() espera a que termine en lugar de cargarla otra vez.
+    `manifest` es una lista de (ruta, tamaño, modo) como en AssetManager.load.
+    """
+    def __init__(self, manifest, manager=assets, workers=4):
+        self.manager = manager
+        self.manifest = [(path, tuple(size) if size else None, mode) for path, size, mode in manifest]
+        self.workers = workers
+        self._executor = None
+        self._futures = {}
+        self.finished = 0
+        self.failed = 0
+
+    def start(self):
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="preload")
+        for key in self.manifest:
+            if key in self._futures or self.manager.contains(*key):
+                continue
+            path, size, mode = key
+            self._futures[key] = self._executor.submit(_decode_and_scale, path, size)
+            self.manager.register_pending(key, self._waiter(key))
+
+    def _waiter(self, key):
+        return lambda: self._wait(key)
+
+    def _wait(self, key):
+        future = self._futures.get(key)
+        if future is not None:
+            future.exception()  # espera sin lanzar la excepción
+            self._finalize(key)
+
+    def _finalize(self, key):
+        future = self._futures.pop(key)
+        self.manager.discard_pending(key)
+        try:
+            surface = future.result()
+        except (pygame.error, OSError):
+            self.failed += 1
+            return  # assets.load() generará la imagen de reemplazo como siempre
+        path, size, mode = key
+        self.manager.decodes += 1
+        self.manager.put(path, size, mode, self.manager.convert(surface, mode))
+        self.finished += 1
+
+    def poll(self, limit=None):
+        """Convierte en el hilo principal las imágenes ya decodificadas. Devuelve cuántas procesó."""
+        ready = [key for key, future in self._futures.items() if future.done()]
+        if limit is not None:
+            ready = ready[:limit]
+        for key in ready:
+            self._finalize(key)
+        if not self._futures:
+            self.shutdown()
+        return len(ready)
+
+    def progress(self):
+        """Fracción de la lista ya lista para usar (0.0 - 1.0)."""
+        total = len(self.manifest)
+        if total == 0:
+            return 1.0
+        return (total - len(self._futures)) / total if self._executor is not None else 0.0
+
+    def done(self):
+        return self._executor is not None and not self._futures
+
+    def wait_for(self, path, size=None, mode="auto"):
+        """Bloquea hasta que la imagen indicada esté precargada y la devuelve."""
+        self._wait((path, tuple(size) if size else None, mode))
+        return self.manager.load(path, size, mode)
+
+    def wait_all(self):
+        for key in list(self._futures):
+            self._wait(key)
+        self.shutdown()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,188 @@
+import csv
+import json
+import time
+from collections import deque
+import pygame
+from src.settings import BLACK, WHITE, YELLOW
+from src.ui import get_font
+
+class FrameProfiler:
+    """
+    Mide cuánto tarda cada fase de un cuadro (entrada, movimiento, IA, colisiones, dibujo...).
+    Uso por cuadro: begin_frame(), mark("fase") al terminar cada fase y end_frame().
+    mark() atribuye a la fase el tiempo transcurrido desde la marca anterior; si una fase
+    se repite en el mismo cuadro (varios ticks de lógica) los tiempos se suman.
+    Los últimos `capacity` cuadros se guardan en un buffer circular. Desactivado,
+    cada llamada solo comprueba `enabled` y vuelve.
+    """
+    def __init__(self, capacity=600, enabled=False):
+        self.enabled = enabled
+        self.show_overlay = False
+        self.frames = deque(maxlen=capacity)  # (nº de cuadro, inicio, [(fase, inicio, duración)], contadores)
+        self.frame_count = 0
+        self._grid = None
+        self._grid_counts = (0, 0)
+        self._frame_start = 0.0
+        self._last = 0.0
+        self._phases = None
+        self._overlay_image = None
+        self._overlay_frame = -1
+
+    def watch_grid(self, grid):
+        """Cuenta por cuadro las búsquedas A* y los nodos expandidos de este grid."""
+        self._grid = grid
+        self._grid_counts = (grid.searches, grid.expanded)
+
+    def toggle(self):
+        """Activa o desactiva la medición y el panel a la vez (tecla F3)."""
+        self.enabled = self.show_overlay = not self.enabled
+        self._phases = None
+        if self._grid is not None:
+            self._grid_counts = (self._grid.searches, self._grid.expanded)
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = self._last = time.perf_counter()
+        self._phases = []
+
+    def mark(self, phase):
+        if not self.enabled or self._phases is None:
+            return
+        now = time.perf_counter()
+        self._phases.append((phase, self._last, now - self._last))
+        self._last = now
+
+    def end_frame(self):
+        if not self.enabled or self._phases is None:
+            return
+        counters = {}
+        grid = self._grid
+        if grid is not None:
+            searches, expanded = self._grid_counts
+            counters["astar_calls"] = grid.searches - searches
+            counters["expanded"] = grid.expanded - expanded
+            self._grid_counts = (grid.searches, grid.expanded)
+        self.frames.append((self.frame_count, self._frame_start, self._phases, counters))
+        self.frame_count += 1
+        self._phases = None
+
+    # --- Estadísticas ---
+
+    def phase_names(self):
+        names = []
+        for _, _, phases, _ in self.frames:
+            for name, _, _ in phases:
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def frame_totals(self):
+        """Lista de dicts {fase: ms} por cuadro, con la clave "frame" para el total."""
+        totals = []
+        for _, _, phases, _ in self.frames:
+            row = {}
+            for name, _, duration in phases:
+                row[name] = row.get(name, 0.0) + duration * 1000
+            row["frame"] = sum(duration for _, _, duration in phases) * 1000
+            totals.append(row)
+        return totals
+
+    def summary(self, percentiles=(50, 95, 99)):
+        """{fase: {"mean": ms, "p50": ms, ...}} sobre los cuadros del buffer."""
+        totals = self.frame_totals()
+        result = {}
+        for name in self.phase_names() + ["frame"]:
+            values = sorted(row.get(name, 0.0) for row in totals)
+            if not values:
+                continue
+            stats = {"mean": sum(values) / len(values)}
+            for p in percentiles:
+                stats[f"p{p}"] = values[min(len(values) - 1, len(values) * p // 100)]
+            result[name] = stats
+        counters = [frame[3] for frame in self.frames if frame[3]]
+        for key in ("astar_calls", "expanded"):
+            if counters:
+                values = sorted(c.get(key, 0) for c in counters)
+                result[key] = {"mean": sum(values) / len(values), "max": values[-1]}
+        return result
+
+    # --- Panel en pantalla ---
+
+    def draw_overlay(self, surface, x=10, y=90, refresh=15):
+        """Dibuja el panel si está visible y devuelve su rect (o None). Se recompone cada `refresh` cuadros."""
+        if not self.show_overlay:
+            return None
+        if self._overlay_image is None or self.frame_count - self._overlay_frame >= refresh:
+            self._overlay_image = self._compose_overlay()
+            self._overlay_frame = self.frame_count
+        return surface.blit(self._overlay_image, (x, y))
+
+    def _compose_overlay(self):
+        font = get_font(20)
+        summary = self.summary()
+        lines = [f"{'fase':<11}{'media':>7}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, stats in summary.items():
+            if "p50" in stats:
+                lines.append(f"{name:<11}{stats['mean']:>7.2f}{stats['p50']:>7.2f}{stats['p95']:>7.2f}{stats['p99']:>7.2f}")
+        for key in ("astar_calls", "expanded"):
+            if key in summary:
+                lines.append(f"{key}: {summary[key]['mean']:.1f}/cuadro (máx {summary[key]['max']})")
+        images = [font.render(line, True, YELLOW if i == 0 else WHITE) for i, line in enumerate(lines)]
+        width = max(image.get_width() for image in images) + 8
+        height = sum(image.get_height() for image in images) + 8
+        panel = pygame.Surface((width, height))
+        panel.fill(BLACK)
+        panel.set_alpha(200)
+        top = 4
+        for image in images:
+            panel.blit(image, (4, top))
+            top += image.get_height()
+        return panel
+
+    # --- Exportación ---
+
+    def export_csv(self, path):
+        names = self.phase_names()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "start_s"] + [f"{name}_ms" for name in names] + ["total_ms", "astar_calls", "expanded"])
+            for (number, start, _, counters), row in zip(self.frames, self.frame_totals()):
+                writer.writerow([number, f"{start:.6f}"] + [f"{row.get(name, 0.0):.4f}" for name in names]
+                                + [f"{row['frame']:.4f}", counters.get("astar_calls", ""), counters.get("expanded", "")])
+
+    def export_json(self, path):
+        data = {
+            "summary": self.summary(),
+            "frames": [
+                {"frame": number, "start_s": start,
+                 "phases": [{"name": name, "ms": duration * 1000} for name, _, duration in phases],
+                 "counters": counters}
+                for number, start, phases, counters in self.frames
+            ],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def export_chrome_trace(self, path):
+        """Formato Trace Event (chrome://tracing, Perfetto): un evento por fase y los contadores por cuadro."""
+        events = []
+        for number, start, phases, counters in self.frames:
+            events.append({"name": f"frame {number}", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": start * 1e6, "dur": sum(d for _, _, d in phases) * 1e6})
+            for name, phase_start, duration in phases:
+                events.append({"name": name, "ph": "X", "pid": 1, "tid": 1,
+                               "ts": phase_start * 1e6, "dur": duration * 1e6})
+            if counters:
+                events.append({"name": "pathfinding", "ph": "C", "pid": 1, "ts": start * 1e6, "args": counters})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, prefix=None):
+        """Guarda el buffer en los tres formatos (tecla F4) y devuelve las rutas."""
+        prefix = prefix or time.strftime("profile_%Y%m%d_%H%M%S")
+        paths = [prefix + ".csv", prefix + ".json", prefix + ".trace.json"]
+        self.export_csv(paths[0])
+        self.export_json(paths[1])
+        self.export_chrome_trace(paths[2])
+        return paths
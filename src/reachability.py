@@ -0,0 +1,279 @@
+import weakref
+from array import array
+from collections import Counter, deque
+
+class Reachability:
+    """
+    Etiquetas de componente conexo (4 vecinos) para las celdas libres de un NavGrid:
+    dos celdas se pueden alcanzar entre sí si y solo si tienen la misma etiqueta, así
+    que connected() responde en O(1) sin lanzar ninguna búsqueda.
+    Se mantiene al día con NavGrid.changes_since: al liberar una celda se unen las
+    componentes vecinas (se reetiquetan las más pequeñas) y al bloquearla solo se busca
+    si la componente se partió cuando los vecinos no siguen unidos alrededor de la celda;
+    en ese caso se recorren a la vez desde cada vecino y se reetiquetan los trozos que
+    se cierran, de modo que la parte más grande nunca se recorre entera.
+    Si el registro de cambios no alcanza se vuelve a etiquetar todo.
+    """
+    def __init__(self, grid, labels=None):
+        self.width = grid.width
+        self.height = grid.height
+        self.version = None
+        self.sizes = {}  # etiqueta -> número de celdas
+        self._next_label = 0
+        self.rebuilds = 0
+        self.splits = 0
+        self.merges = 0
+        if labels is not None:
+            # Etiquetas ya calculadas (un nivel horneado): los tamaños se cuentan la primera
+            # vez que cambie el grid, así que abrir un nivel grande no recorre ninguna celda
+            self.labels = labels
+            self.sizes = None
+            self.version = grid.version
+        else:
+            self.labels = array('i', [-1]) * (grid.width * grid.height)
+            self.update(grid)
+
+    def update(self, grid):
+        """Aplica los cambios del grid desde la última vez. Devuelve True si hubo alguno."""
+        if grid.version == self.version:
+            return False
+        changed = grid.changes_since(self.version) if self.version is not None else None
+        if changed is None:
+            self._rebuild(grid)
+            return True
+        if self.sizes is None:
+            self._count_sizes()
+        blocked = grid.blocked
+        width = self.width
+        for x, y in changed:
+            i = y * width + x
+            if blocked[i]:
+                self._block(i)
+            else:
+                self._unblock(i)
+        self.version = grid.version
+        return True
+
+    def label(self, cell):
+        """Etiqueta de la componente de `cell`, o -1 si está bloqueada o fuera del grid."""
+        x, y = cell
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.labels[y * self.width + x]
+        return -1
+
+    def connected(self, a, b):
+        """
+        True si a_star encontraría camino de a a b (según la última actualización). Como en
+        a_star, la celda de salida puede estar bloqueada: basta con que lo esté alguna vecina.
+        """
+        goal = self.label(b)
+        if a == b:
+            return 0 <= a[0] < self.width and 0 <= a[1] < self.height
+        if goal < 0:
+            return False
+        start = self.label(a)
+        if start >= 0:
+            return start == goal
+        x, y = a
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        labels = self.labels
+        return any(labels[n] == goal for n in self._neighbors(y * self.width + x))
+
+    def component_size(self, cell):
+        if self.sizes is None:
+            self._count_sizes()
+        return self.sizes.get(self.label(cell), 0)
+
+    # --- Mantenimiento ---
+
+    def _count_sizes(self):
+        sizes = Counter(self.labels)
+        sizes.pop(-1, None)
+        self.sizes = dict(sizes)
+        self._next_label = max(self.sizes, default=-1) + 1
+
+    def _new_label(self):
+        self._next_label += 1
+        return self._next_label - 1
+
+    def _neighbors(self, i):
+        width = self.width
+        x = i % width
+        result = []
+        if x > 0:
+            result.append(i - 1)
+        if x < width - 1:
+            result.append(i + 1)
+        if i >= width:
+            result.append(i - width)
+        if i + width < len(self.labels):
+            result.append(i + width)
+        return result
+
+    def _fill(self, start, old, new):
+        """Cambia la etiqueta `old` por `new` en la región de `start`. Devuelve cuántas celdas."""
+        labels = self.labels
+        labels[start] = new
+        queue = deque([start])
+        count = 0
+        while queue:
+            current = queue.popleft()
+            count += 1
+            for n in self._neighbors(current):
+                if labels[n] == old:
+                    labels[n] = new
+                    queue.append(n)
+        return count
+
+    def _rebuild(self, grid):
+        self.rebuilds += 1
+        labels = self.labels
+        blocked = grid.blocked
+        for i in range(len(labels)):
+            labels[i] = -2 if not blocked[i] else -1
+        self.sizes = {}
+        self._next_label = 0
+        for i in range(len(labels)):
+            if labels[i] == -2:
+                label = self._new_label()
+                self.sizes[label] = self._fill(i, -2, label)
+        self.version = grid.version
+
+    def _unblock(self, i):
+        labels = self.labels
+        if labels[i] >= 0:
+            return
+        around = []
+        for n in self._neighbors(i):
+            label = labels[n]
+            if label >= 0 and label not in around:
+                around.append(label)
+        if not around:
+            label = self._new_label()
+            labels[i] = label
+            self.sizes[label] = 1
+            return
+        # Se queda la etiqueta de la componente más grande; las demás se reetiquetan
+        keep = max(around, key=self.sizes.__getitem__)
+        labels[i] = keep
+        self.sizes[keep] += 1
+        for label in around:
+            if label != keep:
+                self.merges += 1
+                start = next(n for n in self._neighbors(i) if labels[n] == label)
+                self.sizes[keep] += self._fill(start, label, keep)
+                del self.sizes[label]
+
+    def _ring_connected(self, i, label):
+        """True si los vecinos libres de `i` siguen unidos por las 8 celdas que la rodean."""
+        width, height = self.width, self.height
+        x, y = i % width, i // width
+        ring = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+        free = []
+        for dx, dy in ring:
+            nx, ny = x + dx, y + dy
+            free.append(0 <= nx < width and 0 <= ny < height and self.labels[ny * width + nx] == label)
+        if all(free):
+            return True
+        # Tramos seguidos de celdas libres en el anillo; los vecinos (posiciones pares)
+        # tienen que caer todos en el mismo tramo
+        start = free.index(False)
+        run = -1
+        runs = set()
+        previous = False
+        for k in range(start, start + 8):
+            position = k % 8
+            if free[position] and not previous:
+                run += 1
+            previous = free[position]
+            if free[position] and position % 2 == 0:
+                runs.add(run)
+        return len(runs) <= 1
+
+    def _block(self, i):
+        labels = self.labels
+        old = labels[i]
+        if old < 0:
+            return
+        labels[i] = -1
+        self.sizes[old] -= 1
+        starts = [n for n in self._neighbors(i) if labels[n] == old]
+        if len(starts) <= 1 or self._ring_connected(i, old):
+            if not self.sizes[old]:
+                del self.sizes[old]
+            return
+        # Recorridos intercalados desde cada vecino. Cuando dos se tocan se unen; cuando
+        # un grupo se queda sin celdas por visitar y aún hay otros, es un trozo separado.
+        fronts = [deque([n]) for n in starts]
+        cells = [[n] for n in starts]
+        owner = {n: k for k, n in enumerate(starts)}
+        group = list(range(len(starts)))
+
+        def find(k):
+            while group[k] != k:
+                group[k] = group[group[k]]
+                k = group[k]
+            return k
+
+        alive = set(range(len(starts)))  # raíces de grupos aún sin cerrar
+        while len(alive) > 1:
+            for k in range(len(fronts)):
+                root = find(k)
+                if root not in alive or not fronts[k]:
+                    continue
+                current = fronts[k].popleft()
+                for n in self._neighbors(current):
+                    if labels[n] != old:
+                        continue
+                    other = owner.get(n)
+                    if other is None:
+                        owner[n] = k
+                        fronts[k].append(n)
+                        cells[k].append(n)
+                    else:
+                        other_root = find(other)
+                        if other_root != root:
+                            group[other_root] = root
+                            alive.discard(other_root)
+                if len(alive) <= 1:
+                    break
+            # Grupos cerrados: todos sus recorridos sin celdas pendientes
+            for root in list(alive):
+                if len(alive) <= 1:
+                    break
+                members = [k for k in range(len(fronts)) if find(k) == root]
+                if any(fronts[k] for k in members):
+                    continue
+                alive.discard(root)
+                label = self._new_label()
+                size = 0
+                for k in members:
+                    for n in cells[k]:
+                        labels[n] = label
+                    size += len(cells[k])
+                self.sizes[label] = size
+                self.sizes[old] -= size
+                self.splits += 1
+
+_indexes = weakref.WeakKeyDictionary()
+
+def reachability_for(grid):
+    """Índice de alcanzabilidad asociado a un grid, al día con sus cambios."""
+    index = _indexes.get(grid)
+    if index is None:
+        index = Reachability(grid)
+        _indexes[grid] = index
+    else:
+        index.update(grid)
+    return index
+
+def install_labels(grid, labels):
+    """Usa `labels` (int32 por celda, -1 bloqueada, como Reachability.labels) como índice del grid."""
+    index = Reachability(grid, labels)
+    _indexes[grid] = index
+    return index
+
+def reachable(grid, start, goal):
+    """True si hay camino de celdas libres de start a goal; no lanza ninguna búsqueda."""
+    return reachability_for(grid).connected(start, goal)
@@ -0,0 +1,111 @@
+import pygame
+
+class DirtyRectRenderer:
+    """
+    Dibujo por rectángulos sucios: solo se restaura el fondo y se redibujan los sprites
+    en las zonas que cambiaron desde el cuadro anterior (posición o imagen de un sprite,
+    sprites que desaparecen y el HUD), y se presenta con pygame.display.update(rects).
+    Si el área sucia supera `full_redraw_ratio` de la pantalla se hace un flip completo.
+    `background` debe contener todo lo estático que no es un sprite (por ejemplo la meta),
+    y puede llevar ya compuestos los sprites que no se mueven (ver compose_layer).
+    """
+    def __init__(self, surface, background, full_redraw_ratio=0.5):
+        self.surface = surface
+        self.background = background
+        self.full_redraw_ratio = full_redraw_ratio
+        self._drawn = {}  # sprite -> (rect, imagen) del último cuadro
+        self._overlay_rects = []
+        self._force_full = True
+        self.full_redraws = 0
+        self.partial_redraws = 0
+
+    def invalidate(self):
+        """Fuerza un redibujado completo en el próximo cuadro."""
+        self._force_full = True
+
+    def render(self, sprites, draw_overlay=None):
+        """
+        Dibuja `sprites` (en orden) y el HUD. `draw_overlay(surface)` dibuja el HUD
+        y devuelve la lista de rects que tocó, para restaurarlos en el cuadro siguiente.
+        """
+        surface = self.surface
+        screen_rect = surface.get_rect()
+        current = {}
+        dirty = []
+        for sprite in sprites:
+            rect = sprite.rect
+            previous = self._drawn.get(sprite)
+            if previous is None:
+                dirty.append(rect.copy())
+            elif previous[0] != rect or previous[1] is not sprite.image:
+                dirty.append(previous[0])
+                dirty.append(rect.copy())
+            current[sprite] = (rect.copy(), sprite.image)
+        for sprite, (rect, _) in self._drawn.items():
+            if sprite not in current:
+                dirty.append(rect)
+        dirty.extend(self._overlay_rects)
+        dirty = [r for r in (r.clip(screen_rect) for r in dirty) if r.width and r.height]
+        area = sum(r.width * r.height for r in dirty)
+        if self._force_full or area > self.full_redraw_ratio * screen_rect.width * screen_rect.height:
+            surface.blit(self.background, (0, 0))
+            surface.blits([(image, rect) for rect, image in current.values()], False)
+            self._overlay_rects = draw_overlay(surface) if draw_overlay else []
+            pygame.display.flip()
+            self._force_full = False
+            self.full_redraws += 1
+        else:
+            drawn = list(current.values())
+            rects = [rect for rect, _ in drawn]
+            background = self.background
+            for r in dirty:
+                surface.set_clip(r)
+                surface.blits([(background, r, r)] + [(drawn[i][1], rects[i]) for i in r.collidelistall(rects)], False)
+            surface.set_clip(None)
+            self._overlay_rects = draw_overlay(surface) if draw_overlay else []
+            pygame.display.update(dirty + self._overlay_rects)
+            self.partial_redraws += 1
+        self._drawn = current
+
+def draw_interpolated(surface, sprites, previous_positions, alpha, offset=(0, 0)):
+    """
+    Dibuja `sprites` entre su posición del tick anterior y la actual (0 <= alpha < 1).
+    Solo cambia dónde se dibuja; la posición real de cada sprite no se toca.
+    `offset` se suma a todas las posiciones (la cámara de un mundo con scroll).
+    """
+    ox, oy = offset
+    if not previous_positions:
+        if ox or oy:
+            return surface.blits([(sprite.image, sprite.rect.move(ox, oy)) for sprite in sprites], False)
+        return surface.blits([(sprite.image, sprite.rect) for sprite in sprites], False)
+    blits = []
+    for sprite in sprites:
+        rect = sprite.rect
+        previous = previous_positions.get(sprite)
+        if previous is None:
+            blits.append((sprite.image, (rect.x + ox, rect.y + oy)))
+        else:
+            px, py = previous
+            blits.append((sprite.image, (round(px + (rect.x - px) * alpha) + ox, round(py + (rect.y - py) * alpha) + oy)))
+    return surface.blits(blits, False)
+
+def compose_layer(background, sprites=(), fills=()):
+    """
+    Copia de `background` con los rects de color `fills` [(color, rect)] y los `sprites`
+    ya dibujados encima. Lo que no cambia durante un nivel (fondo, meta, obstáculos) se
+    compone así una sola vez y cada cuadro cuesta un único blit opaco.
+    """
+    layer = background.copy()
+    for color, rect in fills:
+        pygame.draw.rect(layer, color, rect)
+    layer.blits([(sprite.image, sprite.rect) for sprite in sprites], False)
+    return layer
+
+def draw_tiled(surface, image, offset):
+    """Rellena `surface` repitiendo `image` desplazada `offset` (fondo de un mundo con scroll)."""
+    width, height = image.get_size()
+    x0 = offset[0] % width - width if offset[0] % width else 0
+    y0 = offset[1] % height - height if offset[1] % height else 0
+    surface_width, surface_height = surface.get_size()
+    surface.blits([(image, (x, y)) for y in range(y0, surface_height, height)
+                   for x in range(x0, surface_width, width)], False)
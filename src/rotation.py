@@ -0,0 +1,36 @@
+import weakref
+import pygame
+from src.assets import accelerate
+
+# Direcciones en las que pueden mirar los sprites (grados, como Player.angle)
+HEADINGS = (0, 90, 180, 270)
+
+class RotationCache:
+    """
+    Guarda versiones ya rotadas de cada imagen por (imagen original, ángulo).
+    Las entradas se liberan solas cuando la imagen original deja de usarse.
+    """
+    def __init__(self):
+        self._cache = weakref.WeakKeyDictionary()
+        self.rotations = 0
+
+    def precompute(self, image, angles=HEADINGS):
+        """Rota la imagen en todos los ángulos indicados y devuelve el diccionario ángulo -> superficie."""
+        for angle in angles:
+            self.get(image, angle)
+        return self._cache[image]
+
+    def get(self, image, angle):
+        by_angle = self._cache.get(image)
+        if by_angle is None:
+            by_angle = self._cache[image] = {}
+        rotated = by_angle.get(angle)
+        if rotated is None:
+            rotated = image if angle % 360 == 0 else pygame.transform.rotate(image, angle)
+            if rotated is not image and image.get_flags() & (pygame.RLEACCEL | pygame.RLEACCELOK):
+                accelerate(rotated)  # rotate conserva el colorkey o el alfa, pero no el RLE
+            by_angle[angle] = rotated
+            self.rotations += 1
+        return rotated
+
+rotation_cache = RotationCache()
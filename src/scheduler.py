@@ -0,0 +1,35 @@
+from src.settings import FPS, AI_TICK_RATE, AI_LOD_BANDS
+
+class AIScheduler:
+    """
+    Reparte las decisiones de la IA en el tiempo: cada enemigo vuelve a evaluar su árbol
+    `rate_hz` veces por segundo, en un tick distinto según su turno (ai_slot) para que
+    no decidan todos a la vez. Entre decisiones el enemigo repite las acciones elegidas
+    (moverse, seguir el camino), que es lo barato. Los enemigos lejanos deciden aún menos:
+    `lod_bands` es una lista de (distancia máxima en px o None, multiplicador del periodo).
+    """
+    def __init__(self, rate_hz=AI_TICK_RATE, tick_hz=FPS, lod_bands=AI_LOD_BANDS):
+        self.period = max(1, round(tick_hz / rate_hz))
+        self.lod_bands = [(None if d is None else d * d, m) for d, m in lod_bands]
+        self.decisions = 0
+        self._next_slot = 0
+
+    def period_for(self, enemy, px, py):
+        dx = enemy.rect.centerx - px
+        dy = enemy.rect.centery - py
+        dist_sq = dx * dx + dy * dy
+        for limit, multiplier in self.lod_bands:
+            if limit is None or dist_sq <= limit:
+                return self.period * multiplier
+        return self.period
+
+    def update(self, enemies, player, grid, tick):
+        """Hace pensar a los enemigos a los que les toca en este tick."""
+        px, py = player.rect.center
+        for enemy in enemies:
+            if enemy.ai_slot is None:
+                enemy.ai_slot = self._next_slot
+                self._next_slot += 1
+            if enemy.ai_actions is None or (tick + enemy.ai_slot) % self.period_for(enemy, px, py) == 0:
+                enemy.think(player, grid, grid.width, grid.height)
+                self.decisions += 1
@@ -1,10 +1,66 @@
 # config.py
+import os
 
 # Dimensiones y FPS
 WIDTH, HEIGHT = 800, 600
 FPS = 60
 CELL_SIZE = 40
 
+# Motor de búsqueda de caminos: "astar", "jps" (Jump Point Search) o "hpa" (HPA* por clusters)
+PATHFINDING_MODE = "astar"
+
+# Búsquedas de caminos en cola (persecución "queued"): nodos que se expanden como
+# mucho por tick, en tramos de PATH_SLICE_EXPANSIONS, y tope en ms por cuadro en la
+# partida real (repartido entre los ticks de ese cuadro)
+PATH_BUDGET_EXPANSIONS = 2000
+PATH_SLICE_EXPANSIONS = 128
+PATH_BUDGET_MS = 2.0
+
+# Distancia (px) a la que un enemigo empieza a perseguir al jugador
+CHASE_RADIUS = 200
+
+# Dibujo por rectángulos sucios en la partida (útil con pantallas sin aceleración)
+DIRTY_RECT_RENDERING = False
+
+# Decisiones de la IA por segundo (0: cada tick) y bandas de detalle por distancia:
+# (distancia máxima en px o None, multiplicador del periodo entre decisiones)
+AI_TICK_RATE = 10
+AI_LOD_BANDS = ((400, 1), (800, 2), (None, 4))
+
+# Enemigos simulados en arrays de numpy (src/swarm.py); pensado para miles de enemigos
+ENEMY_SWARM = False
+
+# Niveles horneados (python -m src.levelfile bake): con BAKED_LEVELS, si existe levelN.rxl
+# en LEVELS_DIR (levels/ junto a src/, no en la carpeta desde la que se lanza) se carga en
+# lugar de generar el nivel
+BAKED_LEVELS = False
+LEVELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "levels")
+
+# Mundo por trozos con scroll (src/world.py): WORLD_CHUNKS = (columnas, filas) de trozos de
+# CHUNK_CELLS x CHUNK_CELLS celdas, o None para la partida de una sola pantalla. Se simulan
+# los trozos a CHUNK_ACTIVE_RADIUS o menos del jugador y se guardan en memoria hasta
+# CHUNK_KEEP_RADIUS; en cada trozo aparecen CHUNK_COINS monedas y CHUNK_ENEMIES enemigos
+WORLD_CHUNKS = None
+CHUNK_CELLS = 20
+CHUNK_ACTIVE_RADIUS = 1
+CHUNK_KEEP_RADIUS = 2
+CHUNK_COINS = 4
+CHUNK_ENEMIES = 2
+
+# Colocación de obstáculos, monedas y enemigos (src/placement.py): candidatos que prueba
+# cada punto antes de darlo por lleno
+PLACEMENT_ATTEMPTS = 12
+
+# Balas: hueco reservado al empezar (crece si hace falta), velocidad en px por tick y
+# modo de estrés: BULLET_HELL balas en anillo desde el jugador cada BULLET_HELL_INTERVAL ticks
+BULLET_POOL_SIZE = 256
+BULLET_SPEED = 6
+BULLET_HELL = 0
+BULLET_HELL_INTERVAL = 4
+
+# Cuadros que guarda el perfilador de fases (F3 panel, F4 exportar)
+PROFILER_HISTORY = 600
+
 # Colores
 WHITE  = (255, 255, 255)
 RED    = (255, 0, 0)
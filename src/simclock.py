@@ -0,0 +1,49 @@
+import pygame
+
+# Reloj de la simulación. Mientras no se fije un tiempo simulado devuelve el de pygame;
+# step() lo fija en cada tick para que la lógica no dependa del reloj real.
+_sim_ticks = None
+
+def get_ticks():
+    if _sim_ticks is None:
+        return pygame.time.get_ticks()
+    return _sim_ticks
+
+def set_ticks(ms):
+    global _sim_ticks
+    _sim_ticks = ms
+
+def use_real_time():
+    global _sim_ticks
+    _sim_ticks = None
+
+class FixedTimestep:
+    """
+    Acumulador de paso fijo: la lógica avanza siempre en ticks de `step_ms`, sea cual sea
+    el tiempo real de cada cuadro. advance(elapsed_ms) devuelve cuántos ticks tocan ahora
+    (como mucho `max_steps`, para no entrar en espiral si un cuadro tarda demasiado) y
+    `alpha` indica cuánto se ha avanzado hacia el siguiente tick, para interpolar el dibujo.
+    """
+    def __init__(self, step_ms, max_steps=5):
+        self.step_ms = step_ms
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_ms = 0.0
+
+    def advance(self, elapsed_ms):
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            # Tiempo que no se simula: la partida se ralentiza en lugar de congelarse
+            self.dropped_ms += (steps - self.max_steps) * self.step_ms
+            self.accumulator -= (steps - self.max_steps) * self.step_ms
+            steps = self.max_steps
+        self.accumulator -= steps * self.step_ms
+        return steps
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.step_ms
+
+    def reset(self):
+        self.accumulator = 0.0
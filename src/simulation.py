@@ -0,0 +1,369 @@
+import hashlib
+import os
+import random
+import time
+import pygame
+from src import simclock
+from src.settings import (WIDTH, HEIGHT, CELL_SIZE, FPS, ENEMY_SWARM, AI_TICK_RATE, BULLET_HELL,
+                          BULLET_HELL_INTERVAL, BAKED_LEVELS, LEVELS_DIR, WORLD_CHUNKS)
+from src.level import get_level_data
+from src.behavior import build_ai_tree, compile_tree
+from src.entities import Player, Enemy, Coin, ImageObstacle
+from src.bullets import BulletSystem
+from src.spatial import SpatialGroup
+from src.placement import Category, poisson_place
+from src.reachability import reachability_for
+from src import levelfile
+from src.world import World
+from src.scheduler import AIScheduler
+from src.pathservice import existing_path_service
+from src import swarm as enemy_swarm
+
+# Lógica de la partida separada del dibujo: create_state() prepara un nivel y step()
+# avanza un tick. No usa la pantalla, ni eventos, ni limita los FPS, así que puede
+# ejecutarse con el driver de vídeo "dummy" de SDL mucho más rápido que en tiempo real.
+
+TICK_MS = 1000 / FPS
+
+NO_KEYS = {pygame.K_LEFT: False, pygame.K_RIGHT: False, pygame.K_UP: False, pygame.K_DOWN: False}
+
+class StepInput:
+    """Entradas de un tick: teclas de dirección (como get_combined_keys) y disparo."""
+    def __init__(self, keys=None, shoot=False):
+        self.keys = keys if keys is not None else NO_KEYS
+        self.shoot = shoot
+
+class GameState:
+    def __init__(self, level, grid, player, obstacles_group, coin_group, enemy_group, goal_rect):
+        self.level = level
+        self.grid = grid
+        self.player = player
+        self.obstacles_group = obstacles_group
+        self.coin_group = coin_group
+        self.enemy_group = enemy_group
+        self.bullets = BulletSystem()
+        self.bullet_hell = 0  # balas por ráfaga del modo de estrés (0: desactivado)
+        self.all_sprites = pygame.sprite.Group()
+        self.goal_rect = goal_rect
+        self.rng = random
+        self.seed = None
+        self.swarm = None  # EnemySwarm si los enemigos se simulan en arrays
+        self.world = None  # World si el nivel es un mundo por trozos con scroll
+        self.ai_scheduler = None
+        self.tick = 0
+        self.time_ms = 0.0
+        self.game_over = False
+        self.win = False
+        # Con interpolate=True step() guarda la posición anterior de cada sprite
+        # para poder dibujar entre dos ticks (ver render.draw_interpolated).
+        self.interpolate = False
+        self.previous_positions = {}
+
+    def moving_sprites(self):
+        """Sprites que se mueven o desaparecen, en orden de dibujo: monedas, jugador y enemigos."""
+        return self.coin_group.sprites() + [self.player] + self.enemy_group.sprites()
+
+def init_headless():
+    """Inicializa pygame sin ventana (drivers dummy) para simular sin dibujar."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.display.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+START_RECT = pygame.Rect(100, 100, 55, 55)
+GOAL_RECT = pygame.Rect(WIDTH - 100, HEIGHT - 100, 50, 50)
+# Los enemigos aparecen lejos de la salida del jugador
+SPAWN_AREA = pygame.Rect(5 * CELL_SIZE, 5 * CELL_SIZE, WIDTH - 5 * CELL_SIZE, HEIGHT - 5 * CELL_SIZE)
+ENEMY_SIZE = 50
+COIN_SIZE = 45
+
+def generate_layout(num_obstacles=10, num_coins=10, num_spawns=0, min_distance=15, rng=random):
+    """
+    Obstáculos, monedas y puntos de aparición de enemigos colocados juntos con
+    placement.poisson_place: ninguno a menos de `min_distance` px de otro ni encima
+    de la salida o la meta. Devuelve (obstáculos, monedas, [(x, y) de aparición]).
+    Siempre hay `num_spawns` apariciones: las que no caben separadas en SPAWN_AREA se
+    colocan con crowd_spawns.
+    """
+    margin = 20
+    full_rect = pygame.Rect(margin, margin, WIDTH - 2 * margin, HEIGHT - 2 * margin)
+    placed = poisson_place(full_rect, [
+        Category("obstacles", num_obstacles, CELL_SIZE, min_distance),
+        # Los enemigos antes que las monedas: su zona es más pequeña
+        Category("spawns", num_spawns, ENEMY_SIZE, min_distance, SPAWN_AREA),
+        Category("coins", num_coins, COIN_SIZE, min_distance),
+    ], exclusions=(START_RECT, GOAL_RECT), rng=rng)
+    deco_obstacles = [ImageObstacle(x, y, CELL_SIZE) for x, y in placed.get("obstacles", ())]
+    deco_coins = [Coin(x, y) for x, y in placed.get("coins", ())]
+    spawns = placed.get("spawns", [])
+    if len(spawns) < num_spawns:
+        spawns += crowd_spawns(num_spawns - len(spawns), [obs.rect for obs in deco_obstacles], rng)
+    return deco_obstacles, deco_coins, spawns
+
+def crowd_spawns(count, obstacles, rng=random, attempts=100):
+    """
+    `count` apariciones al azar en SPAWN_AREA que solo evitan los rects de `obstacles`,
+    la salida y la meta: pueden solaparse entre ellas, así que caben tantos enemigos
+    como se pidan (pruebas de carga con cientos o miles).
+    """
+    blocked = list(obstacles) + [START_RECT, GOAL_RECT]
+    spawns = []
+    for _ in range(count):
+        for _ in range(attempts):
+            x = rng.randint(SPAWN_AREA.left, SPAWN_AREA.right - ENEMY_SIZE)
+            y = rng.randint(SPAWN_AREA.top, SPAWN_AREA.bottom - ENEMY_SIZE)
+            if pygame.Rect(x, y, ENEMY_SIZE, ENEMY_SIZE).collidelist(blocked) < 0:
+                spawns.append((x, y))
+                break
+        else:
+            raise RuntimeError(f"no se encontró sitio libre de obstáculos para un enemigo en {attempts} intentos")
+    return spawns
+
+def cell_of(point):
+    return (int(point[0]) // CELL_SIZE, int(point[1]) // CELL_SIZE)
+
+def block_obstacles(grid, obstacles, targets, origin):
+    """
+    Marca en el grid la celda de cada obstáculo, salvo los que dejarían alguna celda de
+    `targets` sin camino desde `origin` (se comprueba con el índice de alcanzabilidad,
+    sin buscar caminos). Devuelve los obstáculos que se quedan.
+    """
+    kept = []
+    for obs in obstacles:
+        cell_x = obs.rect.x // CELL_SIZE
+        cell_y = obs.rect.y // CELL_SIZE
+        if grid.in_bounds(cell_x, cell_y) and not grid.is_blocked(cell_x, cell_y):
+            grid.set_blocked(cell_x, cell_y)
+            index = reachability_for(grid)
+            if not all(index.connected(origin, target) for target in targets):
+                grid.set_blocked(cell_x, cell_y, False)
+                continue
+        kept.append(obs)
+    return kept
+
+def layout_targets(coins, spawns):
+    """Celdas que tienen que quedar alcanzables desde la salida: la meta, las monedas y las apariciones."""
+    targets = [cell_of(GOAL_RECT.center)] + [cell_of(coin.rect.center) for coin in coins]
+    targets += [cell_of((x + ENEMY_SIZE // 2, y + ENEMY_SIZE // 2)) for x, y in spawns]
+    # Con muchos enemigos se repiten celdas: cada una se comprueba una sola vez
+    return list(dict.fromkeys(targets))
+
+def baked_level(level):
+    """El nivel horneado de LEVELS_DIR para `level`, o None si no hay archivo."""
+    path = os.path.join(LEVELS_DIR, f"level{level}.rxl")
+    return levelfile.load(path) if os.path.exists(path) else None
+
+def generate_decorations(num_obstacles=10, num_coins=10, min_distance=15, rng=random):
+    deco_obstacles, deco_coins, _ = generate_layout(num_obstacles, num_coins, 0, min_distance, rng)
+    return deco_obstacles, deco_coins
+
+def create_state(level=1, ai_tree=None, enemy_count=None, seed=None, swarm=None, ai_rate=None,
+                 bullet_hell=None, baked=None, world=None):
+    """
+    Prepara un nivel: grid, obstáculos, monedas, jugador y enemigos.
+    Todo el azar de la partida sale de un único random.Random(seed) guardado en state.rng,
+    así que la misma semilla con las mismas entradas da exactamente el mismo resultado.
+    Con `swarm` (por defecto settings.ENEMY_SWARM) y numpy instalado los enemigos se
+    simulan juntos en un EnemySwarm; en ese caso `ai_tree` no se usa.
+    `ai_rate` (por defecto settings.AI_TICK_RATE) son las decisiones de IA por segundo;
+    con 0 cada enemigo recorre su árbol en todos los ticks.
+    `bullet_hell` (por defecto settings.BULLET_HELL) activa el modo de estrés de balas.
+    Con `baked` (por defecto settings.BAKED_LEVELS) se usa el grid y la colocación del nivel
+    horneado de LEVELS_DIR, si lo hay; `baked` también puede ser un LevelFile ya abierto.
+    `world` (por defecto settings.WORLD_CHUNKS) son las (columnas, filas) de trozos de un
+    mundo con scroll, o un World ya creado; el contenido sale entonces de sus trozos, se
+    gana al llegar a la meta y los enemigos son siempre sprites sueltos.
+    """
+    if swarm is None:
+        swarm = ENEMY_SWARM
+    if ai_rate is None:
+        ai_rate = AI_TICK_RATE
+    if world is None:
+        world = WORLD_CHUNKS
+    if world and not isinstance(world, World):
+        world = World(world, seed=seed)
+    if baked is None:
+        baked = BAKED_LEVELS
+    rng = random.Random(seed)
+    if baked is True and not world:
+        baked = baked_level(level)
+    goal_rect = GOAL_RECT.copy()
+    if world:
+        # Los obstáculos, monedas y enemigos los pone World.attach según los trozos activos
+        grid = world.grid
+        deco_obstacles, deco_coins, spawns = [], [], []
+        swarm = False
+    elif baked:
+        # Nivel horneado: el grid usa el mapa del archivo y no hay que colocar nada
+        grid = baked.grid()
+        if enemy_count is None:
+            enemy_count = baked.enemy_count
+        deco_obstacles = [ImageObstacle(x, y, w) for x, y, w, h in baked.rects("obstacle")]
+        deco_coins = [Coin(x, y) for x, y, w, h in baked.rects("coin")]
+        spawns = [(x, y) for x, y, w, h in baked.rects("spawn")][:enemy_count]
+        if len(spawns) < enemy_count:
+            spawns += crowd_spawns(enemy_count - len(spawns), [obs.rect for obs in deco_obstacles], rng)
+        for x, y, w, h in baked.rects("goal")[:1]:
+            goal_rect = pygame.Rect(x, y, w, h)
+    else:
+        grid, _, default_enemies = get_level_data(level)
+        if enemy_count is None:
+            enemy_count = default_enemies
+        deco_obstacles, deco_coins, spawns = generate_layout(num_spawns=enemy_count, rng=rng)
+        # Actualizar grid con obstáculos, sin dejar aislada la meta, una moneda o una aparición
+        deco_obstacles = block_obstacles(grid, deco_obstacles, layout_targets(deco_coins, spawns),
+                                         cell_of(START_RECT.center))
+    obstacles_group = SpatialGroup(deco_obstacles)
+    coin_group = SpatialGroup(deco_coins)
+    use_swarm = swarm and enemy_swarm.available()
+    # El enjambre comprueba los contactos él mismo; no hace falta el índice espacial
+    enemy_group = pygame.sprite.Group() if use_swarm else SpatialGroup()
+    player = Player()
+    state = GameState(level, grid, player, obstacles_group, coin_group, enemy_group, goal_rect)
+    state.rng = rng
+    state.seed = seed
+    state.bullet_hell = BULLET_HELL if bullet_hell is None else bullet_hell
+    state.all_sprites.add(deco_obstacles, deco_coins, player)
+    if use_swarm:
+        state.swarm = enemy_swarm.EnemySwarm(grid, deco_obstacles, capacity=max(enemy_count, 1))
+    if ai_tree is None:
+        ai_tree = build_ai_tree()
+    ai_tree = compile_tree(ai_tree)
+    if ai_rate and state.swarm is None:
+        state.ai_scheduler = AIScheduler(ai_rate)
+    # Los puntos de aparición ya salen separados de obstáculos y monedas
+    for ex, ey in spawns:
+        if state.swarm is not None:
+            enemy = state.swarm.spawn(ex, ey, rng)
+        else:
+            enemy = Enemy(ex, ey, ai_tree, rng)
+        enemy_group.add(enemy)
+        state.all_sprites.add(enemy)
+    if len(enemy_group) != len(spawns) or (not world and len(spawns) != enemy_count):
+        raise RuntimeError(f"se pidieron {enemy_count} enemigos pero se crearon {len(enemy_group)}")
+    if world:
+        world.attach(state, ai_tree)
+    return state
+
+def step(state, inputs, profiler=None):
+    """
+    Avanza la simulación un tick con las entradas dadas y devuelve el estado.
+    Con un `profiler` (FrameProfiler activo) marca las fases jugador, balas, enemigos y colisiones.
+    """
+    state.tick += 1
+    state.time_ms = state.tick * TICK_MS
+    now = int(state.time_ms)
+    simclock.set_ticks(now)
+    player = state.player
+    bullets = state.bullets
+    enemy_group = state.enemy_group
+    grid = state.grid
+    if state.interpolate:
+        state.previous_positions = {sprite: sprite.rect.topleft for sprite in state.all_sprites}
+    if inputs.shoot and now - player.last_shot_time > player.shoot_cooldown:
+        bullets.fire(player.rect.centerx, player.rect.centery, player.angle)
+        player.last_shot_time = now
+    if state.bullet_hell and state.tick % BULLET_HELL_INTERVAL == 0:
+        # Modo de estrés: un anillo de balas desde el jugador que gira en cada ráfaga
+        bullets.spawn_ring(player.rect.centerx, player.rect.centery, state.bullet_hell,
+                           phase=state.tick * 0.1)
+    player.move(inputs.keys, state.obstacles_group)
+    if state.world is not None:
+        # Al cambiar de trozo se recentra la ventana activa (y se desplaza todo)
+        state.world.update()
+    if profiler:
+        profiler.mark("player")
+    bullets.update()
+    if profiler:
+        profiler.mark("bullets")
+    if state.swarm is not None:
+        contacts = step_swarm(state)
+    else:
+        if state.ai_scheduler is not None:
+            state.ai_scheduler.update(enemy_group, player, grid, state.tick)
+        for enemy in enemy_group:
+            enemy.move(player, grid, grid.width, grid.height, state.obstacles_group)
+            enemy_group.relocate(enemy)
+        # Todas las balas contra todos los enemigos de una vez, con el recorrido del tick
+        if bullets:
+            enemies = enemy_group.sprites()
+            for i in bullets.collide([enemy.rect for enemy in enemies]):
+                enemies[i].kill()
+                player.score += 100
+        # Búsquedas pedidas por la persecución "queued", dentro del presupuesto del tick
+        service = existing_path_service(grid)
+        if service is not None:
+            service.process()
+        contacts = len(enemy_group.query(player.rect))
+    if profiler:
+        profiler.mark("enemies")
+    if contacts:
+        player.health -= contacts
+        player.is_flashing = True
+        player.flash_timer = now
+    coins_collected = state.coin_group.collide_sprite(player, True)
+    player.coins_collected += len(coins_collected)
+    player.score += 50 * len(coins_collected)
+    if player.is_flashing and now - player.flash_timer > 300:
+        player.is_flashing = False
+    # En un mundo por trozos solo están cargadas las monedas de alrededor: se gana en la meta
+    if player.rect.colliderect(state.goal_rect) or (state.world is None and len(state.coin_group) == 0):
+        state.win = True
+        player.score += 500
+    if player.health <= 0:
+        state.game_over = True
+    if profiler:
+        profiler.mark("collisions")
+    return state
+
+def step_swarm(state):
+    """Mueve el enjambre, aplica los impactos de bala y devuelve cuántos enemigos tocan al jugador."""
+    swarm = state.swarm
+    contacts = swarm.update(state.player.rect)
+    if state.bullets and swarm.count:
+        killed = state.bullets.collide_boxes(*swarm.boxes())
+        if killed:
+            swarm.kill(killed)
+            state.player.score += 100 * len(killed)
+    return contacts
+
+def random_policy(rng):
+    """Entradas aleatorias: útil para simular partidas sin jugador."""
+    def policy(state):
+        keys = dict(NO_KEYS)
+        keys[rng.choice((pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN))] = True
+        return StepInput(keys, shoot=rng.random() < 0.05)
+    return policy
+
+def state_checksum(state):
+    """Huella del estado (posiciones, vida, puntos) para comprobar que dos ejecuciones coinciden."""
+    digest = hashlib.sha1()
+    digest.update(repr((state.tick, state.player.rect.topleft, state.player.health,
+                        state.player.score, state.game_over, state.win)).encode())
+    if state.world is not None:
+        digest.update(repr(state.world.origin).encode())
+    for group in (state.enemy_group, state.coin_group):
+        for sprite in group:
+            digest.update(repr((sprite.rect.topleft, getattr(sprite, "pos", None))).encode())
+    bullets = state.bullets
+    digest.update(repr((bullets.x[:bullets.count].tolist(), bullets.y[:bullets.count].tolist())).encode())
+    return digest.hexdigest()
+
+def run_headless(level=1, max_ticks=10000, seed=0, policy=None):
+    """Simula un nivel sin dibujar hasta ganar, perder o agotar max_ticks."""
+    init_headless()
+    state = create_state(level, seed=seed)
+    if policy is None:
+        policy = random_policy(random.Random(seed))
+    while not state.game_over and not state.win and state.tick < max_ticks:
+        step(state, policy(state))
+    return state
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    result = run_headless(max_ticks=5000)
+    elapsed = time.perf_counter() - start
+    print(f"ticks: {result.tick}  ticks/s: {result.tick / elapsed:.0f}  "
+          f"puntos: {result.player.score}  vida: {result.player.health}  "
+          f"huella: {state_checksum(result)[:12]}")
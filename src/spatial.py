@@ -0,0 +1,101 @@
+import pygame
+from src.settings import CELL_SIZE
+
+class SpatialGroup(pygame.sprite.Group):
+    """
+    Grupo de sprites con un hash espacial uniforme como fase amplia de colisiones.
+    Cada sprite se guarda en los cubos de las celdas que toca su rect; las consultas
+    solo miran los cubos cercanos, así que el coste depende de la densidad local y no
+    del total de sprites. Los sprites que se mueven deben avisar con relocate() o refresh().
+    """
+    def __init__(self, *sprites, cell_size=CELL_SIZE * 2):
+        self.cell_size = cell_size
+        self._buckets = {}
+        self._spans = {}
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if sprite not in self._spans:
+            span = self._span(sprite.rect)
+            self._spans[sprite] = span
+            self._link(sprite, span)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        span = self._spans.pop(sprite, None)
+        if span is not None:
+            self._unlink(sprite, span)
+
+    def _span(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _link(self, sprite, span):
+        left, top, right, bottom = span
+        buckets = self._buckets
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                bucket = buckets.get((cx, cy))
+                if bucket is None:
+                    bucket = buckets[(cx, cy)] = {}
+                bucket[sprite] = None
+
+    def _unlink(self, sprite, span):
+        left, top, right, bottom = span
+        buckets = self._buckets
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                bucket = buckets[(cx, cy)]
+                del bucket[sprite]
+                if not bucket:
+                    del buckets[(cx, cy)]
+
+    def relocate(self, sprite):
+        """Actualiza los cubos de un sprite que se ha movido. Solo cuesta algo si cambió de celda."""
+        old = self._spans.get(sprite)
+        if old is None:
+            return
+        new = self._span(sprite.rect)
+        if new != old:
+            self._unlink(sprite, old)
+            self._spans[sprite] = new
+            self._link(sprite, new)
+
+    def refresh(self):
+        for sprite in self.sprites():
+            self.relocate(sprite)
+
+    def query(self, rect):
+        """Sprites del grupo cuyo rect choca con `rect`, en orden de inserción en los cubos."""
+        left, top, right, bottom = self._span(rect)
+        buckets = self._buckets
+        candidates = {}
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                bucket = buckets.get((cx, cy))
+                if bucket:
+                    candidates.update(bucket)
+        return [sprite for sprite in candidates if sprite.rect.colliderect(rect)]
+
+    def collides(self, rect):
+        """True si algún sprite del grupo choca con `rect`."""
+        left, top, right, bottom = self._span(rect)
+        buckets = self._buckets
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                bucket = buckets.get((cx, cy))
+                if bucket:
+                    for sprite in bucket:
+                        if sprite.rect.colliderect(rect):
+                            return True
+        return False
+
+    def collide_sprite(self, sprite, dokill=False):
+        """Equivalente a pygame.sprite.spritecollide pero usando el hash."""
+        hits = [other for other in self.query(sprite.rect) if other is not sprite]
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
@@ -0,0 +1,206 @@
+import pygame
+from .assets import assets
+from .flowfield import flow_field_for
+from .settings import WIDTH, HEIGHT, CELL_SIZE, CHASE_RADIUS, BLUE
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él se usan los enemigos de entities.Enemy
+    np = None
+
+PATROL, CHASE = 0, 1
+ENEMY_SIZE = 50
+
+def available():
+    return np is not None
+
+class SwarmEnemy(pygame.sprite.Sprite):
+    """
+    Sprite de un enemigo del enjambre. No tiene lógica propia: su rect refleja la
+    posición calculada por EnemySwarm. speed y chase_radius leen y escriben en los arrays.
+    """
+    def __init__(self, swarm, index, image):
+        super().__init__()
+        self.swarm = swarm
+        self.index = index
+        self.image = image
+        self.rect = image.get_rect()
+        self.path_recalc_interval = 500  # sin uso; se acepta igual que en Enemy
+
+    @property
+    def pos(self):
+        return pygame.math.Vector2(float(self.swarm.x[self.index]), float(self.swarm.y[self.index]))
+
+    @property
+    def speed(self):
+        return float(self.swarm.speed[self.index])
+
+    @speed.setter
+    def speed(self, value):
+        self.swarm.speed[self.index] = value
+
+    @property
+    def chase_radius(self):
+        return float(self.swarm.chase_radius[self.index])
+
+    @chase_radius.setter
+    def chase_radius(self, value):
+        self.swarm.chase_radius[self.index] = value
+
+class EnemySwarm:
+    """
+    Enemigos guardados como estructura de arrays (posición, velocidad, patrulla, estado)
+    y actualizados con operaciones de numpy una vez por tick, para miles de enemigos.
+    Se comporta como el árbol por defecto con persecución por campo de flujo:
+    persigue si el jugador está a menos de chase_radius y si no patrulla entre dos puntos.
+    Los obstáculos son fijos y se pasan al crear el enjambre. Los enemigos muertos se
+    quitan intercambiándolos con el último, así los arrays activos son siempre [:count].
+    """
+    def __init__(self, grid, obstacles=(), capacity=64):
+        if np is None:
+            raise RuntimeError("EnemySwarm necesita numpy")
+        self.grid = grid
+        self.count = 0
+        self.sprites = []
+        self.image = assets.load("assets/enemigos01.png", (ENEMY_SIZE, ENEMY_SIZE), fallback_color=BLUE)
+        self._allocate(capacity)
+        rects = [obstacle.rect for obstacle in obstacles]
+        self.obstacles = np.array([(r.left, r.top, r.right, r.bottom) for r in rects], dtype=np.int64).reshape(-1, 4)
+        self.field = flow_field_for(grid)
+        self._next_index = np.frombuffer(self.field.next_index, dtype=np.intc)
+
+    def _allocate(self, capacity):
+        old = getattr(self, "x", None)
+        names = ("x", "y", "speed", "chase_radius", "home_x", "home_y", "patrol_x", "patrol_y")
+        for name in names:
+            array = np.zeros(capacity, dtype=np.float64)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        for name in ("patrol_point", "state"):
+            array = np.zeros(capacity, dtype=np.int8)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def spawn(self, x, y, rng):
+        """Añade un enemigo en (x, y) con un punto de patrulla al azar. Devuelve su sprite."""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.speed[i] = 1.5
+        self.chase_radius[i] = CHASE_RADIUS
+        self.home_x[i] = x
+        self.home_y[i] = y
+        self.patrol_x[i] = rng.randint(200, WIDTH - 200)
+        self.patrol_y[i] = rng.randint(200, HEIGHT - 200)
+        self.patrol_point[i] = 1
+        self.state[i] = PATROL
+        sprite = SwarmEnemy(self, i, self.image)
+        sprite.rect.topleft = (int(x), int(y))  # como Enemy hasta su primer movimiento
+        self.sprites.append(sprite)
+        self.count += 1
+        return sprite
+
+    def kill(self, indices):
+        """Elimina los enemigos indicados (y sus sprites de todos los grupos)."""
+        for i in sorted(set(int(i) for i in indices), reverse=True):
+            last = self.count - 1
+            self.sprites[i].kill()
+            if i != last:
+                for name in ("x", "y", "speed", "chase_radius", "home_x", "home_y",
+                             "patrol_x", "patrol_y", "patrol_point", "state"):
+                    array = getattr(self, name)
+                    array[i] = array[last]
+                moved = self.sprites[last]
+                moved.index = i
+                self.sprites[i] = moved
+            self.sprites.pop()
+            self.count = last
+
+    def _rects(self, x, y):
+        # Mismo redondeo que Rect.center = (int(x), int(y)) para un sprite de ENEMY_SIZE
+        left = x.astype(np.int64) - ENEMY_SIZE // 2
+        top = y.astype(np.int64) - ENEMY_SIZE // 2
+        return left, top
+
+    def _hits_obstacle(self, left, top):
+        if not len(self.obstacles):
+            return np.zeros(len(left), dtype=bool)
+        o = self.obstacles
+        return ((left[:, None] < o[:, 2]) & (left[:, None] + ENEMY_SIZE > o[:, 0]) &
+                (top[:, None] < o[:, 3]) & (top[:, None] + ENEMY_SIZE > o[:, 1])).any(axis=1)
+
+    def update(self, player_rect):
+        """
+        Avanza un tick: elige objetivo (siguiente celda del campo de flujo, el jugador o el
+        punto de patrulla), mueve con velocidad constante, resuelve obstáculos por ejes,
+        limita a la pantalla y actualiza los sprites. Devuelve cuántos enemigos tocan al jugador.
+        """
+        n = self.count
+        if n == 0:
+            return 0
+        grid = self.grid
+        x, y = self.x[:n], self.y[:n]
+        px, py = player_rect.centerx, player_rect.centery
+        self.field.update(grid, (px // CELL_SIZE, py // CELL_SIZE))
+        # Como Enemy, las decisiones usan el centro entero del rect
+        ix = x.astype(np.int64)
+        iy = y.astype(np.int64)
+        chasing = np.hypot(px - ix, py - iy) < self.chase_radius[:n]
+        self.state[:n] = np.where(chasing, CHASE, PATROL)
+        # Persecución: siguiente celda del campo de flujo, o directo al jugador si no hay
+        cx = np.clip(ix // CELL_SIZE, 0, grid.width - 1)
+        cy = np.clip(iy // CELL_SIZE, 0, grid.height - 1)
+        nxt = self._next_index[cy * grid.width + cx]
+        has_next = nxt >= 0
+        chase_x = np.where(has_next, (nxt % grid.width) * CELL_SIZE + CELL_SIZE // 2, px).astype(np.float64)
+        chase_y = np.where(has_next, (nxt // grid.width) * CELL_SIZE + CELL_SIZE // 2, py).astype(np.float64)
+        # Patrulla: al llegar a menos de 3 px del punto se pasa al otro
+        point = self.patrol_point[:n]
+        patrol_x = np.where(point == 1, self.patrol_x[:n], self.home_x[:n])
+        patrol_y = np.where(point == 1, self.patrol_y[:n], self.home_y[:n])
+        arrived = ~chasing & (np.hypot(patrol_x - x, patrol_y - y) < 3)
+        if arrived.any():
+            point[arrived] ^= 1
+            patrol_x = np.where(point == 1, self.patrol_x[:n], self.home_x[:n])
+            patrol_y = np.where(point == 1, self.patrol_y[:n], self.home_y[:n])
+        target_x = np.where(chasing, chase_x, patrol_x)
+        target_y = np.where(chasing, chase_y, patrol_y)
+        # Dirección normalizada por la velocidad de cada enemigo
+        dx = target_x - x
+        dy = target_y - y
+        length = np.hypot(dx, dy)
+        moving = length > 0
+        scale = np.divide(self.speed[:n], length, out=np.zeros(n), where=moving)
+        step_x = dx * scale
+        step_y = dy * scale
+        # Igual que Enemy.move: el árbol ya avanzó un paso y move() aplica el mismo
+        # desplazamiento otra vez; si eso choca con un obstáculo se queda tras el primer paso.
+        # Se resuelve por ejes, primero x y luego y.
+        x1 = x + step_x
+        y1 = y + step_y
+        new_x = x1 + step_x
+        left, top = self._rects(new_x, y1)
+        new_x = np.where(self._hits_obstacle(left, top), x1, new_x)
+        new_y = y1 + step_y
+        left, top = self._rects(new_x, new_y)
+        new_y = np.where(self._hits_obstacle(left, top), y1, new_y)
+        half = ENEMY_SIZE / 2
+        np.clip(new_x, half, WIDTH - half, out=x)
+        np.clip(new_y, half, HEIGHT - half, out=y)
+        # Reflejar en los sprites y contar contactos con el jugador
+        left, top = self._rects(x, y)
+        for sprite, l, t in zip(self.sprites, left.tolist(), top.tolist()):
+            sprite.rect.topleft = (l, t)
+        touching = ((left < player_rect.right) & (left + ENEMY_SIZE > player_rect.left) &
+                    (top < player_rect.bottom) & (top + ENEMY_SIZE > player_rect.top))
+        return int(touching.sum())
+
+    def boxes(self):
+        """(left, top, right, bottom) de los enemigos activos, para BulletSystem.collide_boxes."""
+        left, top = self._rects(self.x[:self.count], self.y[:self.count])
+        return left, top, left + ENEMY_SIZE, top + ENEMY_SIZE
@@ -1,10 +1,55 @@
+from collections import OrderedDict
 import pygame
 from src.settings import WHITE, RED, GREEN, BLACK
-font = pygame.font.Font(None, 36)
+
+TEXT_CACHE_SIZE = 256
+
+_fonts = {}
+_text_cache = OrderedDict()
+
+def get_font(size=36, name=None):
+    """Fuente compartida; se crea una sola vez por (nombre, tamaño)."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
+
+def render_text(text, color=BLACK, font=None, antialias=True):
+    """Renderiza texto usando una caché LRU por (fuente, texto, color, antialias)."""
+    if font is None:
+        font = get_font()
+    key = (font, text, tuple(color), antialias)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        return surface
+    surface = font.render(text, antialias, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
 
 def draw_text(text, x, y, color=BLACK):
-    render = font.render(text, True, color)
-    pygame.display.get_surface().blit(render, (x, y))
+    render = render_text(text, color)
+    return pygame.display.get_surface().blit(render, (x, y))
+
+class HudText:
+    """Texto del HUD con un valor; solo se vuelve a renderizar cuando el valor cambia."""
+    def __init__(self, template, x, y, color=BLACK, font=None):
+        self.template = template
+        self.pos = (x, y)
+        self.color = color
+        self.font = font
+        self._value = None
+        self._image = None
+
+    def draw(self, surface, value):
+        if self._image is None or value != self._value:
+            font = self.font or get_font()
+            self._image = font.render(self.template.format(value), True, self.color)
+            self._value = value
+        return surface.blit(self._image, self.pos)
 
 def draw_health_bar(surface, x, y, health, max_health, flash=False):
     BAR_WIDTH = 150
@@ -13,4 +58,4 @@ def draw_health_bar(surface, x, y, health, max_health, flash=False):
     bar_color = RED if flash and (pygame.time.get_ticks() // 100) % 2 == 0 else GREEN
     pygame.draw.rect(surface, RED, (x, y, BAR_WIDTH, BAR_HEIGHT))
     pygame.draw.rect(surface, bar_color, (x, y, fill, BAR_HEIGHT))
-    pygame.draw.rect(surface, BLACK, (x, y, BAR_WIDTH, BAR_HEIGHT), 2)
+    return pygame.draw.rect(surface, BLACK, (x, y, BAR_WIDTH, BAR_HEIGHT), 2)
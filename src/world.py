@@ -0,0 +1,361 @@
+# Mundo con scroll hecho de trozos (chunks) de CHUNK_CELLS x CHUNK_CELLS celdas que se
+# generan o se cargan al acercarse el jugador y se descartan al alejarse.
+# Uso: python -m src.world bake --chunks 8 8 --seed 0 --out levels/world
+import argparse
+import os
+import random
+import sys
+import pygame
+from src import levelfile
+from src.entities import Enemy, Coin, ImageObstacle
+from src.level import NavGrid
+from src.placement import Category, poisson_place
+from src.settings import (WIDTH, HEIGHT, CELL_SIZE, WORLD_CHUNKS, CHUNK_CELLS, CHUNK_ACTIVE_RADIUS,
+                          CHUNK_KEEP_RADIUS, CHUNK_COINS, CHUNK_ENEMIES)
+
+# Laberinto de manzanas: calles de STREET celdas (el coche mide más de una celda) y
+# manzanas de BLOCK x BLOCK celdas, que se cierran con probabilidad BLOCK_FILL. Las calles
+# siguen de un trozo al siguiente, así que todas las celdas libres se pueden alcanzar.
+STREET = 2
+BLOCK = 3
+PERIOD = STREET + BLOCK
+BLOCK_FILL = 0.7
+
+GOAL_SIZE = 50
+
+class Chunk:
+    """
+    Contenido de un trozo, en px desde su esquina: celdas bloqueadas (un byte por celda,
+    como NavGrid.blocked), obstáculos (x, y, ancho, alto), monedas y apariciones (x, y).
+    Son datos planos; los sprites solo existen mientras el trozo está activo.
+    """
+    def __init__(self, blocked, obstacles, coins, spawns):
+        self.blocked = blocked
+        self.obstacles = obstacles
+        self.coins = coins
+        self.spawns = spawns
+
+def generate_chunk(seed, cx, cy, cells=CHUNK_CELLS, coins=CHUNK_COINS, enemies=CHUNK_ENEMIES, exclusions=()):
+    """
+    Genera el trozo (cx, cy). Depende solo de la semilla y de la posición, así que un
+    trozo descartado vuelve a salir igual. `exclusions` son rects (en px del trozo) donde
+    no se coloca nada.
+    """
+    from src.simulation import ENEMY_SIZE, COIN_SIZE  # simulation usa este módulo
+    rng = random.Random(f"{seed}:{cx}:{cy}")
+    blocked = bytearray(cells * cells)
+    obstacles = []
+    walls = []
+    for by in range(STREET, cells, PERIOD):
+        for bx in range(STREET, cells, PERIOD):
+            if rng.random() >= BLOCK_FILL:
+                continue  # manzana abierta: una plaza
+            for y in range(by, by + BLOCK):
+                blocked[y * cells + bx:y * cells + bx + BLOCK] = b"\1" * BLOCK
+                obstacles += [(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE) for x in range(bx, bx + BLOCK)]
+            walls.append((bx * CELL_SIZE, by * CELL_SIZE, BLOCK * CELL_SIZE, BLOCK * CELL_SIZE))
+    size = cells * CELL_SIZE
+    placed = poisson_place((0, 0, size, size), [
+        Category("spawns", enemies, ENEMY_SIZE, 15),
+        Category("coins", coins, COIN_SIZE, 15),
+    ], exclusions=walls + [tuple(e) for e in exclusions], rng=rng)
+    return Chunk(blocked, obstacles, placed.get("coins", []), placed.get("spawns", []))
+
+def chunk_path(directory, cx, cy):
+    return os.path.join(directory, f"chunk_{cx}_{cy}.rxl")
+
+def write_chunk(path, chunk, cells=CHUNK_CELLS):
+    """Guarda un trozo con el formato de levelfile (coordenadas en px del trozo)."""
+    from src.simulation import ENEMY_SIZE, COIN_SIZE
+    placements = [("obstacle",) + tuple(rect) for rect in chunk.obstacles]
+    placements += [("coin", x, y, COIN_SIZE, COIN_SIZE) for x, y in chunk.coins]
+    placements += [("spawn", x, y, ENEMY_SIZE, ENEMY_SIZE) for x, y in chunk.spawns]
+    levelfile.write(path, NavGrid(cells, cells, blocked=chunk.blocked), placements, len(chunk.spawns), CELL_SIZE)
+
+def read_chunk(path, cells=CHUNK_CELLS):
+    level = levelfile.load(path)
+    if level.width != cells or level.height != cells or level.cell_size != CELL_SIZE:
+        raise ValueError(f"{path}: el trozo mide {level.width}x{level.height} celdas de {level.cell_size} px "
+                         f"(se esperan {cells}x{cells} de {CELL_SIZE})")
+    # Se copia: un trozo es pequeño y así no queda un mapeo abierto por cada uno
+    return Chunk(bytearray(level.blocked), level.rects("obstacle"),
+                 [(x, y) for x, y, w, h in level.rects("coin")], [(x, y) for x, y, w, h in level.rects("spawn")])
+
+class World:
+    """
+    Mundo de `chunks` = (columnas, filas) trozos. Solo se simulan los trozos activos, los
+    que están a `active_radius` o menos del trozo del jugador: sus obstáculos, monedas y
+    enemigos son sprites de los grupos de la partida y sus celdas forman `grid`, un NavGrid
+    del tamaño de la ventana activa que no depende del tamaño del mundo. Los trozos se
+    crean la primera vez que hacen falta (se leen de `directory` si están horneados) y se
+    descartan al quedar a más de `keep_radius`; de los visitados solo se recuerda qué
+    monedas se recogieron y qué enemigos murieron.
+    Las posiciones de la partida son locales a la ventana activa (origen flotante): cuando
+    el jugador pasa a otro trozo la ventana se recentra y todo se desplaza a la vez, así
+    que la IA, las búsquedas y las colisiones siguen funcionando sin saber nada del mundo.
+    """
+    def __init__(self, chunks=WORLD_CHUNKS, seed=None, chunk_cells=CHUNK_CELLS, active_radius=CHUNK_ACTIVE_RADIUS,
+                 keep_radius=CHUNK_KEEP_RADIUS, directory=None):
+        if chunk_cells % PERIOD:
+            raise ValueError(f"el lado del trozo ({chunk_cells} celdas) tiene que ser múltiplo de {PERIOD}")
+        if keep_radius < active_radius:
+            raise ValueError("CHUNK_KEEP_RADIUS no puede ser menor que CHUNK_ACTIVE_RADIUS")
+        self.columns, self.rows = chunks
+        self.seed = seed
+        self.chunk_cells = chunk_cells
+        self.chunk_px = chunk_cells * CELL_SIZE
+        self.active_radius = active_radius
+        self.keep_radius = keep_radius
+        self.directory = directory
+        span = 2 * active_radius + 1
+        self.span_px = span * self.chunk_px
+        # La vista se centra en el jugador, que siempre está en el trozo central
+        if 2 * active_radius * self.chunk_px < max(WIDTH, HEIGHT):
+            raise ValueError("la ventana activa no cubre la pantalla: hacen falta trozos más grandes o más radio")
+        self.grid = NavGrid(span * chunk_cells, span * chunk_cells)
+        self.bounds = pygame.Rect(0, 0, self.columns * self.chunk_px, self.rows * self.chunk_px)
+        # La meta, en el cruce de calles más lejano de la salida
+        corner = (chunk_cells - PERIOD) * CELL_SIZE + STREET * CELL_SIZE // 2
+        self.goal = pygame.Rect(0, 0, GOAL_SIZE, GOAL_SIZE)
+        self.goal.center = ((self.columns - 1) * self.chunk_px + corner, (self.rows - 1) * self.chunk_px + corner)
+        self.origin = (0, 0)  # esquina de la ventana activa en px del mundo
+        self.center = None    # trozo del jugador
+        self.chunks = {}      # (cx, cy) -> Chunk en memoria
+        self.active = {}      # (cx, cy) -> (obstáculos, {índice: moneda}) de los trozos activos
+        self.enemies = {}     # (cx, cy, índice de aparición) -> enemigo vivo
+        self.memory = {}      # (cx, cy) -> (monedas recogidas, enemigos muertos)
+        self.state = None
+        self.ai_tree = None
+        self.generated = 0
+        self.loaded = 0
+        self.evicted = 0
+        self.recenters = 0
+
+    def attach(self, state, ai_tree):
+        """Coloca al jugador en la salida y activa los trozos de alrededor."""
+        self.state = state
+        self.ai_tree = ai_tree
+        state.world = self
+        state.grid = self.grid
+        state.goal_rect = self.goal.copy()
+        state.player.bounds = self.bounds.copy()
+        state.player.rect.center = (STREET * CELL_SIZE // 2, STREET * CELL_SIZE // 2)
+        self.update()
+
+    def update(self):
+        """Recentra la ventana activa si el jugador cambió de trozo. Devuelve True si lo hizo."""
+        center = self.chunk_at(self.state.player.rect.center)
+        if center == self.center:
+            return False
+        self._recenter(center)
+        return True
+
+    def chunk_at(self, point):
+        """Trozo que contiene un punto en coordenadas locales."""
+        return ((int(point[0]) + self.origin[0]) // self.chunk_px, (int(point[1]) + self.origin[1]) // self.chunk_px)
+
+    def local_rect(self, key):
+        """Rect del trozo `key` en coordenadas locales."""
+        return pygame.Rect(key[0] * self.chunk_px - self.origin[0], key[1] * self.chunk_px - self.origin[1],
+                           self.chunk_px, self.chunk_px)
+
+    def window(self, center):
+        r = self.active_radius
+        cx, cy = center
+        return [(x, y) for y in range(cy - r, cy + r + 1) for x in range(cx - r, cx + r + 1)
+                if 0 <= x < self.columns and 0 <= y < self.rows]
+
+    def chunk(self, key):
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            path = chunk_path(self.directory, *key) if self.directory else None
+            if path is not None and os.path.exists(path):
+                chunk = read_chunk(path, self.chunk_cells)
+                self.loaded += 1
+            else:
+                chunk = self._generate(key)
+                self.generated += 1
+            self.chunks[key] = chunk
+        return chunk
+
+    def _generate(self, key):
+        cx, cy = key
+        # Sin enemigos en el trozo de la salida y nada encima de la meta
+        enemies = 0 if key == (0, 0) else CHUNK_ENEMIES
+        exclusions = []
+        if self.goal.colliderect((cx * self.chunk_px, cy * self.chunk_px, self.chunk_px, self.chunk_px)):
+            exclusions.append(self.goal.move(-cx * self.chunk_px, -cy * self.chunk_px).inflate(30, 30))
+        return generate_chunk(self.seed, cx, cy, self.chunk_cells, enemies=enemies, exclusions=exclusions)
+
+    # --- Ventana activa ---
+
+    def _recenter(self, center):
+        state = self.state
+        r = self.active_radius
+        old_x, old_y = self.origin
+        self.origin = ((center[0] - r) * self.chunk_px, (center[1] - r) * self.chunk_px)
+        self.center = center
+        self.recenters += 1
+        window = self.window(center)
+        # Los enemigos muertos desde la última vez no vuelven a aparecer
+        for key, enemy in list(self.enemies.items()):
+            if not enemy.alive():
+                self._memory(key[:2])[1].add(key[2])
+                del self.enemies[key]
+        for key in [key for key in self.active if key not in window]:
+            self._deactivate(key)
+        dx, dy = old_x - self.origin[0], old_y - self.origin[1]
+        if dx or dy:
+            self._shift(dx, dy)
+        # Los enemigos que se quedan fuera de la ventana se retiran; volverán a su
+        # aparición cuando su trozo se active otra vez
+        area = pygame.Rect(0, 0, self.span_px, self.span_px)
+        for key, enemy in list(self.enemies.items()):
+            if not area.collidepoint(enemy.rect.center):
+                enemy.kill()
+                del self.enemies[key]
+        for key in window:  # en orden fijo, para que el azar de la partida sea reproducible
+            if key not in self.active:
+                self._activate(key)
+        self._fill_grid()
+        for key in [key for key in self.chunks
+                    if max(abs(key[0] - center[0]), abs(key[1] - center[1])) > self.keep_radius]:
+            del self.chunks[key]
+            self.evicted += 1
+        state.bullets.bounds = (0, 0, self.span_px, self.span_px)
+
+    def _memory(self, key):
+        memory = self.memory.get(key)
+        if memory is None:
+            memory = self.memory[key] = (set(), set())
+        return memory
+
+    def _activate(self, key):
+        state = self.state
+        chunk = self.chunk(key)
+        rect = self.local_rect(key)
+        collected, killed = self.memory.get(key, ((), ()))
+        obstacles = [ImageObstacle(rect.x + x, rect.y + y, w) for x, y, w, h in chunk.obstacles]
+        coins = {i: Coin(rect.x + x, rect.y + y) for i, (x, y) in enumerate(chunk.coins) if i not in collected}
+        state.obstacles_group.add(obstacles)
+        state.coin_group.add(coins.values())
+        state.all_sprites.add(obstacles, coins.values())
+        # Los enemigos patrullan por el centro de su trozo
+        patrol = rect.inflate(-self.chunk_px // 2, -self.chunk_px // 2)
+        for i, (x, y) in enumerate(chunk.spawns):
+            if i in killed or key + (i,) in self.enemies:
+                continue
+            enemy = Enemy(rect.x + x, rect.y + y, self.ai_tree, state.rng, patrol)
+            state.enemy_group.add(enemy)
+            state.all_sprites.add(enemy)
+            self.enemies[key + (i,)] = enemy
+        self.active[key] = (obstacles, coins)
+
+    def _deactivate(self, key):
+        obstacles, coins = self.active.pop(key)
+        for obs in obstacles:
+            obs.kill()
+        for i, coin in coins.items():
+            if coin.alive():
+                coin.kill()
+            else:
+                self._memory(key)[0].add(i)
+
+    def _shift(self, dx, dy):
+        """Desplaza todo lo que hay en la ventana al cambiar el origen."""
+        state = self.state
+        for sprite in state.all_sprites:
+            sprite.rect.move_ip(dx, dy)
+        for enemy in self.enemies.values():
+            enemy.pos.x += dx
+            enemy.pos.y += dy
+            for point in enemy.patrol_points:
+                point.x += dx
+                point.y += dy
+        for group in (state.obstacles_group, state.coin_group, state.enemy_group):
+            group.refresh()
+        state.player.bounds.move_ip(dx, dy)
+        state.goal_rect.move_ip(dx, dy)
+        state.bullets.shift(dx, dy)
+        if state.previous_positions:
+            state.previous_positions = {sprite: (x + dx, y + dy) for sprite, (x, y) in state.previous_positions.items()}
+
+    def _fill_grid(self):
+        grid = self.grid
+        cells = self.chunk_cells
+        span = 2 * self.active_radius + 1
+        cx0, cy0 = self.center[0] - self.active_radius, self.center[1] - self.active_radius
+        wall = b"\1" * cells  # fuera del mundo todo está bloqueado
+        for sy in range(span):
+            for sx in range(span):
+                key = (cx0 + sx, cy0 + sy)
+                blocked = self.chunks[key].blocked if key in self.active else None
+                for row in range(cells):
+                    start = (sy * cells + row) * grid.width + sx * cells
+                    grid.blocked[start:start + cells] = blocked[row * cells:(row + 1) * cells] if blocked else wall
+        # El mapa cambia sin pasar por set_blocked: quien use changes_since empieza de cero
+        grid.version += 1
+        grid.changes.clear()
+
+class Camera:
+    """
+    Vista de `width` x `height` px sobre la ventana activa: sigue a un punto sin salirse
+    del mundo. La posición en pantalla es la local menos la esquina de la vista.
+    """
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        self.view = pygame.Rect(0, 0, width, height)
+
+    def follow(self, point, bounds):
+        self.view.center = (round(point[0]), round(point[1]))
+        self.view.clamp_ip(bounds)
+
+    def follow_sprite(self, sprite, previous_positions, alpha, bounds):
+        """Centra la vista donde se dibuja `sprite` al interpolar (ver render.draw_interpolated)."""
+        rect = sprite.rect
+        previous = previous_positions.get(sprite)
+        x, y = rect.topleft
+        if previous is not None:
+            x = previous[0] + (x - previous[0]) * alpha
+            y = previous[1] + (y - previous[1]) * alpha
+        self.follow((x + rect.width / 2, y + rect.height / 2), bounds)
+
+    @property
+    def offset(self):
+        return (-self.view.x, -self.view.y)
+
+    def apply(self, rect):
+        return rect.move(-self.view.x, -self.view.y)
+
+    def visible(self, state, margin=8):
+        """
+        Sprites que se ven, en orden de dibujo (obstáculos, monedas, jugador, enemigos),
+        consultando los índices espaciales. `margin` cubre lo que se mueve la posición
+        dibujada al interpolar entre ticks.
+        """
+        view = self.view.inflate(2 * margin, 2 * margin)
+        return (state.obstacles_group.query(view) + state.coin_group.query(view) + [state.player] +
+                state.enemy_group.query(view))
+
+def bake(chunks, seed=0, directory=None):
+    """Genera y guarda todos los trozos de un mundo. Devuelve la carpeta."""
+    from src.settings import LEVELS_DIR
+    if directory is None:
+        directory = os.path.join(LEVELS_DIR, "world")
+    world = World(chunks, seed=seed)
+    for cy in range(world.rows):
+        for cx in range(world.columns):
+            write_chunk(chunk_path(directory, cx, cy), world._generate((cx, cy)), world.chunk_cells)
+    return directory
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hornea los trozos de un mundo")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bake_parser = commands.add_parser("bake", help="genera y guarda todos los trozos")
+    bake_parser.add_argument("--chunks", type=int, nargs=2, default=[8, 8], metavar=("COLUMNAS", "FILAS"))
+    bake_parser.add_argument("--seed", type=int, default=0)
+    bake_parser.add_argument("--out", default=None, help="carpeta de salida (por defecto LEVELS_DIR/world)")
+    args = parser.parse_args(argv)
+    print(bake(tuple(args.chunks), args.seed, args.out))
+
+if __name__ == "__main__":
+    sys.exit(main())